@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""Compares size and encode/decode time of network packets serialized with pickle and
+with the binary codec of horizons.network.packets.
+
+Measures the packets that are sent most: CommandPackets during a game (wrapped into
+game_data like NetworkInterface does) and the lobby packets.
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+# make this script work both when started inside development and in the uh root dir
+if not os.path.exists('content'):
+	os.chdir('..')
+assert os.path.exists('content'), 'Content dir not found.'
+sys.path.append('.')
+
+import horizons.main # isort:skip, resolves import cycles like in the game
+from horizons.command.building import Tear # isort:skip
+from horizons.command.production import ToggleActive # isort:skip
+from horizons.command.unit import CreateUnit # isort:skip
+from horizons.manager import CheckupHashPacket, CommandPacket # isort:skip
+from horizons.network import packets # isort:skip
+from horizons.network.common import Game, Player # isort:skip
+
+
+def make_player(number):
+	# players are created from enet peers on the server, only their sent state matters here
+	player = Player.__new__(Player)
+	player.__dict__.update({
+		'sid': '{:032x}'.format(number), 'name': 'Player {:d}'.format(number), 'color': number,
+		'ready': False, 'clientid': '{:032x}'.format(1000 + number), 'codec': None,
+		'protocol': 1, 'version': '2017.2'})
+	return player
+
+
+def make_game(number):
+	game = Game.__new__(Game)
+	creator = make_player(number * 10)
+	game.__dict__.update({
+		'uuid': '{:032x}'.format(number), 'mapname': 'development', 'maphash': '',
+		'maxplayers': 4, 'name': 'Game {:d}'.format(number), 'password': '', 'creator': creator,
+		'players': [creator, make_player(number * 10 + 1)], 'playercnt': 2,
+		'state': Game.State.Open})
+	return game
+
+
+def make_packets():
+	"""Returns (name, packet, receiving side) tuples."""
+	commands = [CreateUnit(2, 6, 10 + i, 20) for i in range(3)] + [ToggleActive.__new__(ToggleActive)]
+	commands[-1].__dict__.update({'obj_id': 1234, 'method': 'toggle_active', 'args': (None, ), 'kwargs': {}})
+	tear = Tear.__new__(Tear)
+	tear.building = 4321
+
+	gameslist = packets.server.data_gameslist()
+	for number in range(10):
+		gameslist.addgame(make_game(number))
+
+	return [
+		('empty CommandPacket', packets.client.game_data(CommandPacket(1234, 3, [])), 'server'),
+		('CommandPacket (5 commands)', packets.client.game_data(CommandPacket(1234, 3, commands + [tear])), 'server'),
+		('CheckupHashPacket', packets.client.game_data(CheckupHashPacket(1234, 3, 2 ** 63 + 12345)), 'server'),
+		('cmd_creategame', packets.client.cmd_creategame('2017.2', 'a' * 32, 'Player', 1, 'Game', 'development', 4), 'client'),
+		('cmd_chatmsg', packets.server.cmd_chatmsg('Player', 'Hello, anyone up for a game?'), 'server'),
+		('data_gamestate', packets.server.data_gamestate(make_game(1)), 'server'),
+		('data_gameslist (10 games)', gameslist, 'server'),
+	]
+
+
+def measure(packet, origin, codec, number):
+	packets.SafeUnpickler.set_mode(client=(origin == 'server'))
+	data = packet.serialize(codec)
+	encode = timeit.timeit(lambda: packet.serialize(codec), number=number) / number
+	decode = timeit.timeit(lambda: packets.unserialize(data), number=number) / number
+	return len(data), encode, decode
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument('--number', type=int, default=20000, help='repetitions per measurement')
+	args = parser.parse_args()
+
+	print('{:28} {:>14} {:>20} {:>20}'.format('packet', 'bytes', 'encode [us]', 'decode [us]'))
+	print('{:28} {:>14} {:>20} {:>20}'.format('', 'pickle/binary', 'pickle/binary', 'pickle/binary'))
+	for name, packet, origin in make_packets():
+		pickle_result = measure(packet, origin, None, args.number)
+		binary_result = measure(packet, origin, packets.BinaryCodec.NAME, args.number)
+		assert packets.BinaryCodec.is_encoded(packet.serialize(packets.BinaryCodec.NAME)), name
+		print('{:28} {:>6d}/{:<7d} {:>9.2f}/{:<10.2f} {:>9.2f}/{:<10.2f}'.format(name,
+			pickle_result[0], binary_result[0], pickle_result[1] * 1e6, binary_result[1] * 1e6,
+			pickle_result[2] * 1e6, binary_result[2] * 1e6))
+
+
+if __name__ == '__main__':
+	main()
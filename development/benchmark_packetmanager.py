@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+"""Replays a stream of multiplayer packets through the packet managers of horizons.manager
+and measures how long checking for ready ticks takes.
+
+The stream is a json list of [arrival frame, tick, player id] entries. It can be recorded
+with --record and replayed with --replay; by default, a stream of a game with several
+players, one of them lagging behind, is generated.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+# make this script work both when started inside development and in the uh root dir
+if not os.path.exists('content'):
+	os.chdir('..')
+assert os.path.exists('content'), 'Content dir not found.'
+sys.path.append('.')
+
+import horizons.main # isort:skip, resolves import cycles like in the game
+from horizons.manager import CommandPacket, MPCommandsManager # isort:skip
+
+
+class Stub:
+	"""Provides what the packet managers need from MPManager."""
+	def __init__(self, player_count):
+		self.player_count = player_count
+
+	def get_player_count(self):
+		return self.player_count
+
+
+def generate_stream(players, ticks, lag, seed):
+	"""Every player sends one packet per tick, the last one arrives up to lag frames late."""
+	rng = random.Random(seed)
+	stream = []
+	for tick in range(ticks):
+		for player_id in range(1, players + 1):
+			delay = rng.randint(0, lag) if player_id == players else rng.randint(0, 2)
+			stream.append([tick + delay, tick, player_id])
+	stream.sort()
+	return stream
+
+
+def replay(stream, players):
+	"""Feeds the packets to a manager frame by frame and executes ticks as soon as they are ready.
+	@return: (seconds, number of readiness checks, largest backlog)"""
+	manager = MPCommandsManager(Stub(players))
+	next_tick = 0
+	checks = 0
+	max_backlog = 0
+	position = 0
+	frame = 0
+	start = time.time()
+	while position < len(stream) or manager.get_backlog():
+		while position < len(stream) and stream[position][0] <= frame:
+			_frame, tick, player_id = stream[position]
+			manager.add_packet(CommandPacket(tick, player_id, []))
+			position += 1
+		# the timer checks the tick every frame, even if it can't be executed
+		checks += 1
+		while manager.is_tick_ready(next_tick):
+			manager.get_packets_for_tick(next_tick)
+			next_tick += 1
+			checks += 1
+		max_backlog = max(max_backlog, sum(manager.get_backlog().values()))
+		frame += 1
+	return time.time() - start, checks, max_backlog
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument('--players', type=int, default=4)
+	parser.add_argument('--ticks', type=int, default=20000)
+	parser.add_argument('--lag', type=int, default=400, help='maximum delay of the lagging player in frames')
+	parser.add_argument('--seed', type=int, default=42)
+	parser.add_argument('--record', metavar='FILE', help='write the generated stream to FILE')
+	parser.add_argument('--replay', metavar='FILE', help='replay the stream recorded in FILE')
+	args = parser.parse_args()
+
+	if args.replay:
+		with open(args.replay) as f:
+			stream = json.load(f)
+		players = len({player_id for _frame, _tick, player_id in stream})
+	else:
+		stream = generate_stream(args.players, args.ticks, args.lag, args.seed)
+		players = args.players
+		if args.record:
+			with open(args.record, 'w') as f:
+				json.dump(stream, f)
+
+	seconds, checks, max_backlog = replay(stream, players)
+	print('{:d} packets, {:d} readiness checks, largest backlog {:d} packets: {:.3f}s'.format(
+		len(stream), checks, max_backlog, seconds))
+
+
+if __name__ == '__main__':
+	main()
@@ -24,17 +24,22 @@
 
 from __future__ import print_function
 import getopt
+import json
 import os
 import sys
 import platform
 import signal
+import socket
+import time
 import logging
 import logging.config
 import logging.handlers
 
 sys.path.append(os.getcwd())
-from horizons.network.client import Client, ClientMode
 import horizons.network
+import horizons.network.common # registers Game and Player, which the server sends
+from horizons.network import packets
+from horizons.network.connection import Connection
 
 #-------------------------------------------------------------------------------
 
@@ -56,10 +61,149 @@ def nbrawinput(prompt='', timeout=1):
   signal.signal(signal.SIGALRM, signal.SIG_IGN)
   return None
 
+#-------------------------------------------------------------------------------
+# load test: with -n, many clients are simulated instead of running the interactive client
+
+LOADTEST_VERSION = u"loadtest"
+# seconds the clients may take to send all their chat messages
+LOADTEST_TIMEOUT = 120
+
+class LoadClient(object):
+  """One simulated client, talks to the server through its own enet host.
+
+  After joining a game, it sends chat messages, each one as soon as the
+  previous one has come back from the server.
+  """
+  def __init__(self, number, address, players, chats):
+    self.number = number
+    self.name = u"client-{:d}".format(number)
+    self.clientid = u"{:032x}".format(number)
+    self.color = number % players + 1
+    self.remaining = chats
+    self.sent = None # (message, time.time() when it was sent) while waiting for it
+    self.latencies = []
+    self.sid = None
+    self.connection = Connection(self.process_async_packet, address)
+
+  @property
+  def done(self):
+    return self.sent is None and self.remaining <= 0
+
+  def process_async_packet(self, packet):
+    packet = packet[1]
+    if isinstance(packet, packets.server.cmd_chatmsg):
+      if self.sent is not None and packet.chatmsg == self.sent[0]:
+        self.latencies.append(time.time() - self.sent[1])
+        self.send_chat()
+      return True
+    # game state updates, e.g. when other clients join
+    return isinstance(packet, packets.server.data_gamestate)
+
+  def send(self, packet):
+    packet.sid = self.sid
+    self.connection.send_packet(packet)
+
+  def connect(self):
+    self.connection.connect()
+    session = self.connection.receive_packet(packets.server.cmd_session)[1]
+    self.sid = session.sid
+    codec = packets.BinaryCodec.NAME
+    if codec in session.capabilities.get('codecs', []):
+      self.send(packets.client.cmd_sessionprops({'codec': codec}))
+      self.connection.receive_packet(packets.cmd_ok)
+      self.connection.codec = codec
+
+  def creategame(self, players):
+    self.send(packets.client.cmd_creategame(LOADTEST_VERSION, self.clientid, self.name, self.color,
+                                            u"loadtest", u"loadtest", players))
+    return self.connection.receive_packet(packets.server.data_gamestate)[1].game.uuid
+
+  def joingame(self, uuid):
+    self.send(packets.client.cmd_joingame(uuid, LOADTEST_VERSION, self.clientid, self.name, self.color))
+    self.connection.receive_packet(packets.server.data_gamestate)
+
+  def send_chat(self):
+    if self.remaining <= 0:
+      self.sent = None
+      return
+    self.remaining -= 1
+    message = u"{} {:d}".format(self.name, self.remaining)
+    self.sent = (message, time.time())
+    self.send(packets.client.cmd_chatmsg(message))
+
+def get_statistic(host, statport):
+  """Returns the statistic the server sends on its statistic port (run_server.py -S)."""
+  sock = socket.create_connection((host, statport), 5)
+  try:
+    return json.loads(sock.makefile().readline())
+  finally:
+    sock.close()
+
+def percentile(values, fraction):
+  return sorted(values)[min(len(values) - 1, int(len(values) * fraction))]
+
+def loadtest(host, port, clients, players, chats, statport=None):
+  """Lets clients clients connect, grouped into games of players players.
+
+  The first client of every group creates the game, the others join it. Then
+  all clients chat at the same time, see LoadClient. Prints how long that
+  took and the chat round trip times.
+  """
+  loadclients = []
+  errors = []
+  uuid = None
+  start = time.time()
+  for number in range(clients):
+    client = LoadClient(number, [host, port], players, chats)
+    try:
+      client.connect()
+      if number % players == 0:
+        uuid = client.creategame(players)
+      else:
+        client.joingame(uuid)
+      loadclients.append(client)
+    except horizons.network.NetworkException as e:
+      errors.append(e)
+  print("{:d} clients joined in {:.2f}s".format(len(loadclients), time.time() - start))
+
+  start = time.time()
+  for client in loadclients:
+    client.send_chat()
+  active = loadclients
+  while active and time.time() < start + LOADTEST_TIMEOUT:
+    for client in active:
+      try:
+        while client.connection.ping():
+          pass
+      except horizons.network.NetworkException as e:
+        errors.append(e)
+        client.sent, client.remaining = None, 0
+    active = [client for client in active if not client.done]
+  seconds = time.time() - start
+  errors.extend("timeout of {}".format(client.name) for client in active)
+
+  latencies = [latency for client in loadclients for latency in client.latencies]
+  print("{:d} chat messages in {:.2f}s, {:d} errors".format(len(latencies), seconds, len(errors)))
+  for error in errors[:5]:
+    print("  [ERROR] {}".format(error))
+  if latencies:
+    print("chat roundtrip: median {:.1f}ms, 95% {:.1f}ms, max {:.1f}ms".format(
+      percentile(latencies, 0.5) * 1000, percentile(latencies, 0.95) * 1000, max(latencies) * 1000))
+  if statport is not None:
+    statistic = get_statistic(host, statport)
+    print("server: {:d} packets received, {:d} sent, {:d} players, {:d} games".format(
+      statistic['Traffic.PacketsReceived'], statistic['Traffic.PacketsSent'],
+      statistic['Players.Total'], statistic['Games.Total']))
+
+  # leave only now, a game is terminated as soon as its creator leaves
+  for client in loadclients:
+    client.connection.disconnect()
+
 #-------------------------------------------------------------------------------
 
 def usage():
-  print("Usage: {} -h host -p port".format(sys.argv[0]))
+  print("Usage: {} -h host -p port [-n clients [-g players_per_game] [-c chats_per_client] [-S statistic_port]]"
+        .format(sys.argv[0]))
 
 def onquit(*args):
   try:
@@ -214,6 +358,10 @@ def onhelp(*args):
 
 host = None
 port = 0
+loadclients = 0
+loadplayers = 4
+loadchats = 20
+statport = None
 commands = {
   'help':       onhelp,
   'connect':    onconnect,
@@ -236,7 +384,7 @@ if platform.system() == "Windows":
   sys.exit(1)
 
 try:
-  opts, args = getopt.getopt(sys.argv[1:], 'h:p:')
+  opts, args = getopt.getopt(sys.argv[1:], 'h:p:n:g:c:S:')
 except getopt.GetoptError as err:
   print(str(err))
   usage()
@@ -248,6 +396,14 @@ try:
       host = value
     if key == '-p':
       port = int(value)
+    if key == '-n':
+      loadclients = int(value)
+    if key == '-g':
+      loadplayers = int(value)
+    if key == '-c':
+      loadchats = int(value)
+    if key == '-S':
+      statport = int(value)
 except (ValueError, IndexError):
   port = 0
 
@@ -255,6 +411,12 @@ if host is None or port is None or port <= 0:
   usage()
   sys.exit(1)
 
+if loadclients > 0:
+  loadtest(host, port, loadclients, loadplayers, loadchats, statport)
+  sys.exit(0)
+
+from horizons.network.client import Client, ClientMode
+
 logging.config.fileConfig( os.path.join('content', 'logging.conf'))
 logging.getLogger().addHandler(logging.StreamHandler(sys.stderr))
 logging.getLogger("network").setLevel(logging.DEBUG)
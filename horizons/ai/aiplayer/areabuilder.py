@@ -28,6 +28,7 @@ from horizons.ai.aiplayer.constants import BUILD_RESULT, BUILDING_PURPOSE
 from horizons.ai.aiplayer.roadplanner import RoadPlanner
 from horizons.constants import BUILDINGS
 from horizons.entities import Entities
+from horizons.util.pathfinding.pather import StaticPather
 from horizons.util.shapes import Rect
 from horizons.util.worldobject import WorldObject
 
@@ -168,6 +169,8 @@ class AreaBuilder(WorldObject):
 				return []
 			if loading_area.distance(building.position) > building.radius:
 				continue # the collector building is too far to be useful
+			if StaticPather.is_connected_by_road(self.island, building, loading_area):
+				return [] # the existing roads are enough
 			for coords in self.iter_possible_road_coords(building.position, building.position):
 				collector_coords.add(coords)
 
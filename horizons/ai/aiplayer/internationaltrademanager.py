@@ -70,9 +70,11 @@ class InternationalTradeManager:
 
 		# find all possible legal trade route options
 		options = defaultdict(list) # {(settlement, settlement_manager): (total value, amount, resource id, bool(selling)), ...}
-		for settlement in self.world.settlements:
-			if settlement.owner is self.owner:
-				continue # don't allow routes of this type between the player's own settlements
+		# don't allow routes of this type between the player's own settlements
+		registry = self.world.warehouse_registry
+		other_owners = [owner for owner in registry.get_owners() if owner is not self.owner]
+		for warehouse in registry.get_warehouses(owners=other_owners):
+			settlement = warehouse.settlement
 			for settlement_manager in self.owner.settlement_managers:
 				if self._trade_mission_exists(settlement, settlement_manager):
 					continue # allow only one international trade route between a pair of settlements
@@ -86,7 +86,10 @@ class Pirate(GenericAI):
 	def get_nearest_player_ship(base_ship):
 		lowest_distance = None
 		nearest_ship = None
-		for ship in base_ship.find_nearby_ships():
+		world = base_ship.session.world
+		owners = [owner for owner in world.ship_threat_map.get_owners()
+		          if owner is not base_ship.owner and owner is not world.trader]
+		for ship in base_ship.find_nearby_ships(owners=owners):
 			if isinstance(ship, (PirateShip, TradeShip)) or not ship.has_component(SelectableComponent):
 				continue  # don't attack these ships
 			distance = base_ship.position.distance(ship.position)
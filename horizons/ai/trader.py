@@ -144,31 +144,32 @@ class Trader(GenericAI):
 		"""Returns the signal fire instance, if there is one in the ships range, else False"""
 		if ship in self.allured_by_signal_fire and self.allured_by_signal_fire[ship]:
 			return False # don't visit signal fire again
-		for tile in self.session.world.get_tiles_in_radius(ship.position, ship.radius):
-			try:
-				if tile.object.id == BUILDINGS.SIGNAL_FIRE:
-					return tile.object
-			except AttributeError:
-				pass # tile has no object or object has no id
+		# NOTE: must be sorted for mp games (same order everywhere)
+		islands = sorted(self.session.world.get_islands_in_radius(ship.position, ship.radius),
+		                 key=lambda island: island.worldid)
+		for island in islands:
+			signal_fire = island.buildings_by_type.nearest(BUILDINGS.SIGNAL_FIRE, ship.position, ship.radius)
+			if signal_fire is not None:
+				return signal_fire
 		return False
 
 	def _ship_found_signal_fire(self, ship):
 		signal_fire = self._check_for_signal_fire_in_ship_range(ship)
 		self.log.debug("Trader %s ship %s found signal fire %s", self.worldid, ship.worldid, signal_fire)
 		# search a warehouse in the range of the signal fire and move to it
-		warehouses = self.session.world.get_warehouses()
-		for house in warehouses:
-			if house.position.distance(signal_fire.position) <= signal_fire.radius and \
-			   house.owner == signal_fire.owner:
-				self.log.debug("Trader %s moving to house %s", self.worldid, house)
-				self.allured_by_signal_fire[ship] = True
-				# HACK: remove allured flag in a few ticks
-				def rem_allured(self, ship):
-					self.allured_by_signal_fire[ship] = False
-				Scheduler().add_new_object(Callback(rem_allured, self, ship), self, Scheduler().get_ticks(60))
-				self.send_ship_random_warehouse(ship, house)
-				return
-		self.log.debug("Trader can't find warehouse in range of signal fire")
+		warehouses = self.session.world.get_warehouses(signal_fire.position, signal_fire.radius,
+		                                               signal_fire.owner)
+		if not warehouses:
+			self.log.debug("Trader can't find warehouse in range of signal fire")
+			return
+		house = warehouses[0]
+		self.log.debug("Trader %s moving to house %s", self.worldid, house)
+		self.allured_by_signal_fire[ship] = True
+		# HACK: remove allured flag in a few ticks
+		def rem_allured(self, ship):
+			self.allured_by_signal_fire[ship] = False
+		Scheduler().add_new_object(Callback(rem_allured, self, ship), self, Scheduler().get_ticks(60))
+		self.send_ship_random_warehouse(ship, house)
 
 	def send_ship_random_warehouse(self, ship, warehouse=None):
 		"""Sends a ship to a random warehouse on the map
@@ -176,7 +177,6 @@ class Trader(GenericAI):
 		@param warehouse: warehouse instance to move to. Random one is selected on None."""
 		self.log.debug("Trader %s ship %s moving to warehouse (random=%s)", self.worldid, ship.worldid,
 		               (warehouse is None))
-		#TODO maybe this kind of list should be saved somewhere, as this is pretty performance intense
 		warehouses = self.session.world.get_warehouses()
 		# Remove all warehouses that are not safe to visit
 		warehouses = list(filter(self.is_warehouse_safe, warehouses))
@@ -200,8 +200,8 @@ class LimitedMoveStance(StanceComponent):
 		"""
 		Returns closest attackable unit in radius
 		"""
-		enemies = [u for u in self.session.world.get_health_instances(self.instance.position.center, radius)
-		           if self.session.world.diplomacy.are_enemies(u.owner, self.instance.owner)]
+		enemies = self.session.world.get_enemy_health_instances(self.instance.owner,
+		                                                        self.instance.position.center, radius)
 
 		if not enemies:
 			return None
@@ -292,8 +292,9 @@ class FleeStance(StanceComponent):
 		"""
 		Gets the closest unit that can fire to instance
 		"""
-		enemies = [u for u in self.session.world.get_health_instances(self.instance.position.center, self.lookout_distance)
-		           if self.session.world.diplomacy.are_enemies(u.owner, self.instance.owner) and hasattr(u, '_max_range')]
+		enemies = [u for u in self.session.world.get_enemy_health_instances(self.instance.owner,
+		                                   self.instance.position.center, self.lookout_distance)
+		           if hasattr(u, '_max_range')]
 
 		if not enemies:
 			return None
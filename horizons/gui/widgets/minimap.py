@@ -326,22 +326,35 @@ class Minimap:
 		for minimap in cls._instances:
 			minimap._update(tup)
 
+	@classmethod
+	def update_area(cls, rect):
+		"""Redraw the part of every minimap that shows the real world coords in rect.
+		Use this instead of calling update for every coord of a larger area.
+		@param rect: Rect of world coords"""
+		for minimap in cls._instances:
+			minimap._update_area(rect)
+
 	def _update(self, tup):
 		"""Recalculate and redraw minimap for real world coord tup
 		@param tup: (x, y)"""
+		self._update_area(Rect.init_from_topleft_and_size(tup[0], tup[1], 1, 1))
+
+	def _update_area(self, rect):
+		"""Recalculate and redraw minimap for the real world coords in rect
+		@param rect: Rect of world coords"""
 		if self.world is None or not self.world.inited:
 			return # don't draw while loading
-		minimap_point = self._world_to_minimap(tup, self._get_rotation_setting())
+		use_rotation = self._get_rotation_setting()
+		# rotations are multiples of 90 degrees, so opposite corners stay opposite corners
+		corner1 = self._world_to_minimap((rect.left, rect.top), use_rotation)
+		corner2 = self._world_to_minimap((rect.right, rect.bottom), use_rotation)
 		world_to_minimap = self._world_to_minimap_ratio
 		# TODO: remove this remnant of the old implementation, perhaps by refactoring recalculate()
-		minimap_point = (
-		  minimap_point[0] + self.location.left,
-		  minimap_point[1] + self.location.top,
-		)
-		rect = Rect.init_from_topleft_and_size(minimap_point[0], minimap_point[1],
-								                           int(round(1 / world_to_minimap[0])) + 1,
-								                           int(round(1 / world_to_minimap[1])) + 1)
-		self._recalculate(rect)
+		where = Rect.init_from_topleft_and_size(min(corner1[0], corner2[0]) + self.location.left,
+		                                        min(corner1[1], corner2[1]) + self.location.top,
+		                                        abs(corner1[0] - corner2[0]) + int(round(1 / world_to_minimap[0])) + 1,
+		                                        abs(corner1[1] - corner2[1]) + int(round(1 / world_to_minimap[1])) + 1)
+		self._recalculate(where)
 
 	def use_overlay_icon(self, icon):
 		"""Configures icon so that clicks get mapped here.
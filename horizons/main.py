@@ -244,6 +244,13 @@ def start(_command_line_arguments):
 			return False
 		_modules.session.speed_set(GAME_SPEED.TICKS_PER_SECOND * command_line_arguments.gamespeed)
 
+	if command_line_arguments.fast_forward:
+		if _modules.session is None or GAME.MAX_TICKS is None:
+			print("Fast forwarding requires --max-ticks in combination with a game start parameter such as --start-map, etc.")
+			return False
+		# reaching GAME.MAX_TICKS requests quitting, the main loop below then exits right away
+		_modules.session.fast_forward(GAME.MAX_TICKS)
+
 	if command_line_arguments.gui_test:
 		from tests.gui import TestRunner
 		TestRunner(horizons.globals.fife, command_line_arguments.gui_test)
@@ -22,6 +22,7 @@
 import itertools
 import logging
 import operator
+from collections import defaultdict
 
 from horizons.command.building import Build
 from horizons.i18n import gettext as T
@@ -89,6 +90,10 @@ class MPManager(LivingObject):
 
 		self._last_local_commands_send_tick = -1 # last tick, where local commands got sent
 
+		# detailed checkup values, only exchanged after the checkup hashes have differed
+		self._checkup_details = None
+		self._received_checkup_details = []
+
 	def end(self):
 		pass
 
@@ -108,6 +113,10 @@ class MPManager(LivingObject):
 			elif isinstance(packet, CheckupHashPacket):
 				self.log.debug("Got checkuphash packet from " + str(packet.player_id) + " for tick " + str(packet.tick))
 				self.checkuphashmanager.add_packet(packet)
+			elif isinstance(packet, CheckupDetailsPacket):
+				self.log.debug("Got checkup details packet from " + str(packet.player_id) + " for tick " + str(packet.tick))
+				self._received_checkup_details.append(packet)
+				self._compare_checkup_details()
 			else:
 				self.log.warning("invalid packet: " + str(packet))
 
@@ -170,15 +179,38 @@ class MPManager(LivingObject):
 
 	def hash_value_check(self, tick):
 		if tick % self.HASH_EVAL_DISTANCE == 0:
-			if not self.checkuphashmanager.are_checkup_hash_values_equal(tick, self.hash_value_diff):
+			if not self.checkuphashmanager.are_checkup_hash_values_equal(tick, self.hash_digest_diff):
 				self.log.error("MPManager: Hash values generated in tick %s are not equal",
 							   str(tick - self.HASHDELAY))
+				self._send_checkup_details(tick)
 				# if this is reached, we are screwed. Something went wrong in the simulation,
 				# but we don't know what. Stop the game.
 				msg = T("The games have run out of sync. This indicates an unknown internal error, the game cannot continue.") + "\n" + \
 				  T("We are very sorry and hope to have this bug fixed in a future version.")
 				self.session.ingame_gui.open_error_popup('Out of sync', msg)
 
+	def hash_digest_diff(self, player1, digest1, player2, digest2):
+		"""Called when the checkup hashes of two players differ"""
+		self.log.error("MPManager: Hash diff: %s: %016x, %s: %016x", player1, digest1, player2, digest2)
+
+	def _send_checkup_details(self, tick):
+		"""Sends the detailed checkup values to all players after a divergence has been detected.
+		Every player detects the divergence in the same tick, so the details are comparable."""
+		if self._checkup_details is not None:
+			return # only done once, the game can't continue anyway
+		self._checkup_details = self.session.world.get_checkup_hash_details()
+		packet = CheckupDetailsPacket(tick, self.session.world.player.worldid, self._checkup_details)
+		self.networkinterface.send_packet(packet)
+		self._compare_checkup_details()
+
+	def _compare_checkup_details(self):
+		if self._checkup_details is None:
+			return # we haven't detected the divergence yet, compare when we have
+		for packet in self._received_checkup_details:
+			self.hash_value_diff("local", self._checkup_details,
+			                     "pl#{:02d}".format(packet.player_id), packet.checkup_details)
+		self._received_checkup_details = []
+
 	def hash_value_diff(self, player1, hash1, player2, hash2):
 		"""Called when a divergence has been detected"""
 		self.log.error("MPManager: Hash diff:\n%s hash1: %s\n%s hash2: %s", player1, hash1, player2, hash2)
@@ -234,35 +266,53 @@ class MPManager(LivingObject):
 ################################################
 
 class MPPacketmanager:
+	"""Stores packets until the tick they are meant for.
+	Packets are kept in slots per tick and player, so checking whether all players
+	have sent their packet for a tick doesn't depend on how many packets are waiting."""
 	log = logging.getLogger("mpmanager")
 	def __init__(self, mpmanager):
 		self.mpmanager = mpmanager
-		self.command_packet_list = []
+		# {tick: {player_id: [packet, ...]}}, in order of arrival
+		self._packets_by_tick = {}
+		# {player_id: number of stored packets}
+		self._backlog = defaultdict(int)
 
 	def is_tick_ready(self, tick):
 		"""Check if packets from all players have arrived (necessary for tick to begin)"""
-		ready = len(self.get_packets_for_tick(tick, remove_returned_commands=False)) == self.mpmanager.get_player_count()
-		if not ready:
+		slots = self._packets_by_tick.get(tick, {})
+		ready = len(slots) == self.mpmanager.get_player_count()
+		if not ready and self.log.isEnabledFor(logging.DEBUG):
 			self.log.debug("tick not ready, packets: %s", str(list(str(x) for x in self.get_packets_for_tick(tick, remove_returned_commands=False))))
 		return ready
 
 	def get_packets_for_tick(self, tick, remove_returned_commands=True):
 		"""Returns packets that are to be executed at a certain tick"""
-		command_packets = [x for x in self.command_packet_list if x.tick == tick]
 		if remove_returned_commands:
-			self.command_packet_list = [x for x in self.command_packet_list if x.tick != tick]
-		return command_packets
+			slots = self._packets_by_tick.pop(tick, {})
+			for player_id, packets in slots.items():
+				self._backlog[player_id] -= len(packets)
+		else:
+			slots = self._packets_by_tick.get(tick, {})
+		return [packet for packets in slots.values() for packet in packets]
 
 	def get_packets_from_player(self, player_id):
 		"""
 		Returns all command this player has issued, that are not yet executed
 		@param player_id: worldid of player
 		"""
-		return [x for x in self.command_packet_list if x.player_id == player_id]
+		return [packet for slots in self._packets_by_tick.values()
+		        for packet in slots.get(player_id, [])]
+
+	def get_backlog(self):
+		"""Returns the number of stored packets per player, for diagnostics.
+		@return: dict {player_id: number of packets}"""
+		return {player_id: count for player_id, count in self._backlog.items() if count}
 
 	def add_packet(self, command_packet):
 		"""Receive a packet"""
-		self.command_packet_list.append(command_packet)
+		slots = self._packets_by_tick.setdefault(command_packet.tick, {})
+		slots.setdefault(command_packet.player_id, []).append(command_packet)
+		self._backlog[command_packet.player_id] += 1
 
 class MPCommandsManager(MPPacketmanager):
 	pass
@@ -333,3 +383,11 @@ class CheckupHashPacket(MPPacket):
 		self.checkup_hash = checkup_hash
 
 MPPacket.allow_network(CheckupHashPacket)
+
+class CheckupDetailsPacket(MPPacket):
+	"""Detailed checkup values, only sent after CheckupHashPackets have differed."""
+	def __init__(self, tick, player_id, checkup_details):
+		super(CheckupDetailsPacket, self).__init__(tick, player_id)
+		self.checkup_details = checkup_details
+
+MPPacket.allow_network(CheckupDetailsPacket)
@@ -276,3 +276,7 @@ class ZoomChanged(Message):
 class ActionChanged(Message):
 	"""Sent when a ConcreteObject changed its action"""
 	arguments = ('action', )
+
+class SavegameWritten(Message):
+	"""Sent by the session when a savegame that was written in the background is complete."""
+	arguments = ('savegame', 'success', )
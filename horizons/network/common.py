@@ -78,6 +78,7 @@ class Player:
 		self.prepared = False
 		self.fetch    = False
 		self.gettext  = nulltranslation
+		self.codec    = None # wire format besides pickle this player understands
 
 	# for pickle: return only relevant data to the player
 	def __getstate__(self):
@@ -87,7 +88,8 @@ class Player:
 				'name':     self.name,
 				'color':    self.color,
 				'ready':    self.ready,
-				'clientid': self.clientid
+				'clientid': self.clientid,
+				'codec':    self.codec,
 			}
 
 	def __hash__(self):
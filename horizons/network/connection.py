@@ -62,6 +62,8 @@ class Connection:
 		self.server_peer = None
 		self.packetqueue = []
 		self.process_async_packet = process_async_packet
+		# wire format used for sending besides pickle, received packets may use either
+		self.codec = None
 
 	# Connection setup / keepalive
 
@@ -157,7 +159,7 @@ class Connection:
 		if self.server_peer is None:
 			raise network.NotConnected()
 
-		packet = enet.Packet(packet.serialize(), enet.PACKET_FLAG_RELIABLE)
+		packet = enet.Packet(packet.serialize(self.codec), enet.PACKET_FLAG_RELIABLE)
 		self.server_peer.send(0, packet)
 
 	def receive_packet(self, packet_type=None, timeout=SERVER_TIMEOUT):
@@ -251,6 +253,7 @@ class Connection:
 
 	def _reset(self):
 		self.log.debug("[RESET]")
+		self.codec = None
 		if self.is_connected:
 			self.server_peer.reset()
 			self.server_peer = None
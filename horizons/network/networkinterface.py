@@ -133,7 +133,7 @@ class NetworkInterface(object, metaclass=ManualConstructionSingleton):
 			self.capabilities = packet[1].capabilities
 			self._mode = ClientMode.Server
 			self.log.debug("[CONNECT] done (session=%s)", self.sid)
-			self._set_client_language()
+			self._set_session_props()
 		except NetworkException as e:
 			self.disconnect()
 			raise e
@@ -160,10 +160,19 @@ class NetworkInterface(object, metaclass=ManualConstructionSingleton):
 			self.disconnect()
 		self._setup_client()
 
-	def _set_client_language(self):
+	def _set_session_props(self):
+		props = {}
 		lang = LANGUAGENAMES.get_by_value(horizons.globals.fife.get_uh_setting("Language"))
 		if lang:
-			return self.set_props({'lang': lang})
+			props['lang'] = lang
+		# use the binary wire format if the server supports it, old servers only know pickle
+		if packets.BinaryCodec.NAME in self.capabilities.get('codecs', []):
+			props['codec'] = packets.BinaryCodec.NAME
+		if props:
+			if not self.set_props(props):
+				return False
+			self._connection.codec = props.get('codec')
+		return True
 
 	def send_packet(self, packet, *args, **kwargs):
 		"""
@@ -482,6 +491,9 @@ class NetworkInterface(object, metaclass=ManualConstructionSingleton):
 		self.log.debug("[GAMESTART]")
 		self._game.state = Game.State.Running
 		self._mode = ClientMode.Game
+		# game data is forwarded to the other players as it is, they all have to understand it
+		if any(getattr(player, 'codec', None) != self._connection.codec for player in self._game.players):
+			self._connection.codec = None
 		self.broadcast("game_starts", self._game)
 
 	def _on_lobbygame_starts(self, game):
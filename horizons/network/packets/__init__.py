@@ -21,12 +21,14 @@
 
 import importlib
 import inspect
+import logging
 import pickle
 import sys
 from io import BytesIO
 from typing import Dict, Set
 
 from horizons.network import NetworkException, PacketTooLarge
+from horizons.network.packets.codec import BinaryCodec, CodecError
 
 __version__ = '0.1'
 
@@ -66,11 +68,13 @@ class SafeUnpickler:
 		if (module == cls.__module__ and name == cls.__name__):
 			raise RuntimeError("Adding SafeUnpickler to the pickle whitelist is not allowed")
 		types = ['client', 'server'] if origin == 'common' else [origin]
-		for origin in types:
-			if module not in PICKLE_SAFE[origin]:
-				PICKLE_SAFE[origin][module] = set()
-			if name not in PICKLE_SAFE[origin][module]:
-				PICKLE_SAFE[origin][module].add(name)
+		for _origin in types:
+			if module not in PICKLE_SAFE[_origin]:
+				PICKLE_SAFE[_origin][module] = set()
+			if name not in PICKLE_SAFE[_origin][module]:
+				PICKLE_SAFE[_origin][module].add(name)
+		# the same classes are allowed for the binary codec
+		BinaryCodec.register(origin, klass)
 
 	@classmethod
 	def set_mode(cls, client=True):
@@ -107,6 +111,7 @@ class SafeUnpickler:
 #-------------------------------------------------------------------------------
 
 class packet:
+	log = logging.getLogger("network")
 	maxpacketsize = 0
 
 	def __init__(self):
@@ -116,7 +121,16 @@ class packet:
 	def validate(pkt, protocol):
 		return True
 
-	def serialize(self):
+	def serialize(self, codec=None):
+		"""Returns the packet as bytes.
+		@param codec: BinaryCodec.NAME if the receiver supports it, else pickle is used
+		"""
+		if codec == BinaryCodec.NAME:
+			try:
+				return BinaryCodec.encode(self)
+			except CodecError as e:
+				# the receiver understands pickle as well
+				self.log.debug("Falling back to pickle for %s: %s", self.__class__.__name__, e)
 		return pickle.dumps(self, PICKLE_PROTOCOL)
 
 #-------------------------------------------------------------------------------
@@ -158,7 +172,10 @@ SafeUnpickler.add('common', cmd_fatalerror)
 #-------------------------------------------------------------------------------
 
 def unserialize(data, validate=False, protocol=0):
-	mypacket = SafeUnpickler.loads(data)
+	if BinaryCodec.is_encoded(data):
+		mypacket = BinaryCodec.decode(data, PICKLE_RECIEVE_FROM)
+	else:
+		mypacket = SafeUnpickler.loads(data)
 	if validate:
 		if not inspect.isfunction(mypacket.validate):
 			raise NetworkException("Attempt to override packet.validate()")
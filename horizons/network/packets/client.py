@@ -292,6 +292,8 @@ class cmd_sessionprops(packet):
 	def __init__(self, props):
 		if 'lang' in props:
 			self.lang = props['lang']
+		if 'codec' in props:
+			self.codec = props['codec']
 
 	@staticmethod
 	def validate(pkt, protocol):
@@ -300,6 +302,9 @@ class cmd_sessionprops(packet):
 				raise NetworkException("Invalid datatype: lang")
 			if not pkt.lang:
 				raise SoftNetworkException("Invalid language property")
+		if hasattr(pkt, 'codec'):
+			if not isinstance(pkt.codec, str):
+				raise NetworkException("Invalid datatype: codec")
 
 SafeUnpickler.add('client', cmd_sessionprops)
 
@@ -0,0 +1,274 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+"""
+Compact binary encoding of network packets, used instead of pickle if both sides support it.
+
+Every value is written as a one byte tag followed by its data. Integers and lengths are
+zigzag/LEB128 varints, small non-negative integers are stored in the tag itself. Strings that
+occur more than once in a packet (e.g. attribute names) are written once and referenced later.
+Objects are written as the id of their class followed by their state.
+Only classes that have been registered (see SafeUnpickler.add) can be encoded and decoded,
+they are identified by a checksum of their full name, so decoding never imports anything.
+"""
+
+import struct
+import zlib
+
+from horizons.network import NetworkException
+
+
+class CodecError(NetworkException):
+	"""Raised if a value can't be encoded or data can't be decoded."""
+
+
+TAG_NONE = 0
+TAG_FALSE = 1
+TAG_TRUE = 2
+TAG_INT = 3
+TAG_FLOAT = 4
+TAG_STR = 5
+TAG_BYTES = 6
+TAG_LIST = 7
+TAG_TUPLE = 8
+TAG_DICT = 9
+TAG_SET = 10
+TAG_FROZENSET = 11
+TAG_OBJECT = 12
+TAG_STR_REF = 13
+# tags from here on are the integers 0 to 255 - TAG_SMALL_INT
+TAG_SMALL_INT = 0x40
+SMALL_INT_LIMIT = 256 - TAG_SMALL_INT
+
+_CONTAINER_TAGS = {
+	list: TAG_LIST,
+	tuple: TAG_TUPLE,
+	set: TAG_SET,
+	frozenset: TAG_FROZENSET,
+}
+_CONTAINER_TYPES = {tag: container_type for container_type, tag in _CONTAINER_TAGS.items()}
+
+_float = struct.Struct('>d')
+_type_id = struct.Struct('>I')
+_object_getstate = getattr(object, '__getstate__', None)
+
+
+class BinaryCodec:
+	NAME = 'binary'
+
+	# first bytes of encoded data, pickle data always starts with b'\x80'
+	MAGIC = b'\xfe\x01'
+
+	# origin => {type id: class}, same origins as for pickle
+	_classes = {
+		'client': {},
+		'server': {},
+	}
+	_type_ids = {} # class => type id
+
+	@classmethod
+	def register(cls, origin, klass):
+		"""Allows instances of klass to be sent over the network.
+		@param origin: 'client', 'server' or 'common', see SafeUnpickler.add
+		"""
+		name = '{}.{}'.format(klass.__module__, klass.__qualname__)
+		type_id = zlib.crc32(name.encode())
+		for other in cls._classes['client'].get(type_id), cls._classes['server'].get(type_id):
+			if other is not None and other is not klass:
+				raise RuntimeError("Type id of {} collides with {}".format(klass, other))
+		cls._type_ids[klass] = type_id
+		for origin in (['client', 'server'] if origin == 'common' else [origin]):
+			cls._classes[origin][type_id] = klass
+
+	@classmethod
+	def is_encoded(cls, data):
+		return data[:len(cls.MAGIC)] == cls.MAGIC
+
+	@classmethod
+	def encode(cls, value):
+		"""Returns value as bytes.
+		@throws CodecError if value contains types that are not supported"""
+		out = bytearray(cls.MAGIC)
+		_encode(value, out, {}, cls._type_ids)
+		return bytes(out)
+
+	@classmethod
+	def decode(cls, data, origin):
+		"""Returns the value encoded in data.
+		@param origin: only classes registered for this origin are accepted
+		@throws CodecError if data is malformed or contains unknown classes"""
+		if not cls.is_encoded(data):
+			raise CodecError("Data is not encoded with the binary codec")
+		data = bytes(data)
+		# too deeply nested data raises RuntimeError (RecursionError is a subclass since python 3.5)
+		try:
+			value, pos = _decode(data, len(cls.MAGIC), cls._classes[origin], [])
+		except (IndexError, struct.error, UnicodeDecodeError, TypeError, RuntimeError) as e:
+			raise CodecError("Malformed data: {}".format(e))
+		if pos != len(data):
+			raise CodecError("Malformed data: {:d} trailing bytes".format(len(data) - pos))
+		return value
+
+
+# The functions below are called for every single value, they are module level functions
+# and use module level constants only because that is noticeably faster.
+
+def _encode(value, out, strings, type_ids):
+	"""@param strings: {str: index} of the strings that have already been written"""
+	# exact type checks, subclasses (e.g. of int) would change their type when decoded
+	value_type = type(value)
+	if value_type is int:
+		if 0 <= value < SMALL_INT_LIMIT:
+			out.append(TAG_SMALL_INT + value)
+		else:
+			out.append(TAG_INT)
+			_write_varint((value << 1) if value >= 0 else ((-value << 1) - 1), out)
+	elif value_type is str:
+		index = strings.get(value)
+		if index is not None:
+			out.append(TAG_STR_REF)
+			_write_varint(index, out)
+		else:
+			strings[value] = len(strings)
+			data = value.encode('utf-8')
+			out.append(TAG_STR)
+			_write_varint(len(data), out)
+			out += data
+	elif value is None:
+		out.append(TAG_NONE)
+	elif value_type is bool:
+		out.append(TAG_TRUE if value else TAG_FALSE)
+	elif value_type is dict:
+		out.append(TAG_DICT)
+		_write_varint(len(value), out)
+		for key, item in value.items():
+			_encode(key, out, strings, type_ids)
+			_encode(item, out, strings, type_ids)
+	elif value_type in _CONTAINER_TAGS:
+		out.append(_CONTAINER_TAGS[value_type])
+		_write_varint(len(value), out)
+		for item in value:
+			_encode(item, out, strings, type_ids)
+	elif value_type is float:
+		out.append(TAG_FLOAT)
+		out += _float.pack(value)
+	elif value_type is bytes:
+		out.append(TAG_BYTES)
+		_write_varint(len(value), out)
+		out += value
+	else:
+		type_id = type_ids.get(value_type)
+		if type_id is None:
+			raise CodecError("Can't encode value of type {}".format(value_type))
+		out.append(TAG_OBJECT)
+		out += _type_id.pack(type_id)
+		# same as pickle: a custom __getstate__ decides what gets sent
+		if getattr(value_type, '__getstate__', None) is not _object_getstate:
+			state = value.__getstate__()
+		else:
+			state = value.__dict__
+		_encode(state, out, strings, type_ids)
+
+def _write_varint(value, out):
+	while value > 0x7f:
+		out.append((value & 0x7f) | 0x80)
+		value >>= 7
+	out.append(value)
+
+def _decode(data, pos, classes, strings):
+	"""@param strings: list of the strings that have been read so far"""
+	tag = data[pos]
+	pos += 1
+	if tag >= TAG_SMALL_INT:
+		return tag - TAG_SMALL_INT, pos
+	elif tag == TAG_STR_REF:
+		index, pos = _read_varint(data, pos)
+		return strings[index], pos
+	elif tag == TAG_STR:
+		length, pos = _read_length(data, pos)
+		value = data[pos:pos + length].decode('utf-8')
+		strings.append(value)
+		return value, pos + length
+	elif tag == TAG_DICT:
+		length, pos = _read_length(data, pos)
+		value = {}
+		for _ in range(length):
+			key, pos = _decode(data, pos, classes, strings)
+			value[key], pos = _decode(data, pos, classes, strings)
+		return value, pos
+	elif tag == TAG_OBJECT:
+		type_id = _type_id.unpack_from(data, pos)[0]
+		klass = classes.get(type_id)
+		if klass is None:
+			raise CodecError("Attempting to decode unknown class (id={:d})".format(type_id))
+		state, pos = _decode(data, pos + 4, classes, strings)
+		obj = klass.__new__(klass)
+		if hasattr(klass, '__setstate__'):
+			obj.__setstate__(state)
+		elif type(state) is dict:
+			obj.__dict__.update(state)
+		elif state is not None:
+			raise CodecError("Invalid state for {}".format(klass.__name__))
+		return obj, pos
+	elif tag == TAG_INT:
+		value, pos = _read_varint(data, pos)
+		return (value >> 1) if not value & 1 else -((value + 1) >> 1), pos
+	elif tag == TAG_NONE:
+		return None, pos
+	elif tag == TAG_FALSE:
+		return False, pos
+	elif tag == TAG_TRUE:
+		return True, pos
+	elif tag in _CONTAINER_TYPES:
+		length, pos = _read_length(data, pos)
+		items = []
+		for _ in range(length):
+			item, pos = _decode(data, pos, classes, strings)
+			items.append(item)
+		container_type = _CONTAINER_TYPES[tag]
+		return (items if container_type is list else container_type(items)), pos
+	elif tag == TAG_FLOAT:
+		return _float.unpack_from(data, pos)[0], pos + 8
+	elif tag == TAG_BYTES:
+		length, pos = _read_length(data, pos)
+		return data[pos:pos + length], pos + length
+	raise CodecError("Unknown tag {:d}".format(tag))
+
+def _read_varint(data, pos):
+	byte = data[pos]
+	if byte < 0x80:
+		return byte, pos + 1
+	value = 0
+	shift = 0
+	while True:
+		byte = data[pos]
+		pos += 1
+		value |= (byte & 0x7f) << shift
+		if byte < 0x80:
+			return value, pos
+		shift += 7
+
+def _read_length(data, pos):
+	length, pos = _read_varint(data, pos)
+	# every item needs at least one byte, don't let broken data allocate huge containers
+	if length > len(data) - pos:
+		raise CodecError("Malformed data: invalid length {:d}".format(length))
+	return length, pos
@@ -20,8 +20,12 @@
 # ###################################################
 
 import gettext
+import json
 import logging
+import socket
+import time
 import uuid
+from collections import OrderedDict
 
 from horizons import network
 from horizons.i18n import find_available_languages
@@ -43,15 +47,28 @@ logging.basicConfig(format = '[%(asctime)-15s] [%(levelname)s] %(message)s',
 		level = logging.DEBUG)
 
 class Server:
-	def __init__(self, hostname, port, statistic_file=None):
+	"""The lobby server.
+	@param statistic_file: if set, get_statistic() is written to this file every minute
+	@param statistic_port: if set, get_statistic() is sent as json to everyone connecting to this tcp port
+	"""
+	def __init__(self, hostname, port, statistic_file=None, statistic_port=None):
 		packets.SafeUnpickler.set_mode(client=False)
 		self.host     = None
 		self.hostname = hostname
 		self.port     = port
 		self.statistic = {
 			'file':      statistic_file,
-			'timestamp': 0,
-			'interval':  1 * 60 * 1000,
+			'next':      0, # time.monotonic() when the file will be written the next time
+			'interval':  1 * 60,
+			'port':      statistic_port,
+			'socket':    None,
+		}
+		# traffic counters, see get_statistic()
+		self.traffic = {
+			'packets_received': 0,
+			'packets_sent':     0,
+			'bytes_received':   0,
+			'bytes_sent':       0,
 		}
 		self.capabilities = {
 			'minplayers'    : 2,
@@ -60,6 +77,8 @@ class Server:
 			# there's still a per packet maximum defined in the
 			# individual packet classes
 			'maxpacketsize' : 2 * 1024 * 1024,
+			# wire formats besides pickle, a client enables one with cmd_sessionprops
+			'codecs'        : [packets.BinaryCodec.NAME],
 		}
 		self.callbacks = {
 			'onconnect':     [self.onconnect],
@@ -87,7 +106,7 @@ class Server:
 			'terminategame': [self.terminategame],
 			'gamedata':      [self.gamedata],
 		}
-		self.games   = [] # list of games
+		self.games   = OrderedDict() # uuid => Game() dict, in order of creation
 		self.players = {} # sessionid => Player() dict
 		self.i18n    = {} # lang => gettext dict
 		self.check_urandom()
@@ -168,41 +187,92 @@ class Server:
 			# these exceptions do not provide any information.
 			raise network.NetworkException("Unable to create network structure: {0!s}".format((e)))
 
+		if self.statistic['port'] is not None:
+			self.open_statistic_socket()
+
 		logging.debug("Entering the main loop...")
 		while True:
-			if self.statistic['file'] is not None:
-				if self.statistic['timestamp'] <= 0:
-					self.print_statistic(self.statistic['file'])
-					self.statistic['timestamp'] = self.statistic['interval']
-				else:
-					self.statistic['timestamp'] -= CONNECTION_TIMEOUT
+			self.check_statistic_file()
+			self.check_statistic_requests()
 
 			event = self.host.service(CONNECTION_TIMEOUT)
-			if event.type == enet.EVENT_TYPE_NONE:
-				continue
-			elif event.type == enet.EVENT_TYPE_CONNECT:
-				self.call_callbacks("onconnect", event)
-			elif event.type == enet.EVENT_TYPE_DISCONNECT:
-				self.call_callbacks("ondisconnect", event)
-			elif event.type == enet.EVENT_TYPE_RECEIVE:
-				self.call_callbacks("onreceive", event)
-			else:
-				logging.warning("Invalid packet ({0})".format(event.type))
+			# handle everything that has arrived, then send all replies at once
+			# (check_events returns None instead of an empty event in some pyenet versions)
+			while event is not None and event.type != enet.EVENT_TYPE_NONE:
+				if event.type == enet.EVENT_TYPE_CONNECT:
+					self.call_callbacks("onconnect", event)
+				elif event.type == enet.EVENT_TYPE_DISCONNECT:
+					self.call_callbacks("ondisconnect", event)
+				elif event.type == enet.EVENT_TYPE_RECEIVE:
+					self.call_callbacks("onreceive", event)
+				else:
+					logging.warning("Invalid packet ({0})".format(event.type))
+				event = self.host.check_events()
+			self.host.flush()
+
+	def check_statistic_file(self):
+		"""Writes the statistic file if it is due."""
+		if self.statistic['file'] is None:
+			return
+		now = time.monotonic()
+		if now >= self.statistic['next']:
+			self.print_statistic(self.statistic['file'])
+			self.statistic['next'] = now + self.statistic['interval']
+
+
+	def open_statistic_socket(self):
+		"""Listens on the statistic port, see check_statistic_requests()."""
+		try:
+			sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+			sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+			sock.bind((self.hostname, self.statistic['port']))
+			sock.listen(16)
+		except OSError as e:
+			raise network.NetworkException("Unable to open statistic port: {0!s}".format(e))
+		# the main loop only looks for connections, it must not wait for them
+		sock.setblocking(False)
+		self.statistic['socket'] = sock
+		self.statistic['port'] = sock.getsockname()[1]
+
+	def check_statistic_requests(self):
+		"""Sends the statistic as one line of json to everyone who connected to the statistic port."""
+		sock = self.statistic['socket']
+		if sock is None:
+			return
+		while True:
+			try:
+				connection, address = sock.accept()
+			except (BlockingIOError, InterruptedError):
+				return
+			except OSError as e:
+				logging.warning("[STATISTIC] Unable to accept connection: {0!s}".format(e))
+				return
+			try:
+				connection.settimeout(1)
+				connection.sendall(json.dumps(self.get_statistic()).encode() + b'\n')
+			except OSError as e:
+				logging.warning("[STATISTIC] Unable to send statistic to {0!s}: {1!s}".format(address, e))
+			finally:
+				connection.close()
 
 
 	def send(self, peer, packet, channelid=0):
 		if self.host is None:
 			raise network.NotConnected("Server is not running")
 
-		self.sendraw(peer, packet.serialize(), channelid)
+		player = self.players.get(peer.data)
+		codec = player.codec if player is not None else None
+		self.sendraw(peer, packet.serialize(codec), channelid)
 
 	def sendraw(self, peer, data, channelid=0):
 		if self.host is None:
 			raise network.NotConnected("Server is not running")
 
+		self.traffic['packets_sent'] += 1
+		self.traffic['bytes_sent'] += len(data)
+		# the main loop flushes once all received packets have been handled
 		packet = enet.Packet(data, enet.PACKET_FLAG_RELIABLE)
 		peer.send(channelid, packet)
-		self.host.flush()
 
 
 	def disconnect(self, peer, later=True):
@@ -277,6 +347,8 @@ class Server:
 			return
 
 		player = self.players[peer.data]
+		self.traffic['packets_received'] += 1
+		self.traffic['bytes_received'] += len(event.packet.data)
 
 		# check packet size
 		if len(event.packet.data) > self.capabilities['maxpacketsize']:
@@ -346,6 +418,9 @@ class Server:
 		if hasattr(packet, 'lang'):
 			if packet.lang in self.i18n:
 				player.gettext = self.i18n[packet.lang]
+		if hasattr(packet, 'codec'):
+			if packet.codec in self.capabilities['codecs']:
+				player.codec = packet.codec
 		self.send(player.peer, packets.cmd_ok())
 
 	def oncreategame(self, player, packet):
@@ -359,18 +434,18 @@ class Server:
 				format(self.capabilities['maxplayers']))
 		game = Game(packet, player)
 		logging.debug("[CREATE] [{0!s}] {1!s} created {2!s}".format(game.uuid, player, game))
-		self.games.append(game)
+		self.games[game.uuid] = game
 		self.send(player.peer, packets.server.data_gamestate(game))
 
 	def deletegame(self, game):
 		logging.debug("[REMOVE] [{0!s}] {1!s} removed".format(game.uuid, game))
 		game.clear()
-		self.games.remove(game)
+		del self.games[game.uuid]
 
 	def onlistgames(self, player, packet):
 		logging.debug("[LIST]")
 		gameslist = packets.server.data_gameslist()
-		for _game in self.games:
+		for _game in self.games.values():
 			if _game.creator.protocol != player.protocol:
 				continue
 			if not _game.is_open():
@@ -388,14 +463,9 @@ class Server:
 
 
 	def __find_game_from_uuid(self, packet):
-		game = None
-		for _game in self.games:
-			if packet.clientversion != _game.creator.version:
-				continue
-			if packet.uuid != _game.uuid:
-				continue
-			game = _game
-			break
+		game = self.games.get(packet.uuid)
+		if game is None or packet.clientversion != game.creator.version:
+			return None
 		return game
 
 
@@ -680,16 +750,17 @@ class Server:
 				self.send(_player.peer, packets.server.savegame_data(packet.data, player.sid, game.mapname))
 
 
-	def print_statistic(self, file):
-		lines = []
-		lines.append("Games.Total: {0:d}\n".format(len(self.games)))
+	def get_statistic(self):
+		"""Returns the server statistic as OrderedDict {name: int}."""
+		statistic = OrderedDict()
+		statistic['Games.Total'] = len(self.games)
 		games_playing = 0
-		for game in self.games:
+		for game in self.games.values():
 			if game.state is Game.State.Running:
 				games_playing += 1
-		lines.append("Games.Playing: {0:d}\n".format(games_playing))
+		statistic['Games.Playing'] = games_playing
 
-		lines.append("Players.Total: {0:d}\n".format(len(self.players)))
+		statistic['Players.Total'] = len(self.players)
 		players_inlobby = 0
 		players_playing = 0
 		players_oldprotocol = 0
@@ -702,10 +773,18 @@ class Server:
 				players_inlobby += 1
 			if player.protocol < PROTOCOLS[-1]:
 				players_oldprotocol += 1
-		lines.append("Players.Lobby: {0:d}\n".format(players_inlobby))
-		lines.append("Players.Playing: {0:d}\n".format(players_playing))
-		lines.append("Players.OldProtocol: {0:d}\n".format(players_oldprotocol))
+		statistic['Players.Lobby'] = players_inlobby
+		statistic['Players.Playing'] = players_playing
+		statistic['Players.OldProtocol'] = players_oldprotocol
 
+		statistic['Traffic.PacketsReceived'] = self.traffic['packets_received']
+		statistic['Traffic.PacketsSent'] = self.traffic['packets_sent']
+		statistic['Traffic.BytesReceived'] = self.traffic['bytes_received']
+		statistic['Traffic.BytesSent'] = self.traffic['bytes_sent']
+		return statistic
+
+	def print_statistic(self, file):
+		lines = ["{0}: {1:d}\n".format(name, value) for name, value in self.get_statistic().items()]
 		try:
 			with open(file, "w") as fd:
 				fd.write('\n'.join(lines))
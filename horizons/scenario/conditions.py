@@ -247,7 +247,7 @@ def _building_connected_to_any_of(session, building_class, *classes):
 	found_connected = 0
 	for building in building_to_check:
 		for check in check_connection:
-			if StaticPather.get_path_on_roads(building.island, building, check):
+			if StaticPather.is_connected_by_road(building.island, building, check):
 				found_connected += 1
 				break
 	return found_connected
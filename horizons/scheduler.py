@@ -19,8 +19,9 @@
 # 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 # ###################################################
 
+import heapq
 import logging
-from collections import deque
+from collections import OrderedDict, deque
 
 import horizons.main
 from horizons.constants import GAME
@@ -32,10 +33,15 @@ class Scheduler(LivingObject, metaclass=ManualConstructionSingleton):
 	""""Class providing timed callbacks.
 	Master of time.
 
-	TODO:
-	- Refactor to use a data structure that is suitable for iteration (ticking) as well as
-	  searching/deleting by instance, possibly also by callback.
-	  Suggestion: { tick -> { instance -> [callback] }} (basically a k-d tree)
+	Callbacks are kept in two structures:
+	- self.schedule: { tick -> deque of callbacks }, in execution order (FIFO within a tick).
+	- self.calls_by_instance: { instance -> OrderedDict { callback: None } }, an index used
+	  for removal and lookup by instance (and callback) that keeps the order of registration.
+
+	Removing a call only marks it invalid (a tombstone) and updates the index, so removal
+	costs O(calls of that instance) instead of O(all scheduled calls). Invalid entries are
+	skipped when their tick is executed; a tick queue that consists mostly of tombstones
+	is compacted, a queue with only tombstones is dropped.
 
 
 	@param timer: Timer instance the schedular registers itself with.
@@ -46,6 +52,10 @@ class Scheduler(LivingObject, metaclass=ManualConstructionSingleton):
 	# the tick with this id is actually executed, and no tick with a smaller number can occur
 	FIRST_TICK_ID = 0
 
+	# a future tick queue is compacted when at least this many of its entries are invalid
+	# and the invalid entries make up at least half of it
+	COMPACTION_THRESHOLD = 32
+
 	def __init__(self, timer):
 		"""
 		@param timer: Timer obj
@@ -53,7 +63,9 @@ class Scheduler(LivingObject, metaclass=ManualConstructionSingleton):
 		super(Scheduler, self).__init__()
 		self.schedule = {}
 		self.additional_cur_tick_schedule = [] # jobs to be executed at the same tick they were added
-		self.calls_by_instance = {} # for get_classinst_calls
+		self.calls_by_instance = {} # for get_classinst_calls and removal
+		self._invalid_counts = {} # tick -> number of invalid entries still in self.schedule[tick]
+		self._pending_ticks = [] # heap of keys of self.schedule, may contain stale entries
 		self.cur_tick = self.__class__.FIRST_TICK_ID - 1 # before ticking
 		self.timer = timer
 		self.timer.add_call(self.tick)
@@ -61,6 +73,9 @@ class Scheduler(LivingObject, metaclass=ManualConstructionSingleton):
 	def end(self):
 		self.log.debug("Scheduler end; len: %s", len(self.schedule))
 		self.schedule = None
+		self.calls_by_instance = {}
+		self._invalid_counts = {}
+		self._pending_ticks = []
 		self.timer.remove_call(self.tick)
 		self.timer = None
 		super(Scheduler, self).end()
@@ -72,6 +87,11 @@ class Scheduler(LivingObject, metaclass=ManualConstructionSingleton):
 		assert tick_id == self.cur_tick + 1
 		self.cur_tick = tick_id
 
+		# drop the keys of ticks that are over, else the heap grows for the whole game
+		pending = self._pending_ticks
+		while pending and pending[0] <= tick_id:
+			heapq.heappop(pending)
+
 		if GAME.MAX_TICKS is not None and tick_id >= GAME.MAX_TICKS:
 			horizons.main.quit()
 			return
@@ -88,25 +108,22 @@ class Scheduler(LivingObject, metaclass=ManualConstructionSingleton):
 				#       (i.e. if e.g. pop() was used here). This is an indication of invalid assumptions
 				#       in the program and should be fixed.
 
-				if hasattr(callback, "invalid"):
+				if callback.invalid:
 					self.log.debug("S(t:%s): %s: INVALID", tick_id, callback)
 					continue
 				self.log.debug("S(t:%s): %s", tick_id, callback)
 				callback.callback()
 				assert callback.loops >= -1
+				if callback.invalid:
+					continue # the callback has removed itself
 				if callback.loops != 0:
 					self.add_object(callback, readd=True)
 				else: # gone for good
-					if callback.class_instance in self.calls_by_instance:
-						# this can already be removed by e.g. rem_all_classinst_calls
-						if callback.finish_callback is not None:
-							callback.finish_callback()
-
-						try:
-							self.calls_by_instance[callback.class_instance].remove(callback)
-						except ValueError:
-							pass # also the callback can be deleted by e.g. rem_call
+					if callback.finish_callback is not None:
+						callback.finish_callback()
+					self._unregister(callback)
 			del self.schedule[self.cur_tick]
+			self._invalid_counts.pop(self.cur_tick, None)
 
 			self.log.debug("Scheduler: finished tick %s", self.cur_tick)
 
@@ -115,6 +132,42 @@ class Scheduler(LivingObject, metaclass=ManualConstructionSingleton):
 
 		assert (not self.schedule) or next(iter(self.schedule.keys())) > self.cur_tick
 
+	def next_tick(self):
+		"""Returns the id of the next tick that has calls scheduled.
+		@return: int or None if nothing is scheduled"""
+		pending = self._pending_ticks
+		while pending and (pending[0] <= self.cur_tick or pending[0] not in self.schedule):
+			heapq.heappop(pending)
+		return pending[0] if pending else None
+
+	def run_until(self, tick_id):
+		"""Executes all ticks up to and including tick_id as fast as possible.
+		Ticks without scheduled calls are skipped instead of being executed one by one.
+		Only the scheduler is ticked, so this must not be used when other code relies on
+		being called every tick via the timer (e.g. the multiplayer manager).
+		@param tick_id: int id of the last tick to execute
+		@return: int, the current tick after running"""
+		while self.cur_tick < tick_id and self.schedule is not None:
+			if GAME.MAX_TICKS is not None and self.cur_tick >= GAME.MAX_TICKS:
+				break
+			if self.additional_cur_tick_schedule:
+				next_tick = self.cur_tick + 1
+			else:
+				next_tick = self.next_tick()
+				if next_tick is None or next_tick > tick_id:
+					next_tick = tick_id
+				if GAME.MAX_TICKS is not None:
+					next_tick = min(next_tick, GAME.MAX_TICKS)
+			self.cur_tick = next_tick - 1 # nothing happens in the skipped ticks
+			self.tick(next_tick)
+		return self.cur_tick
+
+	def advance(self, ticks):
+		"""Executes the next `ticks` ticks as fast as possible, see run_until.
+		@param ticks: int number of ticks
+		@return: int, the current tick after running"""
+		return self.run_until(self.cur_tick + ticks)
+
 	def before_ticking(self):
 		"""Called after game load and before game has started.
 		Callbacks with run_in=0 are used as generic "do this as soon as the current context
@@ -134,6 +187,10 @@ class Scheduler(LivingObject, metaclass=ManualConstructionSingleton):
 		@param callback_obj: CallbackObject type object, containing all necessary  information
 		@param readd: Whether this object is added another time (looped)
 		"""
+		if not readd and callback_obj.invalid:
+			# a removed call is added again, its old entry must not be executed
+			self._purge(callback_obj)
+			callback_obj.invalid = False
 		if callback_obj.loops > 0:
 			callback_obj.loops -= 1
 		if callback_obj.run_in == 0: # run in the current tick
@@ -143,12 +200,13 @@ class Scheduler(LivingObject, metaclass=ManualConstructionSingleton):
 			tick_key = self.cur_tick + interval
 			if tick_key not in self.schedule:
 				self.schedule[tick_key] = deque()
+				heapq.heappush(self._pending_ticks, tick_key)
 			callback_obj.tick = tick_key
 			self.schedule[tick_key].append(callback_obj)
 			if not readd:  # readded calls haven't been removed here
 				if callback_obj.class_instance not in self.calls_by_instance:
-					self.calls_by_instance[callback_obj.class_instance] = []
-				self.calls_by_instance[callback_obj.class_instance].append(callback_obj)
+					self.calls_by_instance[callback_obj.class_instance] = OrderedDict()
+				self.calls_by_instance[callback_obj.class_instance][callback_obj] = None
 
 	def add_new_object(self, callback, class_instance, run_in=1, loops=1, loop_interval=None, finish_callback=None):
 		"""Creates a new CallbackObject instance and calls the self.add_object() function.
@@ -165,32 +223,17 @@ class Scheduler(LivingObject, metaclass=ManualConstructionSingleton):
 		@param callback_obj: CallbackObject to remove
 		@return: int, number of removed calls
 		"""
-		removed_objs = 0
-		if self.schedule is not None:
-			for key in self.schedule:
-				while callback_obj in self.schedule[key]:
-					self.schedule[key].remove(callback_obj)
-					self.calls_by_instance[callback_obj.class_instance].remove(callback_obj)
-					removed_objs += 1
-
-		if not self.calls_by_instance[callback_obj.class_instance]:
-			del self.calls_by_instance[callback_obj.class_instance]
-
-		return removed_objs
+		if self.schedule is None or not self._unregister(callback_obj):
+			return 0
+		self._invalidate(callback_obj)
+		return 1
 
 	def rem_all_classinst_calls(self, class_instance):
 		"""Removes all callbacks from the scheduler that belong to the class instance class_inst."""
-		"""
-		for key in self.schedule:
-			callback_objects = self.schedule[key]
-			for i in xrange(len(callback_objects) - 1, -1, -1):
-				if callback_objects[i].class_instance is class_instance:
-					del callback_objects[i]
-		"""
-		if class_instance in self.calls_by_instance:
-			for callback_obj in self.calls_by_instance[class_instance]:
-				callback_obj.invalid = True # don't remove, finding them all takes too long
-			del self.calls_by_instance[class_instance]
+		calls = self.calls_by_instance.pop(class_instance, None)
+		if calls is not None and self.schedule is not None:
+			for callback_obj in calls:
+				self._invalidate(callback_obj)
 
 		# filter additional callbacks as well
 		self.additional_cur_tick_schedule = \
@@ -205,43 +248,77 @@ class Scheduler(LivingObject, metaclass=ManualConstructionSingleton):
 		"""
 		assert callable(callback)
 		removed_calls = 0
-		for key in self.schedule:
-			callback_objects = self.schedule[key]
-			for i in range(len(callback_objects) - 1, -1, -1):
-				if (callback_objects[i].class_instance is instance
-				    and callback_objects[i].callback == callback
-				    and not hasattr(callback_objects[i], "invalid")):
-					del callback_objects[i]
-					removed_calls += 1
-
-		test = 0
-		if removed_calls > 0: # there also must be calls in the calls_by_instance dict
-			for i in range(len(self.calls_by_instance[instance]) - 1, -1, -1):
-				obj = self.calls_by_instance[instance][i]
-				if obj.callback == callback:
-					del self.calls_by_instance[instance][i]
-					test += 1
-			assert test == removed_calls, "{}, {}".format(test, removed_calls)
-			if not self.calls_by_instance[instance]:
+		calls = self.calls_by_instance.get(instance)
+		if calls is not None and self.schedule is not None:
+			for callback_obj in [obj for obj in calls if obj.callback == callback]:
+				del calls[callback_obj]
+				self._invalidate(callback_obj)
+				removed_calls += 1
+			if not calls:
 				del self.calls_by_instance[instance]
 
 		for i in range(len(self.additional_cur_tick_schedule) - 1, -1, -1):
 			if self.additional_cur_tick_schedule[i].class_instance is instance and \
 				self.additional_cur_tick_schedule[i].callback == callback:
-					del callback_objects[i]
+					del self.additional_cur_tick_schedule[i]
 					removed_calls += 1
 
 		return removed_calls
 
+	def _unregister(self, callback_obj):
+		"""Removes a call from the instance index.
+		@return: bool, whether the call was registered"""
+		calls = self.calls_by_instance.get(callback_obj.class_instance)
+		if calls is None or callback_obj not in calls:
+			return False
+		del calls[callback_obj]
+		if not calls:
+			del self.calls_by_instance[callback_obj.class_instance]
+		return True
+
+	def _invalidate(self, callback_obj):
+		"""Marks a call as invalid, it stays in its tick queue as tombstone.
+		Queues of future ticks are compacted or dropped once they contain enough tombstones."""
+		callback_obj.invalid = True
+		tick = callback_obj.tick
+		if tick == self.cur_tick or tick not in self.schedule:
+			return # currently executed, the queue is discarded after this tick anyway
+
+		queue = self.schedule[tick]
+		invalid_count = self._invalid_counts.get(tick, 0) + 1
+		if invalid_count >= len(queue):
+			del self.schedule[tick]
+			self._invalid_counts.pop(tick, None)
+		elif invalid_count >= self.COMPACTION_THRESHOLD and 2 * invalid_count >= len(queue):
+			self.schedule[tick] = deque(cb for cb in queue if not cb.invalid)
+			self._invalid_counts.pop(tick, None)
+		else:
+			self._invalid_counts[tick] = invalid_count
+
+	def _purge(self, callback_obj):
+		"""Physically removes the tombstone of an invalid call from its tick queue."""
+		queue = self.schedule.get(callback_obj.tick)
+		if queue is None or callback_obj not in queue:
+			return
+		queue.remove(callback_obj)
+		if callback_obj.tick == self.cur_tick:
+			return
+		invalid_count = self._invalid_counts.pop(callback_obj.tick) - 1
+		if not queue:
+			del self.schedule[callback_obj.tick]
+		elif invalid_count:
+			self._invalid_counts[callback_obj.tick] = invalid_count
+
 	def get_classinst_calls(self, instance, callback=None):
 		"""Returns all CallbackObjects of instance.
 		Optionally, a specific callback can be specified.
 		@param instance: the instance to execute the call
 		@param callback: None to get all calls of instance,
 		                 else only calls that execute callback.
-		@return: dict, entries: { CallbackObject: remaining_ticks_to_executing }
+		@return: OrderedDict in order of registration,
+		         entries: { CallbackObject: remaining_ticks_to_executing }
 		"""
-		calls = {}
+		calls = OrderedDict()
 		if instance in self.calls_by_instance:
 			for callback_obj in self.calls_by_instance[instance]:
 				if  callback is None or callback_obj.callback == callback:
@@ -271,6 +348,9 @@ class Scheduler(LivingObject, metaclass=ManualConstructionSingleton):
 
 class _CallbackObject:
 	"""Class used by the TimerManager Class to organize callbacks."""
+	__slots__ = ('callback', 'finish_callback', 'run_in', 'loops', 'loop_interval',
+	             'class_instance', 'tick', 'invalid')
+
 	def __init__(self, scheduler, callback, class_instance, run_in, loops, loop_interval, finish_callback=None):
 		"""Creates the CallbackObject instance.
 		@param scheduler: reference to the scheduler, necessary to react properly on weak reference callbacks
@@ -289,6 +369,8 @@ class _CallbackObject:
 		self.loops = loops
 		self.loop_interval = loop_interval if loop_interval is not None else run_in
 		self.class_instance = class_instance
+		self.tick = None # tick the call is scheduled for
+		self.invalid = False # set when the call has been removed from the scheduler
 
 	def __str__(self):
 		cb = str(self.callback)
@@ -23,6 +23,7 @@ import json
 import logging
 import os
 import os.path
+import threading
 import time
 import traceback
 from random import Random
@@ -40,11 +41,12 @@ from horizons.entities import Entities
 from horizons.extscheduler import ExtScheduler
 from horizons.gui.ingamegui import IngameGui
 from horizons.i18n import gettext as T
-from horizons.messaging import LoadingProgress, MessageBus, SettingChanged, SpeedChanged
+from horizons.messaging import (
+	LoadingProgress, MessageBus, SavegameWritten, SettingChanged, SpeedChanged)
 from horizons.savegamemanager import SavegameManager
 from horizons.scenario import ScenarioEventHandler
 from horizons.scheduler import Scheduler
-from horizons.util.dbreader import DbReader
+from horizons.util.dbreader import BufferedDbWriter
 from horizons.util.living import LivingObject, livingProperty
 from horizons.util.savegameaccessor import SavegameAccessor
 from horizons.util.uhdbaccessor import read_savegame_template
@@ -95,6 +97,8 @@ class Session(LivingObject):
 		self.db = db # main db for game data (game.sql)
 		# this saves how often the current game has been saved
 		self.savecounter = 0
+		# (thread, savegame path, result list) of the save that is being written in the background
+		self._background_save = None
 		self.is_alive = True
 		self.paused_ticks_per_second = GAME_SPEED.TICKS_PER_SECOND
 
@@ -168,6 +172,9 @@ class Session(LivingObject):
 		# Has to be done here, cause the manager uses Scheduler!
 		Scheduler().rem_all_classinst_calls(self)
 		ExtScheduler().rem_all_classinst_calls(self)
+		if self._background_save is not None:
+			# don't leave a half written file behind
+			self._finish_background_save(broadcast=False)
 
 		horizons.globals.fife.sound.end()
 
@@ -332,6 +339,11 @@ class Session(LivingObject):
 			self.speed_set(GAME_SPEED.TICK_RATES[0])
 
 	_pause_stack = 0 # this saves the level of pausing
+
+	# build savegames in memory and copy them to their file in one go
+	save_in_memory = True
+	# only serialize the game state for autosaves, and write the file in a thread
+	autosave_in_background = True
 	# e.g. if two dialogs are displayed, that pause the game,
 	# unpause needs to be called twice to unpause the game. cf. #876
 	def speed_pause(self, suggestion=False):
@@ -393,7 +405,7 @@ class Session(LivingObject):
 				os.unlink(savegame)
 			self.savecounter += 1
 
-			db = DbReader(savegame)
+			db = BufferedDbWriter(savegame, in_memory=self.save_in_memory)
 		except IOError as e: # usually invalid filename
 			headline = T("Failed to create savegame file")
 			descr = T("There has been an error while creating your savegame file.")
@@ -410,26 +422,108 @@ class Session(LivingObject):
 			return self.save()
 
 		try:
-			read_savegame_template(db)
-
-			db("BEGIN")
-			self.world.save(db)
-			self.view.save(db)
-			self.ingame_gui.save(db)
-			self.scenario_eventhandler.save(db)
-
-			# Store RNG state
-			rng_state = json.dumps(self.random.getstate())
-			SavegameManager.write_metadata(db, self.savecounter, rng_state)
-
-			# Make sure everything gets written now
-			db("COMMIT")
+			self._write_savegame(db)
 			db.close()
 			return True
 		except Exception:
 			self.log.error("Save Exception:")
 			traceback.print_exc()
 			# remove invalid savegamefile (but close db connection before deleting)
-			db.close()
+			db.close(write=False)
 			os.unlink(savegame)
 			return False
+
+	def _do_save_in_background(self, savegame):
+		"""Saves the game to savegame without waiting for the file to be written.
+
+		The rows of the game state are collected right away. Inserting them into an in memory
+		db and copying that to the file happens in a thread. SavegameWritten is broadcast when
+		it is complete.
+		Only one save can be written in the background at a time.
+		@param savegame: absolute path
+		@return: bool, whether the game state could be serialized
+		"""
+		assert os.path.isabs(savegame)
+		if self._background_save is not None:
+			self.log.warning("Session: not saving to %s, still writing %s",
+			                 savegame, self._background_save[1])
+			return False
+		self.log.debug("Session: Saving to %s in the background", savegame)
+
+		db = None
+		try:
+			if os.path.exists(savegame):
+				os.unlink(savegame)
+			self.savecounter += 1
+			db = BufferedDbWriter(savegame, in_memory=True, check_same_thread=False)
+			# the collected rows are the snapshot, the thread writes them
+			self._write_savegame(db, commit=False)
+		except Exception:
+			self.log.error("Save Exception:")
+			traceback.print_exc()
+			if db is not None:
+				db.close(write=False)
+			if os.path.exists(savegame):
+				os.unlink(savegame)
+			return False
+
+		result = []
+		thread = threading.Thread(target=self._write_savegame_file, args=(db, result),
+		                          name='savegame writer')
+		thread.start()
+		self._background_save = (thread, savegame, result)
+		ExtScheduler().add_new_object(self._check_background_save, self, run_in=0.1)
+		return True
+
+	@classmethod
+	def _write_savegame_file(cls, db, result):
+		"""Runs in a thread, must not touch the game state."""
+		try:
+			db("COMMIT")
+			db.close()
+			result.append(True)
+		except Exception:
+			cls.log.error("Save Exception:")
+			traceback.print_exc()
+			result.append(False)
+
+	def _check_background_save(self):
+		"""Called regularly while a save is being written in the background."""
+		if self._background_save[0].is_alive():
+			ExtScheduler().add_new_object(self._check_background_save, self, run_in=0.1)
+		else:
+			self._finish_background_save()
+
+	def _finish_background_save(self, broadcast=True):
+		"""Waits for the background save to be complete and cleans up after it."""
+		thread, savegame, result = self._background_save
+		thread.join()
+		self._background_save = None
+		ExtScheduler().rem_call(self, self._check_background_save)
+
+		success = bool(result) and result[0]
+		if not success and os.path.exists(savegame):
+			os.unlink(savegame)
+		if broadcast:
+			SavegameWritten.broadcast(self, savegame, success)
+
+	def _write_savegame(self, db, commit=True):
+		"""Writes the game state to db, which has to be empty.
+		@param db: DbReader, usually a BufferedDbWriter
+		@param commit: bool, whether to commit the transaction. If False, the caller has to
+		               do it, for a BufferedDbWriter this writes the collected rows."""
+		read_savegame_template(db)
+
+		db("BEGIN")
+		self.world.save(db)
+		self.view.save(db)
+		self.ingame_gui.save(db)
+		self.scenario_eventhandler.save(db)
+
+		# Store RNG state
+		rng_state = json.dumps(self.random.getstate())
+		SavegameManager.write_metadata(db, self.savecounter, rng_state)
+
+		# Make sure everything gets written now
+		if commit:
+			db("COMMIT")
@@ -24,7 +24,9 @@ import random
 from horizons.constants import SINGLEPLAYER
 from horizons.i18n import gettext as T
 from horizons.manager import SPManager
+from horizons.messaging import SavegameWritten
 from horizons.savegamemanager import SavegameManager
+from horizons.scheduler import Scheduler
 from horizons.session import Session
 from horizons.timer import Timer
 
@@ -46,13 +48,36 @@ class SPSession(Session):
 		# single player games start right away
 		self.start()
 
+	def start(self):
+		super(SPSession, self).start()
+		SavegameWritten.subscribe(self._on_savegame_written, sender=self)
+
+	def fast_forward(self, tick_id):
+		"""Simulates the game up to tick tick_id without waiting for real time.
+		Ticks without scheduled calls are skipped, see Scheduler.run_until.
+		@param tick_id: int id of the last tick to simulate"""
+		self.log.debug("Session: fast forwarding from tick %s to %s", Scheduler().cur_tick, tick_id)
+		Scheduler().run_until(tick_id)
+		self.timer.tick_next_id = Scheduler().cur_tick + 1
+
 	def autosave(self):
 		"""Called automatically in an interval"""
 		self.log.debug("Session: autosaving")
-		success = self._do_save(SavegameManager.create_autosave_filename())
-		if success:
-			SavegameManager.delete_dispensable_savegames(autosaves=True)
-			self.ingame_gui.message_widget.add('AUTOSAVE')
+		savegame = SavegameManager.create_autosave_filename()
+		if self.autosave_in_background:
+			# finished in _on_savegame_written
+			self._do_save_in_background(savegame)
+		elif self._do_save(savegame):
+			self._autosave_finished()
+
+	def _on_savegame_written(self, message):
+		# only autosaves are written in the background
+		if message.success:
+			self._autosave_finished()
+
+	def _autosave_finished(self):
+		SavegameManager.delete_dispensable_savegames(autosaves=True)
+		self.ingame_gui.message_widget.add('AUTOSAVE')
 
 	def quicksave(self):
 		"""Called when user presses the quicksave hotkey"""
@@ -64,11 +64,7 @@ class BuildingIndexer:
 		@param initial: can be set on first call as optimization
 		"""
 		for building in self._remove_set:
-			for coords in building.position.get_radius_coordinates(self.radius, include_self=True):
-				try:
-					index = self._map[coords]
-				except KeyError:
-					continue # should be faster than contains check, since usually True
+			for index in building.position.get_radius_values(self._map, self.radius, include_self=True):
 				index._remove_set.add(building)
 				index._add_set.discard(building)
 				index._changed = True
@@ -76,11 +72,7 @@ class BuildingIndexer:
 		if not add_buildings:
 			add_buildings = self._add_set
 		for building in add_buildings:
-			for coords in building.position.get_radius_coordinates(self.radius, include_self=True):
-				try:
-					index = self._map[coords]
-				except KeyError:
-					continue # should be faster than contains check, since usually True
+			for index in building.position.get_radius_values(self._map, self.radius, include_self=True):
 				if not initial:
 					index._remove_set.discard(building)
 				index._add_set.add(building)
@@ -0,0 +1,102 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+from horizons.util.gridbuckets import GridBuckets
+from horizons.util.shapes import Point, distances
+
+
+class BuildingTypeIndexer:
+	"""
+	Indexes the buildings of an island by type and position in a uniform grid of square cells.
+
+	Used to answer queries of the form 'which buildings of type x are at most r tiles away from
+	a position' by only looking at the buildings of that type in the cells that overlap with
+	the query area. Every building type has its own GridBuckets.
+	"""
+
+	CELL_SIZE = 16
+
+	def __init__(self, cell_size=None):
+		"""
+		@param cell_size: int, width and height of a cell in tiles
+		"""
+		self.cell_size = cell_size or self.CELL_SIZE
+		self._grids = {} # {building_id: GridBuckets}
+		self._buildings = {} # {building: [cell, ...]}
+
+	def __len__(self):
+		return len(self._buildings)
+
+	def __contains__(self, building):
+		return building in self._buildings
+
+	def add(self, building):
+		grid = self._grids.get(building.id)
+		if grid is None:
+			grid = self._grids[building.id] = GridBuckets(self.cell_size)
+		position = building.position
+		cells = grid.get_cells(position.left, position.top, position.right, position.bottom)
+		grid.add(building, cells)
+		self._buildings[building] = cells
+
+	def remove(self, building):
+		grid = self._grids[building.id]
+		grid.remove(building, self._buildings.pop(building))
+		if not grid:
+			del self._grids[building.id]
+
+	def get_buildings_in_range(self, building_id, position, radius):
+		"""
+		Returns the buildings of a type whose area is at most radius tiles away from position.
+		@param building_id: int, building type
+		@param position: Point or Rect
+		@param radius: int
+		@return: list of buildings, the nearest first, equally far ones ordered by worldid
+		"""
+		grid = self._grids.get(building_id)
+		if grid is None:
+			return []
+		if isinstance(position, Point):
+			left = right = position.x
+			top = bottom = position.y
+			coords = (position.x, position.y)
+			distance = lambda rect: distances.distance_rect_tuple(rect, coords)
+		else:
+			left, right, top, bottom = position.left, position.right, position.top, position.bottom
+			distance = lambda rect: distances.distance_rect_rect(rect, position)
+
+		found = {}
+		for buildings in grid.get_buckets(left, top, right, bottom, radius):
+			for building in buildings:
+				if building not in found:
+					dist = distance(building.position)
+					if dist <= radius:
+						found[building] = dist
+		return sorted(found, key=lambda building: (found[building], building.worldid))
+
+	def nearest(self, building_id, position, radius):
+		"""Returns the nearest building of a type in range of position or None."""
+		buildings = self.get_buildings_in_range(building_id, position, radius)
+		return buildings[0] if buildings else None
+
+	def any_in_range(self, building_id, position, radius):
+		"""Returns whether there is a building of a type in range of position."""
+		return bool(self.get_buildings_in_range(building_id, position, radius))
@@ -94,6 +94,9 @@ def get_option_parser():
 	             default=False, help="Enable profiling (for developing only).")
 	dev_group.add_option("--max-ticks", dest="max_ticks", metavar="<max_ticks>", type="int",
 	             help="Run the game for <max_ticks> ticks.")
+	dev_group.add_option("--fast-forward", dest="fast_forward", action="store_true",
+	             default=False, help="Simulate the started game as fast as possible until <max_ticks> "
+	                                 "is reached, then quit. Requires --max-ticks.")
 	dev_group.add_option("--no-freeze-protection", dest="freeze_protection", action="store_false",
 	             default=True, help="Disable freeze protection.")
 	dev_group.add_option("--string-previewer", dest="stringpreview", action="store_true",
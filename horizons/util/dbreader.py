@@ -27,10 +27,11 @@ from horizons.util.python import decorators
 
 class DbReader:
 	"""Class that handles connections to sqlite databases
-	@param file: str containing the database file."""
-	def __init__(self, dbfile):
+	@param file: str containing the database file.
+	@param check_same_thread: bool, set to False to allow using the db from another thread"""
+	def __init__(self, dbfile, check_same_thread=True):
 		self.db_path = dbfile
-		self.connection = sqlite3.connect(dbfile)
+		self.connection = sqlite3.connect(dbfile, check_same_thread=check_same_thread)
 		self.connection.isolation_level = None
 		def regexp(expr, item):
 			r = re.compile(expr)
@@ -72,3 +73,128 @@ class DbReader:
 	def close(self):
 		"""Closes the db"""
 		self.connection.close()
+
+
+class BufferedDbWriter(DbReader):
+	"""DbReader for writing lots of rows at once, e.g. when saving a game.
+
+	INSERT statements don't get executed right away, their rows are collected per table
+	and written with executemany, which reuses one prepared statement for all rows.
+	Rows of one table are inserted in the order they were passed. Any other statement
+	writes all collected rows first, so reading what has been written before works.
+
+	With in_memory, the database is built in memory and only copied to dbfile on close().
+	@param dbfile: str containing the database file.
+	@param in_memory: bool, whether to write to dbfile only on close
+	@param check_same_thread: see DbReader
+	"""
+	# matches INSERT statements and captures the table name
+	INSERT_RE = re.compile(r'\s*INSERT\s+(?:OR\s+\w+\s+)?INTO\s+[`"\']?(\w+)', re.IGNORECASE)
+
+	def __init__(self, dbfile, in_memory=False, check_same_thread=True):
+		if in_memory:
+			# open the file right away, so errors (e.g. invalid filenames) happen as usual
+			self._target_connection = sqlite3.connect(dbfile, check_same_thread=check_same_thread)
+			super(BufferedDbWriter, self).__init__(':memory:', check_same_thread)
+			self.db_path = dbfile
+		else:
+			self._target_connection = None
+			super(BufferedDbWriter, self).__init__(dbfile, check_same_thread)
+		# {table: (command, [row, ...])}
+		self._batches = {}
+		# {command: lowercase table name or None if it's no INSERT}
+		self._insert_tables = {}
+
+	def _get_insert_table(self, command):
+		"""Returns the table command inserts into or None if it isn't an INSERT statement."""
+		try:
+			return self._insert_tables[command]
+		except KeyError:
+			match = self.INSERT_RE.match(command)
+			table = match.group(1).lower() if match is not None else None
+			self._insert_tables[command] = table
+			return table
+
+	def __call__(self, command, *args):
+		"""Collects rows of INSERT statements, else the same as DbReader.__call__"""
+		table = self._get_insert_table(command)
+		if table is None:
+			self.flush()
+			return super(BufferedDbWriter, self).__call__(command, *args)
+		self._get_batch(table, command).append(args)
+		return []
+
+	def execute_many(self, command, parameters):
+		"""Collects rows of INSERT statements, else the same as DbReader.execute_many"""
+		table = self._get_insert_table(command)
+		if table is None:
+			self.flush()
+			return super(BufferedDbWriter, self).execute_many(command, parameters)
+		self._get_batch(table, command).extend(parameters)
+
+	def execute_script(self, script):
+		self.flush()
+		return super(BufferedDbWriter, self).execute_script(script)
+
+	def _get_batch(self, table, command):
+		"""Returns the list to add rows for command to."""
+		batch = self._batches.get(table)
+		if batch is None or batch[0] != command:
+			if batch is not None:
+				# keep the order of rows in the table
+				self._write_batch(*batch)
+			batch = (command, [])
+			self._batches[table] = batch
+		return batch[1]
+
+	def _write_batch(self, command, rows):
+		self.cur.executemany('{};'.format(command), rows)
+
+	def flush(self):
+		"""Writes all collected rows."""
+		batches = self._batches
+		self._batches = {}
+		for command, rows in batches.values():
+			self._write_batch(command, rows)
+
+	def _copy_to_target(self):
+		"""Copies the in memory db to its file."""
+		if hasattr(self.connection, 'backup'):
+			self.connection.backup(self._target_connection)
+			return
+
+		# Connection.backup needs python 3.7. Copy the rows with their rowids instead,
+		# the savegame code references rows by rowid.
+		schema = self.cur.execute("SELECT type, name, sql FROM sqlite_master "
+		                          "WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%'").fetchall()
+		tables = [(name, sql) for (type, name, sql) in schema if type == 'table']
+		self._target_connection.executescript(''.join(sql + ';' for name, sql in tables))
+
+		self.cur.execute('ATTACH ? AS target', (self.db_path, ))
+		self.cur.execute('BEGIN')
+		for name, sql in tables:
+			columns = ', '.join('"{}"'.format(row[1])
+			                    for row in self.cur.execute('PRAGMA table_info("{}")'.format(name)))
+			self.cur.execute('INSERT INTO target."{0}"(rowid, {1}) SELECT rowid, {1} FROM main."{0}"'
+			                 .format(name, columns))
+		self.cur.execute('COMMIT')
+		self.cur.execute('DETACH target')
+
+		# indexes, views and triggers
+		self._target_connection.executescript(
+			''.join(sql + ';' for (type, name, sql) in schema if type != 'table'))
+
+	def close(self, write=True):
+		"""Writes all collected rows and closes the db.
+		In memory databases are copied to their file before.
+		@param write: bool, set to False to drop collected rows and not copy anything,
+		              e.g. after an error"""
+		if write:
+			self.flush()
+			if self._target_connection is not None:
+				self._copy_to_target()
+		self._batches = {}
+		if self._target_connection is not None:
+			self._target_connection.close()
+			self._target_connection = None
+		super(BufferedDbWriter, self).close()
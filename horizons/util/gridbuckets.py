@@ -0,0 +1,84 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+class GridBuckets:
+	"""
+	Buckets of objects in a uniform grid of square cells, for indexes that answer range queries.
+
+	An object is stored in the bucket of every cell that its area overlaps. A query then only
+	has to look at the objects in the cells that overlap with the query area. The buckets are
+	sets, so callers have to order their results themselves.
+	"""
+
+	def __init__(self, cell_size):
+		"""
+		@param cell_size: int, width and height of a cell in tiles
+		"""
+		self.cell_size = cell_size
+		self._buckets = {} # {(cell_x, cell_y): set of objects}
+
+	def __len__(self):
+		"""Returns the number of cells that contain objects."""
+		return len(self._buckets)
+
+	def get_cells(self, left, top, right, bottom):
+		"""Returns the coordinates of the cells that overlap with the area."""
+		cell_size = self.cell_size
+		return [(cell_x, cell_y)
+		        for cell_x in range(int(left // cell_size), int(right // cell_size) + 1)
+		        for cell_y in range(int(top // cell_size), int(bottom // cell_size) + 1)]
+
+	def add(self, obj, cells):
+		"""Adds obj to the buckets of cells, see get_cells."""
+		buckets = self._buckets
+		for cell in cells:
+			bucket = buckets.get(cell)
+			if bucket is None:
+				bucket = buckets[cell] = set()
+			bucket.add(obj)
+
+	def remove(self, obj, cells):
+		"""Removes obj from the buckets of cells, which it has been added to."""
+		buckets = self._buckets
+		for cell in cells:
+			bucket = buckets[cell]
+			bucket.remove(obj)
+			if not bucket:
+				del buckets[cell]
+
+	def get_buckets(self, left, top, right, bottom, radius=0):
+		"""Returns the non-empty buckets of the cells that overlap with the area extended by radius.
+		Objects that overlap several cells are contained in several buckets.
+		@return: list of sets of objects"""
+		cell_size = self.cell_size
+		min_x = int((left - radius) // cell_size)
+		max_x = int((right + radius) // cell_size)
+		min_y = int((top - radius) // cell_size)
+		max_y = int((bottom + radius) // cell_size)
+		buckets = self._buckets
+		if (max_x - min_x + 1) * (max_y - min_y + 1) > len(buckets):
+			# huge area, looking at every bucket is cheaper
+			return list(buckets.values())
+		return [buckets[(cell_x, cell_y)]
+		        for cell_x in range(min_x, max_x + 1)
+		        for cell_y in range(min_y, max_y + 1)
+		        if (cell_x, cell_y) in buckets]
@@ -0,0 +1,99 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import logging
+from collections import OrderedDict
+
+from horizons.util.pathfinding.pathfinding import FindPath
+
+
+class PathCache:
+	"""Remembers the results of FindPath on a set of path nodes that rarely changes,
+	such as the roads of an island.
+
+	Entries are keyed by the source and destination shapes and evicted in least
+	recently used order. The owner of the path nodes has to call invalidate()
+	whenever the nodes change, which bumps the version and drops all entries.
+	"""
+	log = logging.getLogger("world.pathfinding")
+
+	DEFAULT_SIZE = 256
+
+	def __init__(self, path_nodes, size=None, diagonal=False, make_target_walkable=True, is_connected=None):
+		"""
+		@param path_nodes: path nodes as supported by FindPath, stored by reference
+		@param size: maximum number of cached paths, defaults to DEFAULT_SIZE
+		@param diagonal, make_target_walkable: see FindPath.__call__
+		@param is_connected: optional function(source, destination) that returns False if there
+		                     is no path, so that FindPath doesn't have to find that out
+		"""
+		self.path_nodes = path_nodes
+		self.is_connected = is_connected
+		self.size = size if size is not None else self.DEFAULT_SIZE
+		self.diagonal = diagonal
+		self.make_target_walkable = make_target_walkable
+		self.version = 0
+		self.hits = 0
+		self.misses = 0
+		self._paths = OrderedDict()
+
+	def __len__(self):
+		return len(self._paths)
+
+	def invalidate(self):
+		"""Has to be called when the path nodes have changed."""
+		self.version += 1
+		self._paths.clear()
+
+	def find_path(self, source, destination):
+		"""Same as FindPath()(source, destination, path_nodes) with the settings of this cache.
+		@param source, destination: Point, Rect or anything with a position
+		@return: new list of coords as tuples or None if no path is found"""
+		key = (self._get_shape_key(source), self._get_shape_key(destination))
+		try:
+			path = self._paths[key]
+		except KeyError:
+			self.misses += 1
+			if self.is_connected is not None and not self.is_connected(source, destination):
+				path = None
+			else:
+				path = FindPath()(source, destination, self.path_nodes, None,
+				                  self.diagonal, self.make_target_walkable)
+			if path is not None:
+				path = tuple(path)
+			self._paths[key] = path
+			if len(self._paths) > self.size:
+				self._paths.popitem(last=False)
+		else:
+			self.hits += 1
+			self._paths.move_to_end(key)
+
+		# callers modify their paths (e.g. when a move is stopped), so never hand out ours
+		return list(path) if path is not None else None
+
+	@staticmethod
+	def _get_shape_key(shape):
+		"""Returns an immutable key that describes the coordinates of shape.
+		Shapes can be mutable, so they can't be used as keys directly."""
+		if hasattr(shape, 'position'):
+			shape = shape.position
+		shape_type = shape.__class__.__name__.lower().replace('const', '')
+		return (shape_type, tuple(shape.tuple_iter()))
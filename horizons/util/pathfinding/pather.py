@@ -25,6 +25,8 @@ from typing import List, Tuple
 
 from horizons.util.pathfinding import PathBlockedError
 from horizons.util.pathfinding.pathfinding import FindPath
+from horizons.util.pathfinding.pathgrid import GridFindPath
+from horizons.util.pathfinding.sectorgraph import HierarchicalFindPath
 from horizons.util.shapes import Point
 
 
@@ -66,6 +68,12 @@ class AbstractPather:
 		Return value type must be supported by FindPath"""
 		raise NotImplementedError
 
+	def _get_path_grid(self):
+		"""Returns a PathGrid of the nodes returned by _get_path_nodes.
+		If a grid is returned, the grid based GridFindPath is used instead of FindPath.
+		Only worth it for big sets of nodes that don't change."""
+		return None
+
 	def _get_blocked_coords(self):
 		"""Returns blocked coordinates
 		Return value type must be supported by FindPath"""
@@ -90,6 +98,18 @@ class AbstractPather:
 				source = building
 		return source
 
+	def _find_path(self, source, destination):
+		"""Calls the pathfinding algorithm
+		@return: list of coords as tuples or None, see FindPath.__call__"""
+		path_grid = self._get_path_grid()
+		if path_grid is not None:
+			return GridFindPath()(source, destination, path_grid,
+			                      self._get_blocked_coords(), self.move_diagonal,
+			                      self.make_target_walkable)
+		return FindPath()(source, destination, self._get_path_nodes(),
+		                  self._get_blocked_coords(), self.move_diagonal,
+		                  self.make_target_walkable)
+
 	def calc_path(self, destination, destination_in_building=False, check_only=False,
 	              source=None):
 		"""Calculates a path to destination
@@ -103,12 +123,7 @@ class AbstractPather:
 		if source is None:
 			source = self._get_position()
 
-		# call algorithm
-		# to use a different pathfinding code, just change the following line
-		path = FindPath()(source, destination, self._get_path_nodes(),
-		                  self._get_blocked_coords(), self.move_diagonal,
-		                  self.make_target_walkable)
-
+		path = self._find_path(source, destination)
 		if path is None:
 			return False
 
@@ -187,9 +202,8 @@ class AbstractPather:
 		# just save each step of the path
 		# current position is calculated on loading through unit position
 		if self.path:
-			for step in range(len(self.path)):
-				db("INSERT INTO unit_path(`unit`, `index`, `x`, `y`) VALUES(?, ?, ?, ?)",
-				    unitid, step, self.path[step][0], self.path[step][1])
+			db.execute_many("INSERT INTO unit_path(`unit`, `index`, `x`, `y`) VALUES(?, ?, ?, ?)",
+			                [(unitid, step, x, y) for step, (x, y) in enumerate(self.path)])
 
 	def load(self, db, worldid):
 		"""
@@ -217,6 +231,15 @@ class ShipPather(AbstractPather):
 	def _get_path_nodes(self):
 		return self.session.world.water
 
+	def _get_path_grid(self):
+		return self.session.world.water_grid
+
+	def _find_path(self, source, destination):
+		# long trips are searched on the sector graph of the water
+		return HierarchicalFindPath()(source, destination, self.session.world.water_sectors,
+		                              self._get_blocked_coords(), self.move_diagonal,
+		                              self.make_target_walkable)
+
 	def _get_blocked_coords(self):
 		return self.session.world.ship_map
 
@@ -226,6 +249,13 @@ class FisherShipPather(ShipPather):
 	def _get_path_nodes(self):
 		return self.session.world.water_and_coastline
 
+	def _get_path_grid(self):
+		return self.session.world.water_and_coastline_grid
+
+	def _find_path(self, source, destination):
+		# fisher trips are short, and there is no sector graph for shallow water
+		return AbstractPather._find_path(self, source, destination)
+
 	def _get_blocked_coords(self):
 		# don't let fisher be blocked by other ships (#1023)
 		return []
@@ -251,6 +281,10 @@ class RoadPather(AbstractPather):
 	def _get_path_nodes(self):
 		return self.island.path_nodes.road_nodes
 
+	def _find_path(self, source, destination):
+		# roads rarely change, while collectors walk the same ways over and over
+		return self.island.path_nodes.road_path_cache.find_path(source, destination)
+
 
 class SoldierPather(AbstractPather):
 	"""Pather for units, that move absolutely freely (such as soldiers)
@@ -291,4 +325,11 @@ class StaticPather:
 		@param island: island to search path on
 		@param source, destination: Point or anything supported by FindPath
 		@return: list of tuples or None in case no path is found"""
-		return FindPath()(source, destination, island.path_nodes.road_nodes)
+		return island.path_nodes.road_path_cache.find_path(source, destination)
+
+	@classmethod
+	def is_connected_by_road(cls, island, source, destination):
+		"""Returns whether get_path_on_roads would find a path, without searching one.
+		@param island: island to check the roads of
+		@param source, destination: Point, Rect or anything with a position"""
+		return island.path_nodes.is_road_connected(source, destination)
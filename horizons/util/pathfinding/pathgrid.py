@@ -0,0 +1,188 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+from array import array
+from heapq import heappop, heappush
+
+from horizons.util.pathfinding.pathfinding import FindPath
+
+
+"""
+This file contains a grid based variant of the pathfinding algorithm in pathfinding.py.
+It is meant for big, rarely changing sets of path nodes such as the water of the world.
+The path nodes are stored in flat arrays once, and the buffers used by the search are
+reused across calls. The paths it finds are identical to the ones of FindPath.
+"""
+
+class PathGrid:
+	"""Path nodes stored in flat arrays over their bounding box.
+
+	The bounding box is padded by one tile on each side, so the neighbors of each tile inside
+	the box have valid indices. Tiles are stored column by column (index = x * height + y),
+	so comparing indices gives the same order as comparing (x, y) tuples. This keeps the
+	tie-breaking of FindPath intact.
+
+	The nodes must not change after the grid has been created.
+	"""
+
+	def __init__(self, nodes):
+		"""
+		@param nodes: dict { (x, y) = speed_on_coords }, as used by FindPath
+		"""
+		self.nodes = nodes
+		if nodes:
+			xs = [x for x, y in nodes]
+			ys = [y for x, y in nodes]
+			self.min_x, self.max_x = min(xs), max(xs)
+			self.min_y, self.max_y = min(ys), max(ys)
+		else:
+			self.min_x, self.max_x, self.min_y, self.max_y = 0, -1, 0, -1
+		# origin of the padded box
+		self.origin_x = self.min_x - 1
+		self.origin_y = self.min_y - 1
+		self.height = self.max_y - self.min_y + 3
+		size = (self.max_x - self.min_x + 3) * self.height
+
+		self.walkable = bytearray(size)
+		self.speeds = array('d', bytes(8 * size))
+		for (x, y), speed in nodes.items():
+			index = self.get_index(x, y)
+			self.walkable[index] = 1
+			self.speeds[index] = speed
+
+		# search buffers, entries are only valid if their stamp equals the current generation
+		self.dist = array('d', bytes(8 * size))
+		self.previous = array('l', bytes(array('l').itemsize * size))
+		self.discovered = array('L', bytes(array('L').itemsize * size))
+		self.generation = 0
+
+	def contains(self, x, y):
+		"""Returns whether (x, y) is inside the bounding box of the nodes"""
+		return self.min_x <= x <= self.max_x and self.min_y <= y <= self.max_y
+
+	def get_index(self, x, y):
+		return (x - self.origin_x) * self.height + (y - self.origin_y)
+
+	def get_coords(self, index):
+		x, y = divmod(index, self.height)
+		return (x + self.origin_x, y + self.origin_y)
+
+	def next_generation(self):
+		"""Invalidates the search buffers in O(1) and returns the new generation"""
+		self.generation += 1
+		if self.generation >= 2 ** (8 * self.discovered.itemsize) - 1:
+			# stamps would overflow, start over with clean buffers
+			size = len(self.discovered)
+			self.discovered = array('L', bytes(self.discovered.itemsize * size))
+			self.generation = 1
+		return self.generation
+
+
+class GridFindPath(FindPath):
+	"""FindPath on a PathGrid. Returns the same paths as FindPath.
+	Falls back to FindPath if source or destination are not inside the grid."""
+
+	def __call__(self, source, destination, path_grid, blocked_coords=None,
+	             diagonal=False, make_target_walkable=True):
+		"""
+		@param path_grid: PathGrid instance
+		@see: FindPath.__call__
+		"""
+		self.path_grid = path_grid
+		return super(GridFindPath, self).__call__(source, destination, path_grid.nodes,
+		                                          blocked_coords, diagonal, make_target_walkable)
+
+	def execute(self):
+		"""Executes algorithm on the grid, see FindPath.execute"""
+		grid = self.path_grid
+		destination = self.destination
+		destination_to_tuple_distance_func = destination.get_distance_function((0, 0))
+
+		source_coords = self.source.get_coordinates()
+		dest_coords = destination.get_coordinates()
+		if not all(grid.contains(x, y) for (x, y) in source_coords) or \
+		   not all(grid.contains(x, y) for (x, y) in dest_coords):
+			return super(GridFindPath, self).execute()
+
+		path_nodes = self.path_nodes
+		if not self.make_target_walkable:
+			# restrict destination coords to walkable tiles, by default they are counted as walkable
+			dest_coords = [coords for coords in dest_coords if coords in path_nodes]
+		if not dest_coords:
+			return None
+
+		get_index = grid.get_index
+		source_indices = {get_index(x, y) for (x, y) in source_coords}
+		dest_indices = {get_index(x, y) for (x, y) in dest_coords}
+		# source and destination tiles are walkable, even if they are no path nodes
+		extra_indices = source_indices | dest_indices
+		blocked_indices = {get_index(x, y) for (x, y) in self.blocked_coords if grid.contains(x, y)}
+
+		height = grid.height
+		if self.diagonal:
+			offsets = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+		else:
+			offsets = ((-1, 0), (1, 0), (0, -1), (0, 1))
+		offsets = tuple((dx, dy, dx * height + dy) for (dx, dy) in offsets)
+
+		# pull dereferencing out of loop
+		walkable = grid.walkable
+		speeds = grid.speeds
+		dist = grid.dist
+		previous = grid.previous
+		discovered = grid.discovered
+		generation = grid.next_generation()
+
+		# heap entries are (estimated total distance, index), see PathGrid for the order of indices
+		heap = []
+		for (x, y) in source_coords:
+			index = get_index(x, y)
+			discovered[index] = generation
+			dist[index] = 0
+			previous[index] = -1
+			heappush(heap, (destination_to_tuple_distance_func(destination, (x, y)), index))
+
+		while heap:
+			cur_index = heappop(heap)[1]
+			if cur_index in dest_indices:
+				path = []
+				while cur_index != -1:
+					path.append(grid.get_coords(cur_index))
+					cur_index = previous[cur_index]
+				path.reverse()
+				return path
+
+			# the distance of neighbors is fixed when they are discovered, just like in FindPath
+			dist_to_neighbor = dist[cur_index] + speeds[cur_index]
+			x, y = grid.get_coords(cur_index)
+			for dx, dy, offset in offsets:
+				neighbor = cur_index + offset
+				if discovered[neighbor] == generation:
+					continue
+				if not (walkable[neighbor] or neighbor in extra_indices) or neighbor in blocked_indices:
+					continue
+				discovered[neighbor] = generation
+				dist[neighbor] = dist_to_neighbor
+				previous[neighbor] = cur_index
+				total_dist_estimation = destination_to_tuple_distance_func(destination, (x + dx, y + dy)) + dist_to_neighbor
+				heappush(heap, (total_dist_estimation, neighbor))
+
+		return None
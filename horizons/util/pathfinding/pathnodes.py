@@ -21,6 +21,8 @@
 
 import logging
 
+from horizons.util.pathfinding.pathcache import PathCache
+
 
 class PathNodes:
 	"""
@@ -46,9 +48,9 @@ class ConsumerBuildingPathNodes(PathNodes):
 		super(ConsumerBuildingPathNodes, self).__init__()
 		ground_map = consumerbuilding.island.ground_map
 		self.nodes = {}
-		for coords in consumerbuilding.position.get_radius_coordinates(consumerbuilding.radius, include_self=False):
-			if coords in ground_map and 'coastline' not in ground_map[coords].classes:
-				self.nodes[coords] = self.NODE_DEFAULT_SPEED
+		for tile in consumerbuilding.position.get_radius_values(ground_map, consumerbuilding.radius, include_self=False):
+			if 'coastline' not in tile.classes:
+				self.nodes[(tile.x, tile.y)] = self.NODE_DEFAULT_SPEED
 
 
 class IslandPathNodes(PathNodes):
@@ -56,12 +58,17 @@ class IslandPathNodes(PathNodes):
 	Interface:
 	self.nodes: List of nodes on island, where the terrain allows to be walked on
 	self.road_nodes: dictionary of nodes, where a road is built on
+	self.road_path_cache: PathCache of paths on road_nodes
+	self.road_areas: ConnectedAreaCache of road_nodes, see is_road_connected
 
-	(un)register_road has to be called for each coord, where a road is built on (destroyed)
+	(un)register_road has to be called for each coord, where a road is built on (destroyed),
+	this also invalidates the cached road paths
 	reset_tile_walkablity has to be called when the terrain changes the walkability
 	(e.g. building construction, a flood, or whatever)
 	is_walkable rechecks the walkability status of a coordinate
 	"""
+	ROAD_PATH_CACHE_SIZE = 256
+
 	def __init__(self, island):
 		super(IslandPathNodes, self).__init__()
 
@@ -77,14 +84,60 @@ class IslandPathNodes(PathNodes):
 
 		# nodes where a real road is built on.
 		self.road_nodes = {}
+		# connected road networks, this answers whether there is a path at all before searching one
+		# (imported here since horizons.world imports this module)
+		from horizons.world.buildability.connectedareacache import ConnectedAreaCache
+		self.road_areas = ConnectedAreaCache()
+		self.road_path_cache = PathCache(self.road_nodes, self.ROAD_PATH_CACHE_SIZE,
+		                                 is_connected=self.is_road_connected)
 
 	def register_road(self, road):
+		new_coords_list = []
 		for i in road.position:
-			self.road_nodes[(i.x, i.y)] = self.NODE_DEFAULT_SPEED
+			coords = (i.x, i.y)
+			if coords not in self.road_nodes:
+				new_coords_list.append(coords)
+			self.road_nodes[coords] = self.NODE_DEFAULT_SPEED
+		self.road_areas.add_area(new_coords_list)
+		self.road_path_cache.invalidate()
 
 	def unregister_road(self, road):
-		for i in road.position:
-			del self.road_nodes[(i.x, i.y)]
+		coords_list = [(i.x, i.y) for i in road.position]
+		for coords in coords_list:
+			del self.road_nodes[coords]
+		self.road_areas.remove_area(coords_list)
+		self.road_path_cache.invalidate()
+
+	def _get_adjacent_road_areas(self, coords_set):
+		"""Returns the ids of the road areas that contain or share a side with any of coords_set."""
+		area_numbers = self.road_areas.area_numbers
+		areas = set()
+		for (x, y) in coords_set:
+			for coords in ((x, y), (x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+				if coords in area_numbers:
+					areas.add(area_numbers[coords])
+		return areas
+
+	def is_road_connected(self, source, destination):
+		"""Returns whether there is a path on roads from source to destination.
+		This is the case iff road_path_cache finds a path, but only takes a few lookups.
+		Units may walk on the tiles of source and destination, so both are connected if they
+		share a side or if they touch the same road area.
+		@param source, destination: Point, Rect or anything with a position"""
+		if hasattr(source, 'position'):
+			source = source.position
+		if hasattr(destination, 'position'):
+			destination = destination.position
+		source_coords = set(source.tuple_iter())
+		destination_coords = set(destination.tuple_iter())
+		if not source_coords.isdisjoint(destination_coords):
+			return True
+		for (x, y) in destination_coords:
+			if ((x - 1, y) in source_coords or (x + 1, y) in source_coords or
+			    (x, y - 1) in source_coords or (x, y + 1) in source_coords):
+				return True
+		source_areas = self._get_adjacent_road_areas(source_coords)
+		return bool(source_areas) and not source_areas.isdisjoint(self._get_adjacent_road_areas(destination_coords))
 
 	def is_road(self, x, y):
 		"""Return if there is a road on (x, y)"""
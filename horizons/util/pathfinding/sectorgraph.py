@@ -0,0 +1,382 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import logging
+from array import array
+from heapq import heappop, heappush
+
+from horizons.util.pathfinding.pathgrid import GridFindPath
+from horizons.util.shapes import Point
+
+
+"""
+This file contains hierarchical pathfinding (HPA*) for long paths on a PathGrid.
+Like GridFindPath, it should only be used through the Pather interface.
+"""
+
+class SectorGraph:
+	"""Abstract graph of a PathGrid, used by HierarchicalFindPath.
+
+	The area of the grid is split into square sectors. Where walkable tiles of two neighboring
+	sectors touch, entrances are created: pairs of tiles, one on each side of the border.
+
+	For each entrance, the distances to all tiles of its sector (without leaving the sector)
+	are calculated once. They connect the entrances of a sector with each other, and paths
+	inside a sector can be read from them without any search.
+
+	The graph assumes diagonal movement and only knows about the static nodes of the grid.
+	Temporarily blocked tiles (e.g. by ships) are considered by HierarchicalFindPath.
+	"""
+	log = logging.getLogger("world.pathfinding")
+
+	SECTOR_SIZE = 16
+	# runs of connected border tiles longer than this get an entrance at both ends,
+	# shorter ones get a single entrance in the middle
+	MAX_SINGLE_ENTRANCE_LENGTH = 6
+
+	NEIGHBOR_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+	UNREACHABLE = float('inf')
+
+	def __init__(self, path_grid, sector_size=None):
+		"""
+		@param path_grid: PathGrid instance
+		@param sector_size: width and height of a sector in tiles
+		"""
+		self.grid = path_grid
+		self.sector_size = sector_size or self.SECTOR_SIZE
+		self.entrances = {} # sector -> sorted list of tile indices of the entrances in the sector
+		self.transitions = {} # entrance -> list of (entrance in other sector, cost)
+		self._intra_edges = {} # sector -> {entrance: [(entrance, cost), ..]}
+		self._distances = {} # entrance -> array of distances to the tiles of its sector
+		self._create_entrances()
+		for sector in self.entrances:
+			self._prepare_sector(sector)
+
+	def get_sector(self, x, y):
+		return ((x - self.grid.min_x) // self.sector_size,
+		        (y - self.grid.min_y) // self.sector_size)
+
+	def get_sector_bounds(self, sector):
+		"""Returns (left, top, right, bottom) of a sector, all inclusive"""
+		left = self.grid.min_x + sector[0] * self.sector_size
+		top = self.grid.min_y + sector[1] * self.sector_size
+		return (left, top,
+		        min(left + self.sector_size - 1, self.grid.max_x),
+		        min(top + self.sector_size - 1, self.grid.max_y))
+
+	def _get_local_index(self, x, y):
+		"""Index of a tile in the distance arrays of its sector"""
+		return ((x - self.grid.min_x) % self.sector_size) * self.sector_size + \
+		       (y - self.grid.min_y) % self.sector_size
+
+	def _create_entrances(self):
+		grid = self.grid
+		entrances = {}
+		# borders between horizontally neighboring sectors
+		for x in range(grid.min_x + self.sector_size, grid.max_x + 1, self.sector_size):
+			pairs = [((x - 1, y), (x, y)) for y in range(grid.min_y, grid.max_y + 1)]
+			self._add_border_entrances(pairs, entrances)
+		# borders between vertically neighboring sectors
+		for y in range(grid.min_y + self.sector_size, grid.max_y + 1, self.sector_size):
+			pairs = [((x, y - 1), (x, y)) for x in range(grid.min_x, grid.max_x + 1)]
+			self._add_border_entrances(pairs, entrances)
+
+		self.entrances = {sector: sorted(indices) for sector, indices in entrances.items()}
+		self.log.debug("SectorGraph: %s entrances in %s sectors",
+		               sum(len(indices) for indices in self.entrances.values()), len(self.entrances))
+
+	def _add_border_entrances(self, pairs, entrances):
+		"""Splits a border into runs of walkable tile pairs and adds entrances for each run.
+		@param pairs: list of (tile on one side, neighboring tile on the other side)
+		@param entrances: dict sector -> set of entrances to add to
+		"""
+		grid = self.grid
+		run = []
+		for a, b in pairs:
+			if not (grid.walkable[grid.get_index(*a)] and grid.walkable[grid.get_index(*b)]):
+				self._add_run_entrances(run, entrances)
+				run = []
+				continue
+			if run and self.get_sector(*run[-1][0]) != self.get_sector(*a):
+				# border continues with a different pair of sectors
+				self._add_run_entrances(run, entrances)
+				run = []
+			run.append((a, b))
+		self._add_run_entrances(run, entrances)
+
+	def _add_run_entrances(self, run, entrances):
+		if not run:
+			return
+		if len(run) > self.MAX_SINGLE_ENTRANCE_LENGTH:
+			chosen = (run[0], run[-1])
+		else:
+			chosen = (run[len(run) // 2], )
+
+		grid = self.grid
+		for a, b in chosen:
+			index_a = grid.get_index(*a)
+			index_b = grid.get_index(*b)
+			entrances.setdefault(self.get_sector(*a), set()).add(index_a)
+			entrances.setdefault(self.get_sector(*b), set()).add(index_b)
+			self.transitions.setdefault(index_a, []).append((index_b, grid.speeds[index_a]))
+			self.transitions.setdefault(index_b, []).append((index_a, grid.speeds[index_b]))
+
+	def get_edges(self, entrance):
+		"""Returns all edges of an entrance as list of (entrance, cost)"""
+		sector = self.get_sector(*self.grid.get_coords(entrance))
+		return self._intra_edges[sector][entrance] + self.transitions[entrance]
+
+	def get_distance(self, entrance, x, y):
+		"""Returns the distance from an entrance to a tile of the same sector
+		(UNREACHABLE if the tile can't be reached without leaving the sector)"""
+		return self._distances[entrance][self._get_local_index(x, y)]
+
+	def _prepare_sector(self, sector):
+		"""Calculates the distance arrays and intra-sector edges of a sector"""
+		sector_entrances = self.entrances[sector]
+		for entrance in sector_entrances:
+			self._distances[entrance] = self._calc_distances(sector, entrance)
+
+		edges = {}
+		for entrance in sector_entrances:
+			distances = self._distances[entrance]
+			edges[entrance] = []
+			for other in sector_entrances:
+				distance = distances[self._get_local_index(*self.grid.get_coords(other))]
+				if other != entrance and distance != self.UNREACHABLE:
+					edges[entrance].append((other, distance))
+		self._intra_edges[sector] = edges
+
+	def _calc_distances(self, sector, entrance):
+		"""Dijkstra from an entrance to all tiles of its sector.
+		@return: array of distances, indexed by _get_local_index"""
+		grid = self.grid
+		walkable = grid.walkable
+		speeds = grid.speeds
+		size = self.sector_size
+		left, top, right, bottom = self.get_sector_bounds(sector)
+
+		distances = array('d', [self.UNREACHABLE]) * (size * size)
+		x, y = grid.get_coords(entrance)
+		distances[(x - left) * size + (y - top)] = 0.0
+		heap = [(0.0, x, y)]
+		while heap:
+			distance, x, y = heappop(heap)
+			if distance > distances[(x - left) * size + (y - top)]:
+				continue # outdated entry
+			distance += speeds[grid.get_index(x, y)]
+			for dx, dy in self.NEIGHBOR_OFFSETS:
+				neighbor_x = x + dx
+				neighbor_y = y + dy
+				if not (left <= neighbor_x <= right and top <= neighbor_y <= bottom):
+					continue
+				local_index = (neighbor_x - left) * size + (neighbor_y - top)
+				if distance < distances[local_index] and walkable[grid.get_index(neighbor_x, neighbor_y)]:
+					distances[local_index] = distance
+					heappush(heap, (distance, neighbor_x, neighbor_y))
+		return distances
+
+	def descend(self, entrance, x, y):
+		"""Returns the shortest path inside the sector from (x, y) to an entrance of the sector.
+		It is read from the distances of the entrance, following the steepest descent.
+		@return: list of coords as tuples, starting with (x, y), or None if there is no path"""
+		distances = self._distances[entrance]
+		get_local_index = self._get_local_index
+		left, top, right, bottom = self.get_sector_bounds(self.get_sector(x, y))
+		target_x, target_y = self.grid.get_coords(entrance)
+
+		distance = distances[get_local_index(x, y)]
+		if distance == self.UNREACHABLE:
+			return None
+		path = [(x, y)]
+		while distance > 0:
+			best = None
+			for dx, dy in self.NEIGHBOR_OFFSETS:
+				neighbor_x = x + dx
+				neighbor_y = y + dy
+				if not (left <= neighbor_x <= right and top <= neighbor_y <= bottom):
+					continue
+				# prefer the neighbor closest to the target among those with the same distance
+				key = (distances[get_local_index(neighbor_x, neighbor_y)],
+				       (target_x - neighbor_x) ** 2 + (target_y - neighbor_y) ** 2)
+				if best is None or key < best[0]:
+					best = (key, neighbor_x, neighbor_y)
+			(distance, _), x, y = best
+			path.append((x, y))
+		return path
+
+
+class HierarchicalFindPath:
+	"""Finds long paths with the help of a SectorGraph.
+
+	First, a path from entrance to entrance is searched in the abstract graph. Then, it is
+	refined into tiles with the distances stored in the graph. Only the part from the last
+	entrance to the destination, and parts that are blocked, are searched with GridFindPath.
+	The paths are close to, but not always as short as the ones FindPath finds.
+
+	Short distances and everything the abstract graph can't handle (no diagonal movement,
+	sources that are bigger than a tile, no abstract path, ..) are passed on to GridFindPath.
+	"""
+	log = logging.getLogger("world.pathfinding")
+
+	# below this distance (in sectors), GridFindPath is used directly
+	MIN_SECTOR_DISTANCE = 2
+
+	def __call__(self, source, destination, sector_graph, blocked_coords=None,
+	             diagonal=False, make_target_walkable=True):
+		"""
+		@param sector_graph: SectorGraph instance
+		@see: FindPath.__call__
+		"""
+		blocked_coords = blocked_coords or {}
+		if hasattr(source, 'position'):
+			source = source.position
+		if hasattr(destination, 'position'):
+			destination = destination.position
+
+		path = None
+		if diagonal:
+			path = self._find_hierarchical_path(source, destination, sector_graph,
+			                                    blocked_coords, make_target_walkable)
+		if path is None:
+			path = GridFindPath()(source, destination, sector_graph.grid, blocked_coords,
+			                      diagonal, make_target_walkable)
+		return path
+
+	def _find_hierarchical_path(self, source, destination, sector_graph, blocked_coords,
+	                            make_target_walkable):
+		"""@return: path or None if it is not found or should be searched by GridFindPath"""
+		grid = sector_graph.grid
+		source_coords = source.get_coordinates()
+		if len(source_coords) != 1 or not grid.contains(*source_coords[0]):
+			return None
+		source_x, source_y = source_coords[0]
+
+		dest_coords = [coords for coords in destination.get_coordinates()
+		               if coords not in blocked_coords
+		                  and (make_target_walkable or coords in grid.nodes)]
+		if not dest_coords or not all(grid.contains(x, y) for (x, y) in dest_coords):
+			return None
+
+		dest_left = min(x for (x, y) in dest_coords)
+		dest_right = max(x for (x, y) in dest_coords)
+		dest_top = min(y for (x, y) in dest_coords)
+		dest_bottom = max(y for (x, y) in dest_coords)
+		def estimate(index):
+			x, y = grid.get_coords(index)
+			return max(dest_left - x, x - dest_right, dest_top - y, y - dest_bottom, 0)
+
+		source_index = grid.get_index(source_x, source_y)
+		if estimate(source_index) < self.MIN_SECTOR_DISTANCE * sector_graph.sector_size:
+			return None
+
+		source_sector = sector_graph.get_sector(source_x, source_y)
+		dest_coords_by_sector = {}
+		for (x, y) in dest_coords:
+			dest_coords_by_sector.setdefault(sector_graph.get_sector(x, y), []).append((x, y))
+		if source_sector in dest_coords_by_sector:
+			return None
+
+		# blocked tiles are only considered for entrances here, the refinement avoids the others
+		blocked_indices = {grid.get_index(x, y) for (x, y) in blocked_coords if grid.contains(x, y)}
+
+		# distances from entrances to the closest destination tile in their sector
+		goal_distances = {}
+		for sector, coords_list in dest_coords_by_sector.items():
+			for entrance in sector_graph.entrances.get(sector, []):
+				distance = min(sector_graph.get_distance(entrance, x, y) for (x, y) in coords_list)
+				if distance != sector_graph.UNREACHABLE:
+					goal_distances[entrance] = distance
+
+		# A* on the abstract graph, with the source and a virtual goal node added
+		goal = -1
+		dist = {}
+		previous = {}
+		heap = []
+		for entrance in sector_graph.entrances.get(source_sector, []):
+			distance = sector_graph.get_distance(entrance, source_x, source_y)
+			if distance != sector_graph.UNREACHABLE and entrance not in blocked_indices:
+				dist[entrance] = distance
+				previous[entrance] = source_index
+				heappush(heap, (distance + estimate(entrance), entrance))
+
+		checked = set()
+		while heap:
+			node = heappop(heap)[1]
+			if node in checked:
+				continue
+			if node == goal:
+				break
+			checked.add(node)
+
+			edges = sector_graph.get_edges(node)
+			if node in goal_distances:
+				edges = edges + [(goal, goal_distances[node])]
+			for neighbor, cost in edges:
+				if neighbor in checked or neighbor in blocked_indices:
+					continue
+				distance = dist[node] + cost
+				if distance < dist.get(neighbor, sector_graph.UNREACHABLE):
+					dist[neighbor] = distance
+					previous[neighbor] = node
+					estimation = 0 if neighbor == goal else estimate(neighbor)
+					heappush(heap, (distance + estimation, neighbor))
+		else:
+			self.log.debug("HierarchicalFindPath: no abstract path from %s to %s", source, destination)
+			return None
+
+		abstract_path = []
+		node = previous[goal]
+		while node != source_index:
+			abstract_path.append(node)
+			node = previous[node]
+		abstract_path.append(source_index)
+		abstract_path.reverse()
+
+		return self._refine(abstract_path, destination, sector_graph, blocked_coords,
+		                    make_target_walkable)
+
+	def _refine(self, abstract_path, destination, sector_graph, blocked_coords, make_target_walkable):
+		"""Turns a path of entrances into a path of tiles.
+		@return: path or None if a part of the path can't be refined"""
+		grid = sector_graph.grid
+		path = [grid.get_coords(abstract_path[0])]
+		for start, end in zip(abstract_path, abstract_path[1:]):
+			start_coords = grid.get_coords(start)
+			if sector_graph.get_sector(*start_coords) != sector_graph.get_sector(*grid.get_coords(end)):
+				path.append(grid.get_coords(end)) # transition to the neighboring sector
+				continue
+			segment = sector_graph.descend(end, *start_coords)
+			# the first segment starts at the source, e.g. the tile of the moving ship itself
+			if segment is None or any(coords in blocked_coords for coords in segment[1:]):
+				segment = GridFindPath()(Point(*start_coords), Point(*grid.get_coords(end)), grid,
+				                         blocked_coords, True, False)
+				if segment is None:
+					return None
+			path.extend(segment[1:])
+
+		segment = GridFindPath()(Point(*path[-1]), destination, grid, blocked_coords,
+		                         True, make_target_walkable)
+		if segment is None:
+			return None
+		path.extend(segment[1:])
+		return path
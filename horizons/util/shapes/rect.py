@@ -109,12 +109,45 @@ class Rect(Shape):
 	def copy(self):
 		return Rect.init_from_borders(self.left, self.top, self.right, self.bottom)
 
+	# {(width, height, radius, include_self): ((dx, dy), ...), ...}
+	_radius_offsets = {}
+
+	@classmethod
+	def get_radius_offsets(cls, width, height, radius, include_self=False):
+		"""Returns the coordinates in the radius of a rect with the given size and the origin (0, 0).
+		The result is a tuple of (dx, dy) tuples. It is only computed once for every combination
+		of the parameters, since the same ones are requested all the time.
+		@param include_self: whether to include the coords of the rect"""
+		key = (width, height, radius, include_self)
+		try:
+			return cls._radius_offsets[key]
+		except KeyError:
+			rect = Rect.init_from_topleft_and_size(0, 0, width, height)
+			offsets = tuple(rect._iter_radius_coordinates(radius, include_self))
+			cls._radius_offsets[key] = offsets
+			return offsets
+
 	def get_radius_coordinates(self, radius, include_self=False):
 		"""Returns list of all coordinates (as tuples), that are in the radius
-		This is a generator.
 		@param include_self: whether to include coords in self"""
 		# NOTE: this function has to be very fast, since it's blocking on building select
-		#       therefore, the distance_to_tuple function is inlined manually.
+		left = self.left
+		top = self.top
+		return [(left + dx, top + dy) for (dx, dy) in
+		        self.get_radius_offsets(self.right - left + 1, self.bottom - top + 1, radius, include_self)]
+
+	def get_radius_values(self, mapping, radius, include_self=False):
+		"""Returns the values of mapping for all coordinates in the radius that are keys of it.
+		This is how the tiles in the radius are looked up in a ground map in one call.
+		@param mapping: {(x, y): value, ...} where no value is None
+		@param include_self: whether to include coords in self"""
+		return [value for value in map(mapping.get, self.get_radius_coordinates(radius, include_self))
+		        if value is not None]
+
+	def _iter_radius_coordinates(self, radius, include_self):
+		"""Generates the coordinates in the radius, use get_radius_coordinates instead.
+		@param include_self: whether to include coords in self"""
+		# NOTE: the distance_to_tuple function is inlined manually.
 		"""
 		ALGORITHM:
 		Idea:
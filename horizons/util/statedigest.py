@@ -0,0 +1,72 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import hashlib
+
+
+class StateDigest:
+	"""Order independent 64 bit digest over a set of keyed entries.
+
+	Every entry (key, value) contributes a hash of its repr, the digest is the sum of
+	all contributions modulo 2**64. Changing a single entry therefore only requires
+	subtracting its old contribution and adding the new one, the rest of the state
+	doesn't have to be looked at.
+
+	Keys and values must have a stable repr on all clients (ints, strings, tuples of those).
+	A value of None means that the entry doesn't exist and contributes nothing.
+	"""
+
+	MASK = (1 << 64) - 1
+
+	def __init__(self):
+		self.value = 0
+
+	@classmethod
+	def hash_entry(cls, key, value):
+		"""Returns the contribution of the entry (key, value) to the digest."""
+		if value is None:
+			return 0
+		data = repr((key, value)).encode()
+		# the first 8 bytes of sha1, hashlib.blake2b would need python 3.6
+		return int.from_bytes(hashlib.sha1(data).digest()[:8], 'little')
+
+	def update(self, key, old_value, new_value):
+		"""Replaces the entry (key, old_value) by (key, new_value)."""
+		if old_value == new_value:
+			return
+		self.value = (self.value - self.hash_entry(key, old_value) +
+		              self.hash_entry(key, new_value)) & self.MASK
+
+	def add(self, key, value):
+		self.update(key, None, value)
+
+	def remove(self, key, value):
+		self.update(key, value, None)
+
+	def get_value(self, extra_entries=()):
+		"""Returns the digest, including entries that aren't tracked incrementally.
+		@param extra_entries: iterable of (key, value) that are only added to the returned value
+		@return: int in [0, 2**64)
+		"""
+		value = self.value
+		for key, entry_value in extra_entries:
+			value += self.hash_entry(key, entry_value)
+		return value & self.MASK
@@ -212,6 +212,10 @@ class UhDbAccessor(DbReader):
 		sql = "SELECT value FROM balance_values WHERE name='happiness_inhabitants_decrease_limit'"
 		return self.cached_query(sql)[0][0]
 
+	def get_balance_value(self, name):
+		sql = "SELECT value FROM balance_values WHERE name = ?"
+		return self.cached_query(sql, name)[0][0]
+
 	# Misc
 
 	def get_player_start_res(self):
@@ -0,0 +1,98 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+from horizons.util.gridbuckets import GridBuckets
+
+
+class UnitIndexer:
+	"""
+	Indexes units by their position in a uniform grid of square cells to improve
+	nearby unit lookup performance.
+
+	Used to answer queries of the form 'which units are at most r tiles away from (x, y)'
+	by only looking at the cells that overlap with the query circle. The owner has to
+	call update() whenever the position of an indexed unit changes.
+	"""
+
+	CELL_SIZE = 16
+
+	def __init__(self, cell_size=None):
+		"""
+		@param cell_size: int, width and height of a cell in tiles
+		"""
+		self._grid = GridBuckets(cell_size or self.CELL_SIZE)
+		# {unit: [cells, x, y, serial]}. The serial number is used to return units in the
+		# order they were added, like iterating over the list of all units would.
+		self._units = {}
+		self._next_serial = 0
+
+	def __len__(self):
+		return len(self._units)
+
+	def __contains__(self, unit):
+		return unit in self._units
+
+	def add(self, unit):
+		x = unit.position.x
+		y = unit.position.y
+		cells = self._grid.get_cells(x, y, x, y)
+		self._grid.add(unit, cells)
+		self._units[unit] = [cells, x, y, self._next_serial]
+		self._next_serial += 1
+
+	def remove(self, unit):
+		self._grid.remove(unit, self._units.pop(unit)[0])
+
+	def update(self, unit):
+		"""Has to be called after the position of unit has changed."""
+		entry = self._units[unit]
+		x = unit.position.x
+		y = unit.position.y
+		entry[1] = x
+		entry[2] = y
+		cells = self._grid.get_cells(x, y, x, y)
+		if cells != entry[0]:
+			self._grid.remove(unit, entry[0])
+			self._grid.add(unit, cells)
+			entry[0] = cells
+
+	def get_units_in_range(self, position, radius):
+		"""
+		Returns the units whose position is inside of Circle(position, radius),
+		in the order they were added to the indexer.
+		@param position: Point, center of the circle
+		@param radius: int
+		@return: list of units
+		"""
+		center_x = position.x
+		center_y = position.y
+		radius_sq = radius * radius
+
+		found = []
+		for units in self._grid.get_buckets(center_x, center_y, center_x, center_y, radius):
+			for unit in units:
+				entry = self._units[unit]
+				dx = entry[1] - center_x
+				dy = entry[2] - center_y
+				if dx * dx + dy * dy <= radius_sq:
+					found.append((entry[3], unit))
+		found.sort(key=lambda element: element[0])
+		return [unit for serial, unit in found]
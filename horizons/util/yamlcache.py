@@ -19,6 +19,7 @@
 # 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 # ###################################################
 
+import hashlib
 import logging
 import os
 import threading
@@ -83,6 +84,10 @@ class YamlCache:
 	Threadsafe.
 
 	Use get_file for files to cache (default case) or load_yaml_data for special use cases (behaves like yaml.load).
+
+	Cache entries are validated by the modification time and size of the file. If those
+	changed, the file is read and its content digest is compared, so that touching or
+	copying files doesn't require parsing them again.
 	"""
 
 	cache = None # type: Optional[YamlCacheStorage]
@@ -94,6 +99,11 @@ class YamlCache:
 
 	log = logging.getLogger("yamlcache")
 
+	# statistics: cache hits by mtime and size, hits by content digest, and files that had to be parsed
+	stat_hits = 0
+	stat_digest_hits = 0
+	stat_misses = 0
+
 	@classmethod
 	def load_yaml_data(cls, string_or_stream):
 		"""Use this instead of yaml.load everywhere in uh in case get_file isn't useable"""
@@ -105,19 +115,29 @@ class YamlCache:
 		@param filename: path to the file
 		@param game_data: Whether this file contains data like BUILDINGS.LUMBERJACK to resolve
 		"""
-		with open(filename, 'r', encoding="utf-8") as f:
-			filedata = f.read()
-
-		# calc the hash
-		h = hash(filedata)
+		stat = os.stat(filename)
 
 		# check for updates or new files
 		if cls.cache is None:
 			cls._open_cache()
 
-		yaml_file_in_cache = (filename in cls.cache and cls.cache[filename][0] == h)
-		if not yaml_file_in_cache:
-			data = cls.load_yaml_data(filedata)
+		meta = cls.cache.get_meta(filename)
+		if meta is not None and meta[0] == game_data and meta[1:3] == (stat.st_mtime_ns, stat.st_size):
+			cls.stat_hits += 1
+			return cls.cache[filename]
+
+		with open(filename, 'rb') as f:
+			filedata = f.read()
+		# python's hash() of strings differs between processes, so use a real digest
+		digest = hashlib.sha1(filedata).hexdigest()
+		new_meta = (game_data, stat.st_mtime_ns, stat.st_size, digest)
+
+		if meta is not None and meta[0] == game_data and meta[3] == digest:
+			cls.stat_digest_hits += 1
+			data = cls.cache[filename]
+		else:
+			cls.stat_misses += 1
+			data = cls.load_yaml_data(filedata.decode('utf-8'))
 			if game_data: # need to convert some values
 				try:
 					data = convert_game_data(data)
@@ -125,29 +145,32 @@ class YamlCache:
 					# add info about file
 					to_add = "\nThis error happened in {0!s} .".format(filename)
 					e.args = ( e.args[0] + to_add, ) + e.args[1:]
-					e.message = ( e.message + to_add )
 					raise
 
-			cls.lock.acquire()
-			cls.cache[filename] = (h, data)
+		with cls.lock:
+			cls.cache.set(filename, data, new_meta)
 			if not cls.sync_scheduled:
 				cls.sync_scheduled = True
 				from horizons.extscheduler import ExtScheduler
 				ExtScheduler().add_new_object(cls._do_sync, cls, run_in=1)
-			cls.lock.release()
 
-		return cls.cache[filename][1] # returns an object from the YAML
+		return data # returns an object from the YAML
+
+	@classmethod
+	def get_statistics(cls):
+		"""Returns the cache statistics of this process.
+		@return: tuple (hits, hits by content digest, misses)"""
+		return (cls.stat_hits, cls.stat_digest_hits, cls.stat_misses)
 
 	@classmethod
 	def _open_cache(cls):
-		cls.lock.acquire()
-		cls.cache = YamlCacheStorage.open(cls.cache_filename)
-		cls.lock.release()
+		with cls.lock:
+			cls.cache = YamlCacheStorage.open(cls.cache_filename)
 
 	@classmethod
 	def _do_sync(cls):
 		"""Only write to disc once in a while, it's too slow when done every time"""
-		cls.lock.acquire()
-		cls.sync_scheduled = False
-		cls.cache.sync()
-		cls.lock.release()
+		with cls.lock:
+			cls.sync_scheduled = False
+			cls.cache.sync()
+		cls.log.info("yaml cache: %d hits, %d hits by content, %d misses", *cls.get_statistics())
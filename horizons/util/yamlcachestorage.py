@@ -31,17 +31,22 @@ class YamlCacheStorage:
 	An instance of this class provides a implements a cache that always has all the data
 	in memory. It tries to also load the data from disk and write it back on disk but
 	if it fails then it just ignores the errors and keeps working.
+
+	Every entry consists of a small, picklable meta value that users can check cheaply
+	(e.g. to validate the entry) and the actual data. On disk, the data of each entry is
+	pickled separately, so loading the cache only unpickles the data of entries that are
+	actually accessed.
 	"""
 
 	log = logging.getLogger("yamlcachestorage")
 
 	# Increment this when the users of this class change the way they use it.
-	version = 1
+	version = 2
 
 	def __init__(self, filename):
 		super(YamlCacheStorage, self).__init__()
 		self._filename = filename
-		self._data = {}
+		self._clear()
 
 	@classmethod
 	def _validate(cls, data):
@@ -62,6 +67,7 @@ class YamlCacheStorage:
 				data = pickle.load(f)
 			if not self._validate(data):
 				raise RuntimeError('Bad YamlCacheStorage data format')
+			self._clear()
 			self._data = data[1]
 			self.log.debug('%s._reload(): successfully loaded cache from disk', self)
 		else:
@@ -70,7 +76,10 @@ class YamlCacheStorage:
 	def _clear(self):
 		"""Clear the cache in memory."""
 		self.log.debug('%s._clear(): creating a new cache', self)
+		# {key: (meta, pickled data)}, the pickled data is None until the next sync for new entries
 		self._data = {}
+		# {key: data} of entries that have been unpickled or set since loading
+		self._loaded = {}
 
 	@classmethod
 	def open(cls, filename):
@@ -90,8 +99,12 @@ class YamlCacheStorage:
 	def sync(self):
 		"""Write the file to disk if possible. Do nothing otherwise."""
 		try:
+			for key, (meta, pickled) in self._data.items():
+				if pickled is None:
+					pickled = pickle.dumps(self._loaded[key], pickle.HIGHEST_PROTOCOL)
+					self._data[key] = (meta, pickled)
 			with open(self._filename, 'wb') as f:
-				pickle.dump((self.version, self._data), f)
+				pickle.dump((self.version, self._data), f, pickle.HIGHEST_PROTOCOL)
 				self.log.debug('%s.sync(): success', self)
 		except Exception as e:
 			# Ignore all exceptions because saving the cache on disk is not critical.
@@ -104,16 +117,33 @@ class YamlCacheStorage:
 		self.sync()
 		self._filename = None
 		self._data = None
+		self._loaded = None
+
+	def get_meta(self, key):
+		"""Returns the meta value of the entry key without loading its data.
+		@return: meta value or None if there is no such entry"""
+		entry = self._data.get(key)
+		return entry[0] if entry is not None else None
+
+	def set(self, key, value, meta=None):
+		"""Stores value and its meta value as entry key."""
+		self.log.debug("%s.set('%s', data excluded)", self, key)
+		self._data[key] = (meta, None)
+		self._loaded[key] = value
 
 	def __getitem__(self, key):
 		"""This function enables the following syntax: cache[key]"""
 		self.log.debug("%s.__getitem__('%s')", self, key)
-		return self._data[key]
+		try:
+			return self._loaded[key]
+		except KeyError:
+			value = pickle.loads(self._data[key][1])
+			self._loaded[key] = value
+			return value
 
 	def __setitem__(self, key, value):
 		"""This function enables the following syntax: cache[key] = value"""
-		self.log.debug("%s.__setitem__('%s', data excluded)", self, key)
-		self._data[key] = value
+		self.set(key, value)
 
 	def __contains__(self, item):
 		"""This function enables the following syntax: item in cache"""
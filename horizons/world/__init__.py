@@ -40,8 +40,12 @@ from horizons.messaging import LoadingProgress
 from horizons.scheduler import Scheduler
 from horizons.util.buildingindexer import BuildingIndexer
 from horizons.util.color import Color
+from horizons.util.pathfinding.pathgrid import PathGrid
+from horizons.util.pathfinding.sectorgraph import SectorGraph
 from horizons.util.savegameaccessor import SavegameAccessor
 from horizons.util.shapes import Circle, Point, Rect
+from horizons.util.statedigest import StateDigest
+from horizons.util.unitindexer import UnitIndexer
 from horizons.util.worldobject import WorldObject
 from horizons.world import worldutils
 from horizons.world.buildingowner import BuildingOwner
@@ -49,7 +53,9 @@ from horizons.world.diplomacy import Diplomacy
 from horizons.world.disaster.disastermanager import DisasterManager
 from horizons.world.island import Island
 from horizons.world.player import HumanPlayer
+from horizons.world.threatmap import ThreatMap
 from horizons.world.units.weapon import Weapon
+from horizons.world.warehouseregistry import WarehouseRegistry
 
 
 class World(BuildingOwner, WorldObject):
@@ -94,8 +100,19 @@ class World(BuildingOwner, WorldObject):
 		# and having at least one reference to them
 		self.ships = []
 		self.ground_units = []
+		# spatial indices of the units above, for fast range queries
+		self.ship_indexer = UnitIndexer()
+		self.ground_unit_indexer = UnitIndexer()
+		# the same units indexed by owner, to find hostile units
+		self.ship_threat_map = ThreatMap()
+		self.ground_unit_threat_map = ThreatMap()
+
+		# incrementally updated digest of the values checked for multiplayer desyncs
+		self.state_digest = StateDigest()
 
 		self.islands = []
+		# all warehouses, indexed by owner and position
+		self.warehouse_registry = WarehouseRegistry()
 
 		super(World, self).__init__(worldid=GAME.WORLD_WORLDID)
 
@@ -124,10 +141,18 @@ class World(BuildingOwner, WorldObject):
 		self.full_map = None
 		self.island_map = None
 		self.water = None
+		self.water_grid = None
+		self.water_sectors = None
+		self.water_and_coastline_grid = None
 		self.ships = None
 		self.ship_map = None
+		self.ship_indexer = None
+		self.state_digest = None
 		self.fish_indexer = None
 		self.ground_units = None
+		self.ground_unit_indexer = None
+		self.ship_threat_map = None
+		self.ground_unit_threat_map = None
 
 		if self.pirate is not None:
 			self.pirate.end()
@@ -138,6 +163,7 @@ class World(BuildingOwner, WorldObject):
 			self.trader = None
 
 		self.islands = None
+		self.warehouse_registry = None
 		self.diplomacy = None
 
 	def _init(self, savegame_db, force_player_id=None, disasters_enabled=True):
@@ -174,6 +200,9 @@ class World(BuildingOwner, WorldObject):
 		self.water = {tile: 1.0 for tile in self.ground_map}
 		self._init_water_bodies()
 		self.sea_number = self.water_body[(self.min_x, self.min_y)]
+		# grid and sector graph for faster ship pathfinding, the water never changes during the game
+		self.water_grid = PathGrid(self.water)
+		self.water_sectors = SectorGraph(self.water_grid)
 		for island in self.islands:
 			island.terrain_cache.create_sea_cache()
 
@@ -189,6 +218,9 @@ class World(BuildingOwner, WorldObject):
 		self._init_shallow_water_bodies()
 		self.shallow_sea_number = self.shallow_water_body[(self.min_x, self.min_y)]
 
+		# grid for faster pathfinding of ships that can drive through shallow water
+		self.water_and_coastline_grid = PathGrid(self.water_and_coastline)
+
 		# create ship position list. entries: ship_map[(x, y)] = ship
 		self.ship_map = {}
 		self.ground_unit_map = {}
@@ -561,6 +593,8 @@ class World(BuildingOwner, WorldObject):
 		@return set of islands in radius"""
 		islands = set()
 		for island in self.islands:
+			if island.position.distance(point) > max(radius, 1):
+				continue # no tile of the island can be in range
 			for tile in island.get_surrounding_tiles(point, radius=radius,
 			                                         include_corners=False):
 				islands.add(island)
@@ -574,24 +608,15 @@ class World(BuildingOwner, WorldObject):
 		@param radius: int radius to use.
 		@param owner: Player instance, list only warehouses belonging to this player.
 		@param include_tradeable also list the warehouses the owner can trade with
-		@return: List of warehouses.
+		@return: List of warehouses, ordered by worldid.
 		"""
-		warehouses = []
-		islands = []
-		if radius is not None and position is not None:
-			islands = self.get_islands_in_radius(position, radius)
-		else:
-			islands = self.islands
-
-		for island in islands:
-			for settlement in island.settlements:
-				warehouse = settlement.warehouse
-				if (radius is None or position is None or
-				    warehouse.position.distance(position) <= radius) and \
-				   (owner is None or warehouse.owner == owner or
-				    (include_tradeable and self.diplomacy.can_trade(warehouse.owner, owner))):
-					warehouses.append(warehouse)
-		return warehouses
+		owners = None
+		if owner is not None:
+			owners = [owner]
+			if include_tradeable:
+				owners.extend(other for other in self.warehouse_registry.get_owners()
+				              if other != owner and self.diplomacy.can_trade(other, owner))
+		return self.warehouse_registry.get_warehouses(position, radius, owners)
 
 	def get_ships(self, position=None, radius=None):
 		"""Returns all ships on the map, optionally only those in range
@@ -601,16 +626,14 @@ class World(BuildingOwner, WorldObject):
 		@return: List of ships.
 		"""
 		if position is not None and radius is not None:
-			circle = Circle(position, radius)
-			return [ship for ship in self.ships if circle.contains(ship.position)]
+			return self.ship_indexer.get_units_in_range(position, radius)
 		else:
 			return self.ships
 
 	def get_ground_units(self, position=None, radius=None):
 		"""@see get_ships"""
 		if position is not None and radius is not None:
-			circle = Circle(position, radius)
-			return [unit for unit in self.ground_units if circle.contains(unit.position)]
+			return self.ground_unit_indexer.get_units_in_range(position, radius)
 		else:
 			return self.ground_units
 
@@ -645,6 +668,23 @@ class World(BuildingOwner, WorldObject):
 				instances.append(instance)
 		return instances
 
+	def get_enemy_health_instances(self, owner, position, radius):
+		"""Returns the instances with health in range that belong to enemies of owner.
+		The result is the same as filtering get_health_instances(position, radius).
+		@param owner: Player instance
+		@param position: Point instance.
+		@param radius: int radius to use.
+		@return: List of instances.
+		"""
+		instances = []
+		for threat_map in (self.ship_threat_map, self.ground_unit_threat_map):
+			enemies = [other for other in threat_map.get_owners()
+			           if self.diplomacy.are_enemies(other, owner)]
+			for instance in threat_map.get_units_in_range(position, radius, enemies):
+				if instance.has_component(HealthComponent):
+					instances.append(instance)
+		return instances
+
 	def save(self, db):
 		"""Saves the current game to the specified db.
 		@param db: DbReader object of the db the game is saved to."""
@@ -673,12 +713,29 @@ class World(BuildingOwner, WorldObject):
 		self.disaster_manager.save(db)
 
 	def get_checkup_hash(self):
-		"""Returns a collection of important game state values. Used to check if two mp games have diverged.
-		Not designed to be reliable."""
+		"""Returns a 64 bit digest of important game state values. Used to check if two mp games have diverged.
+		Inventories of settlements and ships are tracked incrementally in state_digest, only the
+		values that are derived from all buildings of a settlement are computed here.
+		Not designed to be reliable.
+		@return: int
+		"""
+		extra_entries = [('rngvalue', self.session.random.random())]
+		for island in self.islands:
+			for settlement in island.settlements:
+				extra_entries.append((('settlement_stats', settlement.worldid),
+				                      (settlement.inhabitants, settlement.cumulative_running_costs,
+				                       settlement.cumulative_taxes)))
+		return self.state_digest.get_value(extra_entries)
+
+	def get_checkup_hash_details(self):
+		"""Returns a collection of important game state values. Used to find out what
+		differs after get_checkup_hash() has detected that two mp games have diverged."""
 		# NOTE: don't include float values, they are represented differently in python 2.6 and 2.7
 		# and will differ at some insignificant place. Also make sure to handle them correctly in the game logic.
 		data = {
-			'rngvalue': self.session.random.random(),
+			# must not advance the rng, this is only called after a desync has been detected
+			'rngstate': str(hash(self.session.random.getstate())),
+			'state_digest': str(self.state_digest.value),
 			'settlements': [],
 			'ships': [],
 		}
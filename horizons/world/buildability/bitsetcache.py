@@ -0,0 +1,163 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+from horizons.world.buildability.terraincache import TerrainBuildabilityCache
+
+
+class BitsetBuildabilityLayer:
+	"""
+	Read-only set-like view of a single layer of a BitsetBuildabilityCache.
+
+	The layer is stored as a dict {y: row, ...} where bit (x - x_offset) of the integer row
+	is set if and only if (x, y) is part of the layer. Rows without any set bits are left out.
+	"""
+
+	__slots__ = ('_rows', '_x_offset')
+
+	def __init__(self, rows, x_offset):
+		self._rows = rows
+		self._x_offset = x_offset
+
+	def __contains__(self, coords):
+		x, y = coords
+		row = self._rows.get(y)
+		if row is None or x < self._x_offset:
+			return False
+		return (row >> (x - self._x_offset)) & 1 == 1
+
+	def __iter__(self):
+		x_offset = self._x_offset
+		for y in sorted(self._rows):
+			row = self._rows[y]
+			while row:
+				lowest_bit = row & -row
+				yield (x_offset + lowest_bit.bit_length() - 1, y)
+				row ^= lowest_bit
+
+	def __len__(self):
+		return sum(bin(row).count('1') for row in self._rows.values())
+
+	def __bool__(self):
+		return bool(self._rows)
+
+	def intersection(self, *others):
+		"""Return a set of the coordinates that are in this layer and in all the given iterables."""
+		if not others:
+			return set(self)
+		result = {coords for coords in others[0] if coords in self}
+		if len(others) > 1:
+			result.intersection_update(*others[1:])
+		return result
+
+class BitsetBuildabilityCache:
+	"""
+	A BinaryBuildabilityCache that stores every layer as rows of bits.
+
+	It answers the same queries as BinaryBuildabilityCache: (x, y) in instance.cache[(width, height)]
+	if and only if a rectangle of size (width, height) with the origin (x, y) is entirely within
+	the area, and the layers can be iterated and intersected like sets.
+
+	Instead of sets of coordinate tuples every row of the island is kept as one integer.
+	Horizontal runs of a width are found by shifting a row and combining it with itself,
+	rectangles by combining the runs of consecutive rows. Adding or removing coordinates
+	only recomputes the rows that can be affected by the change. That way the cache is a lot
+	smaller and cheaper to update on large islands than the tuple based one.
+	"""
+
+	def __init__(self, terrain_cache):
+		self.terrain_cache = terrain_cache
+		self._x_offset = min((x for (x, _) in terrain_cache.land_or_coast), default=0)
+
+		sizes = set()
+		for (width, height) in TerrainBuildabilityCache.sizes:
+			sizes.add((width, height))
+			sizes.add((height, width))
+		self._sizes = sorted(sizes)
+		self._max_width = max(width for (width, _) in self._sizes)
+
+		# {width: {y: row, ...}, ...} where a bit is set if width tiles starting there are in the area
+		self._runs = {width: {} for width in range(1, self._max_width + 1)}
+		self._layers = {} # {(width, height): {y: row, ...}, ...}
+		self.cache = {} # {(width, height): BitsetBuildabilityLayer, ...}
+		for size in self._sizes:
+			self._layers[size] = self._runs[1] if size == (1, 1) else {}
+			self.cache[size] = BitsetBuildabilityLayer(self._layers[size], self._x_offset)
+		self.coords_set = self.cache[(1, 1)]
+
+	def _update_rows(self, changed_rows):
+		"""Recompute the runs and layers that depend on the given rows of the area."""
+		runs = self._runs
+		area = runs[1]
+		for y in changed_rows:
+			base = area.get(y, 0)
+			row = base
+			for width in range(2, self._max_width + 1):
+				row &= base >> (width - 1)
+				if row:
+					runs[width][y] = row
+				else:
+					runs[width].pop(y, None)
+
+		for (width, height) in self._sizes:
+			if (width, height) == (1, 1):
+				continue
+			width_runs = runs[width]
+			layer = self._layers[(width, height)]
+			for y in {y - dy for y in changed_rows for dy in range(height)}:
+				row = width_runs.get(y, 0)
+				for dy in range(1, height):
+					if not row:
+						break
+					row &= width_runs.get(y + dy, 0)
+				if row:
+					layer[y] = row
+				else:
+					layer.pop(y, None)
+
+	def add_area(self, new_coords_list):
+		"""Add a list of new coordinates to the area."""
+		area = self._runs[1]
+		x_offset = self._x_offset
+		changed_rows = set()
+		for coords in new_coords_list:
+			assert coords not in self.coords_set
+			assert coords in self.terrain_cache.land_or_coast
+			x, y = coords
+			area[y] = area.get(y, 0) | (1 << (x - x_offset))
+			changed_rows.add(y)
+		self._update_rows(changed_rows)
+
+	def remove_area(self, removed_coords_list):
+		"""Remove a list of existing coordinates from the area."""
+		area = self._runs[1]
+		x_offset = self._x_offset
+		changed_rows = set()
+		for coords in removed_coords_list:
+			assert coords in self.coords_set
+			assert coords in self.terrain_cache.land_or_coast
+			x, y = coords
+			row = area[y] & ~(1 << (x - x_offset))
+			if row:
+				area[y] = row
+			else:
+				del area[y]
+			changed_rows.add(y)
+		self._update_rows(changed_rows)
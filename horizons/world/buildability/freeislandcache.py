@@ -19,7 +19,7 @@
 # 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 # ###################################################
 
-from horizons.world.buildability.binarycache import BinaryBuildabilityCache
+from horizons.world.buildability.bitsetcache import BitsetBuildabilityCache
 
 
 class FreeIslandBuildabilityCache:
@@ -37,8 +37,8 @@ class FreeIslandBuildabilityCache:
 	"""
 
 	def __init__(self, island):
-		self._binary_cache = BinaryBuildabilityCache(island.terrain_cache)
-		self.cache = self._binary_cache.cache # {(width, height): set((x, y), ...), ...}
+		self._binary_cache = BitsetBuildabilityCache(island.terrain_cache)
+		self.cache = self._binary_cache.cache # {(width, height): BitsetBuildabilityLayer, ...}
 		self.island = island
 		self._init()
 
@@ -19,11 +19,11 @@
 # 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 # ###################################################
 
-from horizons.world.buildability.binarycache import BinaryBuildabilityCache
+from horizons.world.buildability.bitsetcache import BitsetBuildabilityCache
 
 
-class SettlementBuildabilityCache(BinaryBuildabilityCache):
-	"""A specialized BinaryBuildabilityCache for settlements."""
+class SettlementBuildabilityCache(BitsetBuildabilityCache):
+	"""A specialized BitsetBuildabilityCache for settlements."""
 
 	def __init__(self, terrain_cache, settlement_ground_map):
 		super(SettlementBuildabilityCache, self).__init__(terrain_cache)
@@ -44,7 +44,7 @@ class SettlementBuildabilityCache(BinaryBuildabilityCache):
 		Refresh the usability of the coordinates in the given list.
 
 		This function is called with a list of coordinates on which the possibility of
-		building a building may have changed to update the underlying BinaryBuildabilityCache.
+		building a building may have changed to update the underlying cache.
 		"""
 
 		land_or_coast = self.terrain_cache.land_or_coast
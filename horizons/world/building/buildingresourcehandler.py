@@ -19,6 +19,7 @@
 # 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 # ###################################################
 
+from horizons.component.storagecomponent import StorageComponent
 from horizons.messaging import ResourceProduced
 from horizons.world.production.producer import Producer
 from horizons.world.resourcehandler import ResourceHandler
@@ -55,6 +56,11 @@ class BuildingResourceHandler(ResourceHandler):
 			self.get_component(Producer).remove_production_finished_listener(self.on_production_finished)
 
 	def on_production_finished(self, caller, resources):
+		# wake up collectors that wait for these resources, also if there already were some
+		inventory = self.get_component(StorageComponent).inventory
+		for res, amount in resources.items():
+			if amount > 0:
+				inventory.notify_res_available(res)
 		if self.is_valid_tradable_resource(resources):
 			ResourceProduced.broadcast(self, caller, resources)
 
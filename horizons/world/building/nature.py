@@ -1,4 +1,5 @@
 from horizons.constants import BUILDINGS, LAYERS
+from horizons.entities import Entities
 from horizons.scheduler import Scheduler
 from horizons.world.building.buildable import BuildableRect, BuildableSingleEverywhere
 from horizons.world.building.building import BasicBuilding
@@ -56,8 +57,10 @@ class Field(NatureBuildingResourceHandler):
 
 	def _check_covered_by_farm(self):
 		"""Warn in case there is no farm nearby to cultivate the field"""
-		farm_in_range = any( (farm.position.distance( self.position ) <= farm.radius) for farm in
-		                     self.settlement.buildings_by_id[BUILDINGS.FARM] )
+		farms = self.island.buildings_by_type.get_buildings_in_range(
+			BUILDINGS.FARM, self.position, Entities.buildings[BUILDINGS.FARM].radius)
+		farm_in_range = any(farm.settlement is self.settlement and
+		                    farm.position.distance(self.position) <= farm.radius for farm in farms)
 		if not farm_in_range and self.owner.is_local_player:
 			pos = self.position.origin
 			self.session.ingame_gui.message_widget.add(point=pos, string_id="FIELD_NEEDS_FARM",
@@ -26,7 +26,7 @@ from horizons.command.building import Build
 from horizons.command.production import ToggleActive
 from horizons.component.collectingcomponent import CollectingComponent
 from horizons.component.storagecomponent import StorageComponent
-from horizons.constants import BUILDINGS, GAME, RES, TIER
+from horizons.constants import BUILDINGS, RES, TIER
 from horizons.gui.tabs import SettlerOverviewTab
 from horizons.messaging import (
 	AddStatusIcon, RemoveStatusIcon, SettlerInhabitantsChanged, SettlerUpdate,
@@ -91,7 +91,7 @@ class Settler(BuildableRect, BuildingResourceHandler, BasicBuilding):
 		super(Settler, self).save(db)
 		db("INSERT INTO settler(rowid, inhabitants, last_tax_payed) VALUES (?, ?, ?)",
 		   self.worldid, self.inhabitants, self.last_tax_payed)
-		remaining_ticks = Scheduler().get_remaining_ticks(self, self._tick)
+		remaining_ticks = self._residence_manager.get_remaining_ticks(self)
 		db("INSERT INTO remaining_ticks_of_month(rowid, ticks) VALUES (?, ?)",
 		   self.worldid, remaining_ticks)
 
@@ -148,6 +148,7 @@ class Settler(BuildableRect, BuildingResourceHandler, BasicBuilding):
 
 	def remove(self):
 		SettlerInhabitantsChanged.broadcast(self, -self.inhabitants)
+		self._residence_manager.remove(self)
 
 		UpgradePermissionsChanged.unsubscribe(self._on_change_upgrade_permissions, sender=self.settlement)
 		super(Settler, self).remove()
@@ -215,19 +216,21 @@ class Settler(BuildableRect, BuildingResourceHandler, BasicBuilding):
 			self.update_action_set_level(self.level)
 
 	def run(self, remaining_ticks=None):
-		"""Start regular tick calls"""
-		interval = self.session.timer.get_ticks(GAME.INGAME_TICK_INTERVAL)
-		run_in = remaining_ticks if remaining_ticks is not None else interval
-		Scheduler().add_new_object(self._tick, self, run_in=run_in, loops=-1, loop_interval=interval)
-
-	def _tick(self):
-		"""Here we collect the functions, that are called regularly (every "month")."""
-		self.pay_tax()
-		self.inhabitant_check()
-		self.level_check()
+		"""Start regular tick calls.
+		The settlement's residence manager calls collect_tax, inhabitant_check and level_check
+		every "month"."""
+		# keep a reference, the settlement of the tile might be gone when this is removed
+		self._residence_manager = self.settlement.residence_manager
+		self._residence_manager.add(self, remaining_ticks)
 
 	def pay_tax(self):
 		"""Pays the tax for this settler"""
+		taxes = self.collect_tax()
+		self.settlement.owner.get_component(StorageComponent).inventory.alter(RES.GOLD, taxes)
+
+	def collect_tax(self):
+		"""Calculates the tax of this settler and applies its effect on happiness.
+		@return: int, gold that the caller has to give to the owner of the settlement"""
 		# the money comes from nowhere, settlers seem to have an infinite amount of money.
 		# see http://wiki.unknown-horizons.org/w/Settler_taxing
 
@@ -237,7 +240,6 @@ class Settler(BuildableRect, BuildingResourceHandler, BasicBuilding):
 		taxes = self.tax_base * self.settlement.tax_settings[self.level] *  happiness_tax_modifier * inhabitants_tax_modifier
 		real_taxes = int(round(taxes * self.owner.difficulty.tax_multiplier))
 
-		self.settlement.owner.get_component(StorageComponent).inventory.alter(RES.GOLD, real_taxes)
 		self.last_tax_payed = real_taxes
 
 		# decrease happiness http://wiki.unknown-horizons.org/w/Settler_taxing#Formulae
@@ -253,6 +255,7 @@ class Settler(BuildableRect, BuildingResourceHandler, BasicBuilding):
 		self._changed()
 		self.log.debug("%s: pays %s taxes, -happy: %s new happiness: %s", self, real_taxes,
 									 happiness_decrease, self.happiness)
+		return real_taxes
 
 	def inhabitant_check(self):
 		"""Checks whether or not the population of this settler should increase or decrease"""
@@ -373,9 +376,11 @@ class Settler(BuildableRect, BuildingResourceHandler, BasicBuilding):
 		"""Notifies the user via a message in case there is no main square in range"""
 		if not self.owner.is_local_player:
 			return # only check this for local player
-		for building in self.get_buildings_in_range():
-			if building.id == BUILDINGS.MAIN_SQUARE:
-				if StaticPather.get_path_on_roads(self.island, self, building) is not None:
+		main_squares = self.island.buildings_by_type.get_buildings_in_range(
+			BUILDINGS.MAIN_SQUARE, self.position, self.radius)
+		for building in main_squares:
+			if building.settlement is self.settlement:
+				if StaticPather.is_connected_by_road(self.island, self, building):
 					# a main square is in range
 					if hasattr(self, "_main_square_status_icon"):
 						RemoveStatusIcon.broadcast(self, self, SettlerNotConnectedStatus)
@@ -412,13 +417,10 @@ class Settler(BuildableRect, BuildingResourceHandler, BasicBuilding):
 		except AttributeError: # an attribute hasn't been set up
 			return super(Settler, self).__str__()
 
-	#@decorators.cachedmethod TODO: replace this with a version that doesn't leak
 	def __get_data(self, key):
 		"""Returns constant settler-related data from the db.
-		The values are cached by python, so the underlying data must not change."""
-		return int(
-		  self.session.db("SELECT value FROM balance_values WHERE name = ?", key)[0][0]
-		  )
+		The values are cached by the db, so the underlying data must not change."""
+		return int(self.session.db.get_balance_value(key))
 
 
 
@@ -80,6 +80,18 @@ class Warehouse(StorageBuilding, BuildableSingleFromShip):
 		# we never need to unset this since warehouses are indestructible
 		# settlement warehouse setting is done at the settlement for loading
 
+	def initialize(self):
+		super(Warehouse, self).initialize()
+		self.session.world.warehouse_registry.add(self)
+
+	def load(self, db, worldid):
+		super(Warehouse, self).load(db, worldid)
+		self.session.world.warehouse_registry.add(self)
+
+	def remove(self):
+		self.session.world.warehouse_registry.remove(self)
+		super(Warehouse, self).remove()
+
 	def get_status_icons(self):
 		banned_classes = (InventoryFullStatus,)
 		return [ i for i in super(Warehouse, self).get_status_icons() if
@@ -113,26 +113,11 @@ class BuildingOwner:
 		@return: list of providers"""
 		assert not (bool(res) and bool(reslist))
 		assert isinstance(radiusrect, RadiusRect)
-		# find out relevant providers
 		if res is not None:
-			provider_list = self.provider_buildings.provider_by_resources[res]
-		elif reslist:
-			provider_list = set()
-			for _res in reslist:
-				provider_list = provider_list.union(self.provider_buildings.provider_by_resources[_res])
-		else:
-			# worst case: search all provider buildings
-			provider_list = self.provider_buildings
-		# filter out those that aren't in range
-		r2 = radiusrect.center
-		radius_squared = radiusrect.radius ** 2
-		for provider in provider_list:
-			if (player is None or player == provider.owner):
-				# inline of :
-				#provider.position.distance_to_rect(radiusrect.center) <= radiusrect.radius:
-				r1 = provider.position
-				if ((max(r1.left - r2.right, 0, r2.left - r1.right) ** 2) + (max(r1.top - r2.bottom, 0, r2.top - r1.bottom) ** 2)) <= radius_squared:
-					yield provider
+			reslist = (res, )
+		for provider in self.provider_buildings.get_providers_in_range(radiusrect, reslist):
+			if player is None or player == provider.owner:
+				yield provider
 
 	def save(self, db):
 		for building in self.buildings:
@@ -30,6 +30,7 @@ from horizons.messaging import NewSettlement, SettlementRangeChanged
 from horizons.scenario import CONDITIONS
 from horizons.scheduler import Scheduler
 from horizons.util.buildingindexer import BuildingIndexer
+from horizons.util.buildingtypeindexer import BuildingTypeIndexer
 from horizons.util.pathfinding.pathnodes import IslandBarrierNodes, IslandPathNodes
 from horizons.util.shapes import Circle, Rect
 from horizons.util.worldobject import WorldObject
@@ -91,10 +92,13 @@ class Island(BuildingOwner, WorldObject):
 			from horizons.world.units.animal import WildAnimal
 			self.building_indexers = {}
 			self.building_indexers[BUILDINGS.TREE] = BuildingIndexer(WildAnimal.walking_range, self, self.session.random)
+			# all buildings by type and position, for range checks of e.g. signal fires and farms
+			self.buildings_by_type = BuildingTypeIndexer()
 
 		# Load settlements.
 		for (settlement_id,) in db("SELECT rowid FROM settlement WHERE island = ?", island_id):
 			settlement = Settlement.load(db, settlement_id, self.session, self)
+			settlement.init_state_digest(self.session.world.state_digest)
 			self.settlements.append(settlement)
 
 		if preview:
@@ -209,6 +213,7 @@ class Island(BuildingOwner, WorldObject):
 		settlement = Settlement(self.session, player)
 		settlement.initialize()
 		settlement.init_buildability_cache(self.terrain_cache)
+		settlement.init_state_digest(self.session.world.state_digest)
 		self.add_existing_settlement(position, radius, settlement)
 		NewSettlement.broadcast(self, settlement, position.center)
 
@@ -226,22 +231,65 @@ class Island(BuildingOwner, WorldObject):
 		self.session.scenario_eventhandler.check_events(CONDITIONS.settlements_num_greater)
 		return settlement
 
+	# {(width, height, radius): ((dy, dx_from, dx_to), ...), ...}
+	# Every row of a settlement range is contiguous, so it is stored as a span relative
+	# to the origin of the building that defines the range.
+	_settlement_range_masks = {}
+
+	@classmethod
+	def _get_settlement_range_mask(cls, width, height, radius):
+		key = (width, height, radius)
+		mask = cls._settlement_range_masks.get(key)
+		if mask is None:
+			spans = {}
+			for (dx, dy) in Rect.get_radius_offsets(width, height, radius, include_self=True):
+				dx_from, dx_to = spans.get(dy, (dx, dx))
+				spans[dy] = (min(dx_from, dx), max(dx_to, dx))
+			mask = tuple((dy, dx_from, dx_to) for dy, (dx_from, dx_to) in sorted(spans.items()))
+			cls._settlement_range_masks[key] = mask
+		return mask
+
+	def _get_unowned_tiles_in_range(self, position, radius):
+		"""Returns a list of the island tiles without settlement within the range.
+		@param position: Rect
+		@param radius: int"""
+		island_rect = self.position
+		get_tile = self.ground_map.get
+		left, top = position.left, position.top
+		result = []
+		append = result.append
+		for (dy, dx_from, dx_to) in self._get_settlement_range_mask(position.width, position.height, radius):
+			y = top + dy
+			if y < island_rect.top or y > island_rect.bottom:
+				continue
+			for x in range(max(left + dx_from, island_rect.left), min(left + dx_to, island_rect.right) + 1):
+				tile = get_tile((x, y))
+				if tile is not None and tile.settlement is None:
+					append(tile)
+		return result
+
+	def _get_changed_area(self, coords_list):
+		"""Returns the smallest Rect that contains all the coords."""
+		xs, ys = list(zip(*coords_list))
+		return Rect.init_from_borders(min(xs), min(ys), max(xs), max(ys))
+
 	def assign_settlement(self, position, radius, settlement):
 		"""Assigns the settlement property to tiles within the circle defined by \
 		position and radius.
+
+		The newly owned tiles are found with a precomputed mask of the range. All caches,
+		the minimap and the SettlementRangeChanged message are updated once for all of them.
 		@param position: Rect
 		@param radius:
 		@param settlement:
 		"""
 		settlement_coords_changed = []
-		for coords in position.get_radius_coordinates(radius, include_self=True):
-			if coords not in self.ground_map:
-				continue
-
-			tile = self.ground_map[coords]
+		for tile in self._get_unowned_tiles_in_range(position, radius):
 			if tile.settlement is not None:
+				# taken over as part of a building found earlier in this loop
 				continue
 
+			coords = (tile.x, tile.y)
 			tile.settlement = settlement
 			settlement.ground_map[coords] = tile
 			settlement_coords_changed.append(coords)
@@ -272,12 +320,9 @@ class Island(BuildingOwner, WorldObject):
 			return
 
 		flat_land_set = self.terrain_cache.cache[TerrainRequirement.LAND][(1, 1)]
-		settlement_tiles_changed = []
-		for coords in settlement_coords_changed:
-			settlement_tiles_changed.append(self.ground_map[coords])
-			Minimap.update(coords)
-			if coords in flat_land_set:
-				self.available_flat_land -= 1
+		settlement_tiles_changed = [self.ground_map[coords] for coords in settlement_coords_changed]
+		self.available_flat_land -= len(flat_land_set.intersection(settlement_coords_changed))
+		Minimap.update_area(self._get_changed_area(settlement_coords_changed))
 		self.available_land_cache.remove_area(settlement_coords_changed)
 
 		self._register_change()
@@ -316,9 +361,10 @@ class Island(BuildingOwner, WorldObject):
 				clean_coords.add(coords)
 			settlement_tiles_changed.append(self.ground_map[coords])
 			del settlement.ground_map[coords]
-			Minimap.update(coords)
 			if coords in flat_land_set:
 				self.available_flat_land += 1
+		if settlement_coords_to_change:
+			Minimap.update_area(self._get_changed_area(settlement_coords_to_change))
 		self.available_land_cache.add_area(clean_coords)
 
 		self._register_change()
@@ -350,6 +396,7 @@ class Island(BuildingOwner, WorldObject):
 			building.settlement.add_building(building, load)
 		if building.id in self.building_indexers:
 			self.building_indexers[building.id].add(building)
+		self.buildings_by_type.add(building)
 
 		# Reset the tiles this building was covering
 		for coords in building.position.tuple_iter():
@@ -379,6 +426,7 @@ class Island(BuildingOwner, WorldObject):
 		super(Island, self).remove_building(building)
 		if building.id in self.building_indexers:
 			self.building_indexers[building.id].remove(building)
+		self.buildings_by_type.remove(building)
 
 		# Reset the tiles this building was covering (after building has been completely removed)
 		for coords in building.position.tuple_iter():
@@ -407,16 +455,11 @@ class Island(BuildingOwner, WorldObject):
 				yield tile
 
 	def get_tiles_in_radius(self, location, radius, include_self):
-		"""Returns tiles in radius of location.
-		This is a generator.
-		@param location: anything that supports get_radius_coordinates (usually Rect).
+		"""Returns list of tiles in radius of location.
+		@param location: anything that supports get_radius_values (usually Rect).
 		@param include_self: bool, whether to include the coordinates in location
 		"""
-		for coord in location.get_radius_coordinates(radius, include_self):
-			try:
-				yield self.ground_map[coord]
-			except KeyError:
-				pass
+		return location.get_radius_values(self.ground_map, radius, include_self)
 
 	def __iter__(self):
 		return iter(self.ground_map.keys())
@@ -460,3 +503,4 @@ class Island(BuildingOwner, WorldObject):
 		self.path_nodes = None
 		self.barrier_nodes = None
 		self.building_indexers = None
+		self.buildings_by_type = None
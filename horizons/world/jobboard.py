@@ -0,0 +1,61 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+from collections import Counter, defaultdict
+
+
+class JobBoard:
+	"""Keeps track of the resources that the collectors of a settlement are bringing home.
+
+	Collectors must not pick up more than their home building is able to store, including
+	the resources that the other collectors of the building are already getting. Instead of
+	summing up the jobs of all colleagues for every resource of every possible target, the
+	collectors register the resources of their current job here and job searches look them up.
+
+	The amounts that collectors are going to pick up at a provider are kept by the provider
+	itself (see ResourceHandler.get_available_pickup_amount), since providers like fish are
+	shared between settlements."""
+
+	def __init__(self):
+		# {home_building: Counter({res: amount})}
+		self._deliveries = defaultdict(Counter)
+
+	def reserve_delivery(self, home_building, reslist):
+		"""Registers that the resources of reslist are on their way to home_building.
+		@param reslist: iterable of Job.ResListEntry"""
+		deliveries = self._deliveries[home_building]
+		for entry in reslist:
+			deliveries[entry.res] += entry.amount
+
+	def release_delivery(self, home_building, reslist):
+		"""Reverts reserve_delivery, reslist has to be the same as when it was reserved."""
+		deliveries = self._deliveries[home_building]
+		for entry in reslist:
+			deliveries[entry.res] -= entry.amount
+			if not deliveries[entry.res]:
+				del deliveries[entry.res]
+		if not deliveries:
+			del self._deliveries[home_building]
+
+	def get_reserved_delivery(self, home_building, res):
+		"""Returns how much of res the collectors of home_building are currently bringing home."""
+		deliveries = self._deliveries.get(home_building)
+		return deliveries[res] if deliveries else 0
@@ -20,9 +20,9 @@
 # ###################################################
 
 import logging
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque
 
-from horizons.constants import PRODUCTION
+from horizons.constants import PRODUCTION, RES
 from horizons.scheduler import Scheduler
 from horizons.util.changelistener import ChangeListener, metaChangeListenerDecorator
 from horizons.world.production.productionline import ProductionLine
@@ -47,9 +47,14 @@ class Production(ChangeListener):
 	# optimization:
 	# the special resource gold is only stored in the player's inventory.
 	# If productions want to use it, they will observer every change of it, which results in
-	# a lot calls. Therefore, this is not done by default but only for few subclasses that actually need it.
+	# a lot calls. Therefore, this is not done by default but only for few subclasses that actually need it,
+	# and they are only notified when gold becomes available (see _add_listeners).
 	uses_gold = False
 
+	# inventory checks of all instances for profiling: 'checks' counts all of them,
+	# 'gold' the ones that were triggered by gold becoming available in the owner inventory
+	inventory_check_stats = Counter()
+
 	keep_original_prod_line = False
 
 	## INIT/DESTRUCT
@@ -345,6 +350,7 @@ class Production(ChangeListener):
 
 	def _check_inventory(self):
 		"""Called when assigned building's inventory changed in some way"""
+		self.inventory_check_stats['checks'] += 1
 		check_space = self._check_for_space_for_produced_res()
 		if not check_space:
 			# can't produce, no space in our inventory
@@ -392,7 +398,8 @@ class Production(ChangeListener):
 		# don't set call_listener_now to True here, adding/removing changelisteners wouldn't be atomic any more
 		self.inventory.add_change_listener(self._check_inventory)
 		if self.__class__.uses_gold:
-			self.owner_inventory.add_change_listener(self._check_inventory)
+			# gold is taken bit by bit, so any gold lets the production continue
+			self.owner_inventory.add_res_listener(self._on_gold_available, RES.GOLD)
 
 		if check_now: # only check now after adding everything
 			self._check_inventory()
@@ -401,7 +408,11 @@ class Production(ChangeListener):
 		# depending on state, a check_inventory listener might be active
 		self.inventory.discard_change_listener(self._check_inventory)
 		if self.__class__.uses_gold:
-			self.owner_inventory.discard_change_listener(self._check_inventory)
+			self.owner_inventory.discard_res_listener(self._on_gold_available, RES.GOLD)
+
+	def _on_gold_available(self, res):
+		self.inventory_check_stats['gold'] += 1
+		self._check_inventory()
 
 	def _give_produced_res(self):
 		"""Put produces goods to the inventory"""
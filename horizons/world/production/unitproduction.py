@@ -88,9 +88,7 @@ class UnitProduction(ChangingProduction):
 		# check if there were res
 		if removed_res == 0:
 			# watch inventory for new res
-			self.inventory.add_change_listener(self._check_inventory)
-			if self.__class__.uses_gold:
-				self.owner_inventory.add_change_listener(self._check_inventory)
+			self._add_listeners()
 			self._state = PRODUCTION.STATES.waiting_for_res
 			self._changed()
 			return
@@ -21,25 +21,86 @@
 
 from collections import defaultdict
 
+from horizons.util.gridbuckets import GridBuckets
+
 
 class ProviderHandler(list):
 	"""Class to keep track of providers of an area, especially an island.
 	It acts as a data structure for quick retrieval of special properties, that only resource
 	providers have.
 
-	Precondition: Provider never change their provided resources."""
+	Providers are also indexed in a grid of square cells per provided resource, so that
+	providers in range of a position can be found without looking at all providers.
+
+	Precondition: Provider never change their provided resources or their position."""
+
+	CELL_SIZE = 8
 
 	def __init__(self):
 		super(ProviderHandler, self).__init__()
 		self.provider_by_resources = defaultdict(list)
+		# {res: GridBuckets}, all providers are also stored with res None
+		self._provider_cells = {}
+		# order in which providers have been appended, range queries return providers in this order
+		self._serials = {}
+		self._next_serial = 0
 
 	def append(self, provider):
 		# NOTE: appended elements need to be removed, else there will be a memory leak
 		for res in provider.provided_resources:
 			self.provider_by_resources[res].append(provider)
+			self._add_to_cells(res, provider)
+		self._add_to_cells(None, provider)
+		self._serials[provider] = self._next_serial
+		self._next_serial += 1
 		super(ProviderHandler, self).append(provider)
 
 	def remove(self, provider):
 		for res in provider.provided_resources:
 			self.provider_by_resources[res].remove(provider)
+			self._remove_from_cells(res, provider)
+		self._remove_from_cells(None, provider)
+		del self._serials[provider]
 		super(ProviderHandler, self).remove(provider)
+
+	def _add_to_cells(self, res, provider):
+		grid = self._provider_cells.get(res)
+		if grid is None:
+			grid = self._provider_cells[res] = GridBuckets(self.CELL_SIZE)
+		pos = provider.position
+		grid.add(provider, grid.get_cells(pos.left, pos.top, pos.right, pos.bottom))
+
+	def _remove_from_cells(self, res, provider):
+		grid = self._provider_cells[res]
+		pos = provider.position
+		grid.remove(provider, grid.get_cells(pos.left, pos.top, pos.right, pos.bottom))
+
+	def get_providers_in_range(self, radiusrect, reslist=None):
+		"""Returns the providers within the specified shape in the order they were appended.
+		@param radiusrect: instance of RadiusRect
+		@param reslist: optional; list of res, only return providers that provide any of them
+		@return: list of providers"""
+		r2 = radiusrect.center
+		radius = radiusrect.radius
+		radius_squared = radius ** 2
+		# the radius might be a float, cells are addressed by ints
+		reach = int(radius) + 1
+		candidates = {}
+		for res in (reslist or (None, )):
+			grid = self._provider_cells.get(res)
+			if not grid:
+				continue
+			for providers in grid.get_buckets(r2.left, r2.top, r2.right, r2.bottom, reach):
+				for provider in providers:
+					if provider in candidates:
+						continue
+					# inline of :
+					#provider.position.distance_to_rect(radiusrect.center) <= radiusrect.radius:
+					r1 = provider.position
+					if ((max(r1.left - r2.right, 0, r2.left - r1.right) ** 2) + (max(r1.top - r2.bottom, 0, r2.top - r1.bottom) ** 2)) <= radius_squared:
+						candidates[provider] = self._serials[provider]
+					else:
+						candidates[provider] = None
+		in_range = [provider for provider in candidates if candidates[provider] is not None]
+		in_range.sort(key=self._serials.__getitem__)
+		return in_range
@@ -0,0 +1,109 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import heapq
+
+from horizons.component.storagecomponent import StorageComponent
+from horizons.constants import RES
+from horizons.scheduler import Scheduler
+
+
+class ResidenceManager:
+	"""Runs the monthly updates (taxes, happiness, inhabitants and level) of the settlers of a settlement.
+
+	Every settler keeps its own month, exactly like when it had its own looping scheduler call.
+	Instead of one call per settler, the settlement has a single scheduler call for the next tick
+	in which any of its settlers is due. It updates all settlers that are due in that tick in one
+	pass, in the order in which they became due, and pays their taxes to the owner with a single
+	inventory change.
+
+	Level, happiness and inhabitants stay on the settlers instead of in per-settlement arrays:
+	happiness is a resource in the settler's inventory that its productions alter, and the level
+	is used by the settler's own components."""
+
+	def __init__(self, settlement):
+		self.settlement = settlement
+		self._due_settlers = {} # {tick: [settler, ...]}, in the order they became due
+		self._due_ticks = [] # heap of the keys of self._due_settlers, may contain stale entries
+		self._settler_ticks = {} # {settler: tick of its next update or None while it is updated}
+		self._next_tick = None # tick for which the scheduler call has been added
+
+	def add(self, settler, run_in=None):
+		"""Starts the monthly updates of settler.
+		@param run_in: ticks until the first update, defaults to a month"""
+		if run_in is None:
+			run_in = Scheduler().get_ticks_of_month()
+		self._add(settler, Scheduler().cur_tick + run_in)
+		self._update_schedule()
+
+	def _add(self, settler, tick):
+		self._settler_ticks[settler] = tick
+		settlers = self._due_settlers.get(tick)
+		if settlers is None:
+			settlers = self._due_settlers[tick] = []
+			heapq.heappush(self._due_ticks, tick)
+		settlers.append(settler)
+
+	def remove(self, settler):
+		"""Stops the monthly updates of settler."""
+		tick = self._settler_ticks.pop(settler)
+		settlers = self._due_settlers.get(tick)
+		if settlers is not None:
+			settlers.remove(settler)
+			if not settlers:
+				del self._due_settlers[tick]
+				self._update_schedule()
+
+	def get_remaining_ticks(self, settler):
+		"""Returns in how many ticks the next monthly update of settler happens."""
+		return self._settler_ticks[settler] - Scheduler().cur_tick
+
+	def _update_schedule(self):
+		"""Makes the scheduler call _tick in the next tick in which a settler is due."""
+		due_ticks = self._due_ticks
+		while due_ticks and due_ticks[0] not in self._due_settlers:
+			heapq.heappop(due_ticks)
+		next_tick = due_ticks[0] if due_ticks else None
+		if next_tick == self._next_tick:
+			return
+		if self._next_tick is not None:
+			Scheduler().rem_call(self, self._tick)
+		if next_tick is not None:
+			Scheduler().add_new_object(self._tick, self, run_in=next_tick - Scheduler().cur_tick)
+		self._next_tick = next_tick
+
+	def _tick(self):
+		self._next_tick = None # this call is over
+		tick = Scheduler().cur_tick
+		interval = Scheduler().get_ticks_of_month()
+		taxes = 0
+		for settler in self._due_settlers.pop(tick, []):
+			if self._settler_ticks.get(settler) != tick:
+				continue # removed by the update of another settler
+			self._settler_ticks[settler] = None
+			taxes += settler.collect_tax()
+			settler.inhabitant_check()
+			settler.level_check()
+			if settler in self._settler_ticks: # it can remove itself
+				self._add(settler, tick + interval)
+		if taxes:
+			self.settlement.owner.get_component(StorageComponent).inventory.alter(RES.GOLD, taxes)
+		self._update_schedule()
@@ -19,6 +19,7 @@
 # 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 # ###################################################
 
+from collections import Counter
 from copy import copy
 
 from horizons.component.ambientsoundcomponent import AmbientSoundComponent
@@ -71,8 +72,9 @@ class ResourceHandler(ResourceTransferHandler):
 		super(ResourceHandler, self).__init__(**kwargs)
 
 	def __init(self):
-		# list of collectors that are on the way here
-		self.__incoming_collectors = []
+		# collectors that are on the way here and the resources they are going to pick up
+		self.__incoming_collectors = {} # {collector: reslist}
+		self.__reserved_pickups = Counter() # {res: sum of amounts of incoming collectors}
 		self.provided_resources = self._load_provided_resources()
 
 	def initialize(self):
@@ -88,8 +90,8 @@ class ResourceHandler(ResourceTransferHandler):
 
 	def remove(self):
 		super(ResourceHandler, self).remove()
-		while self.__incoming_collectors: # safe list remove here
-			self.__incoming_collectors[0].cancel()
+		while self.__incoming_collectors: # safe remove here
+			next(iter(self.__incoming_collectors)).cancel()
 
 	## INTERFACE
 	def get_consumed_resources(self, include_inactive=False):
@@ -144,10 +146,14 @@ class ResourceHandler(ResourceTransferHandler):
 
 	def add_incoming_collector(self, collector):
 		assert collector not in self.__incoming_collectors
-		self.__incoming_collectors.append(collector)
+		reslist = tuple(collector.job.reslist)
+		self.__incoming_collectors[collector] = reslist
+		for entry in reslist:
+			self.__reserved_pickups[entry.res] += entry.amount
 
 	def remove_incoming_collector(self, collector):
-		self.__incoming_collectors.remove(collector)
+		for entry in self.__incoming_collectors.pop(collector):
+			self.__reserved_pickups[entry.res] -= entry.amount
 
 	def _get_owner_inventory(self):
 		"""Returns the inventory of the owner to be able to retrieve special resources such as gold.
@@ -180,11 +186,10 @@ class ResourceHandler(ResourceTransferHandler):
 		if res not in self.provided_resources:
 			return 0 # we don't provide this, and give nothing away because we need it ourselves.
 		else:
-			amount_from_collectors = sum((entry.amount
-			                              for c in self.__incoming_collectors
-			                              for entry in c.job.reslist
-			                              if c is not collector and
-			                              entry.res == res))
+			amount_from_collectors = self.__reserved_pickups[res]
+			if collector in self.__incoming_collectors:
+				amount_from_collectors -= sum(entry.amount for entry in self.__incoming_collectors[collector]
+				                              if entry.res == res)
 			amount = self.get_component(StorageComponent).inventory[res] - amount_from_collectors
 			# the user can take away res, even if a collector registered for them
 			# if this happens, a negative number would be returned. Use 0 instead.
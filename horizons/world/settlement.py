@@ -33,7 +33,9 @@ from horizons.util.changelistener import ChangeListener
 from horizons.util.inventorychecker import InventoryChecker
 from horizons.util.worldobject import WorldObject
 from horizons.world.buildability.settlementcache import SettlementBuildabilityCache
+from horizons.world.jobboard import JobBoard
 from horizons.world.production.producer import GroundUnitProducer, Producer, ShipProducer
+from horizons.world.residencemanager import ResidenceManager
 from horizons.world.resourcehandler import ResourceHandler
 
 
@@ -74,12 +76,19 @@ class Settlement(ComponentHolder, WorldObject, ChangeListener, ResourceHandler):
 		self.warehouse = None # this is set later in the same tick by the warehouse itself or load() here
 		self.upgrade_permissions = upgrade_permissions
 		self.tax_settings = tax_settings
+		self.job_board = JobBoard() # resources the collectors of the settlement are getting
+		self.residence_manager = ResidenceManager(self)
 		Scheduler().add_new_object(self.__init_inventory_checker, self)
 
 	def init_buildability_cache(self, terrain_cache):
 		self.buildability_cache = SettlementBuildabilityCache(terrain_cache, self.ground_map)
 		self.buildability_cache.modify_area(self.ground_map.keys())
 
+	def init_state_digest(self, state_digest):
+		"""Adds the owner and the inventory of this settlement to the world's state digest."""
+		state_digest.add(('settlement', self.worldid), self.owner.worldid)
+		self.get_component(StorageComponent).inventory.set_state_digest(state_digest, ('settlement_inventory', self.worldid))
+
 	@classmethod
 	def make_default_upgrade_permissions(cls):
 		upgrade_permissions = {}
@@ -195,16 +204,11 @@ class Settlement(ComponentHolder, WorldObject, ChangeListener, ResourceHandler):
 		return self
 
 	def get_tiles_in_radius(self, location, radius, include_self):
-		"""Returns tiles in radius of location.
-		This is a generator.
-		@param location: anything that supports get_radius_coordinates (usually Rect).
+		"""Returns list of tiles in radius of location.
+		@param location: anything that supports get_radius_values (usually Rect).
 		@param include_self: bool, whether to include the coordinates in location
 		"""
-		for coord in location.get_radius_coordinates(radius, include_self):
-			try:
-				yield self.ground_map[coord]
-			except KeyError:
-				pass
+		return location.get_radius_values(self.ground_map, radius, include_self)
 
 	def add_building(self, building, load=False):
 		"""Adds a building to the settlement.
@@ -266,5 +270,7 @@ class Settlement(ComponentHolder, WorldObject, ChangeListener, ResourceHandler):
 		self.produced_res = None
 		self.buildings_by_id = None
 		self.warehouse = None
+		self.job_board = None
+		self.residence_manager = None
 		if hasattr(self, '__inventory_checker'):
 			self.__inventory_checker.remove()
@@ -41,7 +41,7 @@ Combinations:
 
 import copy
 import sys
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 from horizons.util.changelistener import ChangeListener
 
@@ -52,9 +52,15 @@ class GenericStorage(ChangeListener):
 	derive storages with special function from it. Normally there should be no need to
 	use the GenericStorage. Rather use a specialized version that is suitable for the job.
 	"""
+	# calls of res listeners of all instances for profiling, by resource id
+	res_listener_calls = Counter()
+
 	def __init__(self):
 		super(GenericStorage, self).__init__()
 		self._storage = defaultdict(int)
+		self._state_digest = None
+		self._state_digest_key = None
+		self._res_listeners = {} # {res or None: [(listener, threshold), ...]}
 
 	def save(self, db, ownerid):
 		for slot in self._storage.items():
@@ -74,22 +80,85 @@ class GenericStorage(ChangeListener):
 		@param amount: int amount that is to be changed. Can be negative to remove resources.
 		@return: int - amount that did not fit or was not available, depending on context.
 		"""
-		self._storage[res] += amount # defaultdict
+		old_amount = self._storage[res] # defaultdict
+		self._storage[res] = old_amount + amount
+		if self._state_digest is not None:
+			self._update_state_digest(res, old_amount, old_amount + amount)
 		self._changed()
+		if amount > 0 and self._res_listeners:
+			self._call_res_listeners(res, old_amount, old_amount + amount)
 		return 0
 
 	def reset(self, res):
 		"""Resets a resource slot to zero, removing all its contents."""
 		if res in self._storage:
+			if self._state_digest is not None:
+				self._update_state_digest(res, self._storage[res], 0)
 			self._storage[res] = 0
 			self._changed()
 
 	def reset_all(self):
 		"""Removes every resource from this inventory"""
 		for res in self._storage:
+			if self._state_digest is not None:
+				self._update_state_digest(res, self._storage[res], 0)
 			self._storage[res] = 0
 		self._changed()
 
+	def add_res_listener(self, listener, res=None, threshold=1):
+		"""Calls listener(res) every time the amount of res rises from below threshold to threshold
+		or more. Unlike change listeners, these aren't called for other resources or decreases.
+		@param res: resource id or None to listen to all resources
+		@param threshold: by default, listeners are called when res becomes available
+		NOTE: these listeners are not saved, they have to be reregistered on load"""
+		self._res_listeners.setdefault(res, []).append((listener, threshold))
+
+	def discard_res_listener(self, listener, res=None):
+		"""Removes listener from the listeners of res if it's there"""
+		entries = self._res_listeners.get(res)
+		if entries:
+			# modify in place, see _call_res_listeners
+			entries[:] = [entry for entry in entries if entry[0] != listener]
+			if not entries:
+				del self._res_listeners[res]
+
+	def notify_res_available(self, res):
+		"""Calls the listeners of res whose threshold is reached, even if the amount didn't change.
+		Used when res has been produced, in case it is reserved by other collectors."""
+		if self._res_listeners:
+			self._call_res_listeners(res, None, self[res])
+
+	def _call_res_listeners(self, res, old_amount, new_amount):
+		for key in (res, None):
+			entries = self._res_listeners.get(key)
+			if not entries:
+				continue
+			for entry in list(entries):
+				listener, threshold = entry
+				if (old_amount is None or old_amount < threshold) and threshold <= new_amount \
+				   and entry in entries: # listeners may remove other listeners
+					self.res_listener_calls[res] += 1
+					listener(res)
+
+	def set_state_digest(self, state_digest, key):
+		"""Keeps the contents of this storage in state_digest from now on.
+		Every resource amount is an entry ((key, res), amount) in the digest.
+		@param state_digest: StateDigest instance or None to stop tracking
+		@param key: hashable identifying this storage in the digest
+		"""
+		if self._state_digest is not None:
+			for res, amount in self._storage.items():
+				self._update_state_digest(res, amount, 0)
+		self._state_digest = state_digest
+		self._state_digest_key = key
+		if state_digest is not None:
+			for res, amount in self._storage.items():
+				self._update_state_digest(res, 0, amount)
+
+	def _update_state_digest(self, res, old_amount, new_amount):
+		# empty slots are not part of the digest, they can be created by just reading a slot
+		self._state_digest.update((self._state_digest_key, res), old_amount or None, new_amount or None)
+
 	def get_limit(self, res=None):
 		"""Returns the current limit of the storage. Please note that this
 		value can have different meanings depending on the context. See the
@@ -209,6 +278,8 @@ class GlobalLimitStorage(GenericStorage):
 		# remove res that don't fit anymore
 		for res, amount in self._storage.items():
 			if amount > self.limit:
+				if self._state_digest is not None:
+					self._update_state_digest(res, amount, self.limit)
 				self._storage[res] = self.limit
 		self._changed()
 
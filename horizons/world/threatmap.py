@@ -0,0 +1,88 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+from horizons.util.unitindexer import UnitIndexer
+
+
+class ThreatMap:
+	"""
+	Indexes units by owner and by their position in a uniform grid of square cells.
+
+	Used by stances and AIs to find the units of hostile players near a position without
+	looking at own or allied units. The map is updated together with the world's unit
+	indexers, so queries always see the current positions. Results are returned in the
+	order in which the units were added, like the lists of the world.
+	"""
+
+	def __init__(self, cell_size=None):
+		"""
+		@param cell_size: int, width and height of a cell in tiles
+		"""
+		self.cell_size = cell_size
+		self._indexers = {} # {owner: UnitIndexer}
+		self._serials = {} # {unit: serial}
+		self._next_serial = 0
+
+	def __len__(self):
+		return len(self._serials)
+
+	def __contains__(self, unit):
+		return unit in self._serials
+
+	def add(self, unit):
+		indexer = self._indexers.get(unit.owner)
+		if indexer is None:
+			indexer = self._indexers[unit.owner] = UnitIndexer(self.cell_size)
+		indexer.add(unit)
+		self._serials[unit] = self._next_serial
+		self._next_serial += 1
+
+	def remove(self, unit):
+		del self._serials[unit]
+		indexer = self._indexers[unit.owner]
+		indexer.remove(unit)
+		if not len(indexer):
+			del self._indexers[unit.owner]
+
+	def update(self, unit):
+		"""Has to be called after the position of unit has changed."""
+		self._indexers[unit.owner].update(unit)
+
+	def get_owners(self):
+		"""Returns the owners of the indexed units."""
+		return list(self._indexers)
+
+	def get_units_in_range(self, position, radius, owners):
+		"""
+		Returns the units of owners whose position is inside of Circle(position, radius).
+		@param position: Point, center of the circle
+		@param radius: int
+		@param owners: iterable of players
+		@return: list of units, in the order they were added
+		"""
+		units = []
+		for owner in owners:
+			indexer = self._indexers.get(owner)
+			if indexer is not None:
+				units.extend(indexer.get_units_in_range(position, radius))
+		if len(units) > 1:
+			units.sort(key=self._serials.__getitem__)
+		return units
@@ -20,7 +20,7 @@
 # ###################################################
 
 import weakref
-from collections import deque
+from collections import Counter, deque
 
 from horizons.component.collectingcomponent import CollectingComponent
 from horizons.component.storagecomponent import StorageComponent
@@ -46,6 +46,10 @@ class BuildingCollector(Collector):
 	job_ordering = JobList.order_by.fewest_available_and_distance # type: ignore
 	pather_class = BuildingCollectorPather
 
+	# job searches of all instances for profiling: 'successful' and 'wasted' ones and
+	# how often a waiting collector was 'woken' because a resource became available
+	job_search_stats = Counter()
+
 	def __init__(self, home_building, **kwargs):
 		kwargs['x'] = home_building.position.origin.x
 		kwargs['y'] = home_building.position.origin.y
@@ -61,6 +65,14 @@ class BuildingCollector(Collector):
 		# save whether it's possible for this instance to access a target
 		# @chachedmethod is not applicable since it stores hard refs in the arguments
 		self._target_possible_cache = weakref.WeakKeyDictionary()
+		# Job search backoff and wake up, see handle_no_possible_job. This isn't saved,
+		# after loading the waiting starts again with the next futile search.
+		self._futile_job_searches = 0
+		self._job_search_targets = [] # targets that were checked in the current search
+		self._job_search_res = [] # resources that were searched for
+		self._awaited_inventories = []
+		# (job board, home building, reslist) of the resources that the current job brings home
+		self._job_reservation = None
 
 	def save(self, db):
 		super(BuildingCollector, self).save(db)
@@ -143,6 +155,33 @@ class BuildingCollector(Collector):
 		colls = self.home_building.get_component(CollectingComponent).get_local_collectors()
 		return ( coll for coll in colls if coll is not self )
 
+	def get_job_board(self):
+		"""Returns the JobBoard of the home settlement or None"""
+		if self.home_building is None or self.home_building.settlement is None:
+			return None
+		return self.home_building.settlement.job_board
+
+	def get_colleague_job_amount(self, res):
+		job_board = self.get_job_board()
+		if job_board is None:
+			return super(BuildingCollector, self).get_colleague_job_amount(res)
+		amount = job_board.get_reserved_delivery(self.home_building, res)
+		if self._job_reservation is not None:
+			amount -= sum(entry.amount for entry in self._job_reservation[2] if entry.res == res)
+		return amount
+
+	def _update_job_reservation(self):
+		if self._job_reservation is not None:
+			job_board, home_building, reslist = self._job_reservation
+			job_board.release_delivery(home_building, reslist)
+			self._job_reservation = None
+		if self.job is not None:
+			job_board = self.get_job_board()
+			if job_board is not None:
+				reslist = tuple(self.job.reslist)
+				job_board.reserve_delivery(self.home_building, reslist)
+				self._job_reservation = (job_board, self.home_building, reslist)
+
 	def get_job(self):
 		"""Returns the next job or None"""
 		if self.home_building is None:
@@ -152,6 +191,12 @@ class BuildingCollector(Collector):
 		if not collectable_res:
 			return None
 
+		self._job_search_res = collectable_res
+		# only look for resources that we could bring home at all
+		collectable_res = [res for res in collectable_res if self.get_free_space_for_job(res) > 0]
+		if not collectable_res:
+			return None
+
 		jobs = JobList(self, self.job_ordering)
 		# iterate all building that provide one of the resources
 		for building in self.get_buildings_in_range(reslist=collectable_res):
@@ -162,6 +207,7 @@ class BuildingCollector(Collector):
 				self._target_possible_cache[building] = target_possible
 
 			if target_possible:
+				self._job_search_targets.append(building)
 				# check for res here
 				reslist = ( self.check_possible_job_target_for(building, res) for res in collectable_res )
 				reslist = [i for i in reslist if i]
@@ -178,16 +224,48 @@ class BuildingCollector(Collector):
 
 	def search_job(self):
 		self._clean_job_history_log()
+		self._stop_waiting_for_job()
+		self._job_search_targets = []
 		super(BuildingCollector, self).search_job()
 
 
 	def handle_no_possible_job(self):
+		"""Waits for a resource to become available at one of the possible targets, see
+		GenericStorage.add_res_listener. Searching again periodically remains as
+		a fallback for other changes, but the wait is doubled after every futile search."""
 		super(BuildingCollector, self).handle_no_possible_job()
+		self.job_search_stats['wasted'] += 1
+		self._futile_job_searches += 1
+		for target in self._job_search_targets:
+			inventory = target.get_component(StorageComponent).inventory
+			inventory.add_res_listener(self._on_res_available)
+			self._awaited_inventories.append(inventory)
+		self._job_search_targets = []
 		# only append a new element if it is different from the last one
 		if not self._job_history or abs(self._job_history[-1][1]) > 1e-9:
 			self._job_history.append((Scheduler().cur_tick, 0))
 
+	def get_job_search_wait_ticks(self):
+		wait_ticks = COLLECTORS.DEFAULT_WAIT_TICKS << min(self._futile_job_searches, 16)
+		return min(wait_ticks, COLLECTORS.MAX_WAIT_TICKS)
+
+	def _on_res_available(self, res):
+		"""Searches for a job in the next tick if res is needed."""
+		if res not in self._job_search_res:
+			return
+		self._stop_waiting_for_job()
+		self.job_search_stats['woken'] += 1
+		Scheduler().rem_call(self, self.search_job)
+		Scheduler().add_new_object(self.search_job, self, run_in=1)
+
+	def _stop_waiting_for_job(self):
+		for inventory in self._awaited_inventories:
+			inventory.discard_res_listener(self._on_res_available)
+		self._awaited_inventories = []
+
 	def begin_current_job(self, job_location=None):
+		self.job_search_stats['successful'] += 1
+		self._futile_job_searches = 0
 		super(BuildingCollector, self).begin_current_job(job_location)
 		# Sum up the utilization for all res
 		utilization = 0.0
@@ -265,6 +343,7 @@ class BuildingCollector(Collector):
 	def cancel(self, continue_action=None):
 		"""Cancels current job and moves back home"""
 		self.log.debug("%s cancel", self)
+		self._stop_waiting_for_job()
 		if continue_action is None:
 			continue_action = Callback(self.move_home, callback=self.end_job, action='move')
 		super(BuildingCollector, self).cancel(continue_action=continue_action)
@@ -105,6 +105,7 @@ class Collector(Unit):
 		self._abort_collector_job()
 		self.hide()
 		self.job = None
+		self._update_job_reservation()
 		super(Collector, self).remove()
 
 	def _abort_collector_job(self):
@@ -167,6 +168,7 @@ class Collector(Unit):
 			# create job with worldid of object as object. This is used to defer the target resolution,
 			# which might not have been loaded
 			self.job = Job(obj, reslist)
+			self._update_job_reservation()
 
 		def fix_job_object():
 			# resolve worldid to object later
@@ -219,6 +221,14 @@ class Collector(Unit):
 		"""Returns a list of collectors, that work for the same "inventory"."""
 		return []
 
+	def get_colleague_job_amount(self, res):
+		"""Returns how much of res the colleague collectors are currently getting."""
+		return sum(entry.amount for
+		           collector in self.get_colleague_collectors() if
+		           collector.job is not None for
+		           entry in collector.job.reslist if
+		           entry.res == res)
+
 	def get_collectable_res(self):
 		"""Return all resources the collector can collect"""
 		raise NotImplementedError
@@ -233,6 +243,7 @@ class Collector(Unit):
 		"""Search for a job, only called if the collector does not have a job.
 		If no job is found, a new search will be scheduled in a few ticks."""
 		self.job = self.get_job()
+		self._update_job_reservation()
 		if self.job is None:
 			self.handle_no_possible_job()
 		else:
@@ -240,8 +251,18 @@ class Collector(Unit):
 
 	def handle_no_possible_job(self):
 		"""Called when we can't find a job. default is to wait and try again in a few secs"""
-		self.log.debug("%s: found no possible job, retry in %s ticks", self, COLLECTORS.DEFAULT_WAIT_TICKS)
-		Scheduler().add_new_object(self.search_job, self, COLLECTORS.DEFAULT_WAIT_TICKS)
+		wait_ticks = self.get_job_search_wait_ticks()
+		self.log.debug("%s: found no possible job, retry in %s ticks", self, wait_ticks)
+		Scheduler().add_new_object(self.search_job, self, wait_ticks)
+
+	def get_job_search_wait_ticks(self):
+		"""Returns after how many ticks to search again when no job has been found."""
+		return COLLECTORS.DEFAULT_WAIT_TICKS
+
+	def _update_job_reservation(self):
+		"""Called every time the current job or its resource list has changed.
+		Subclasses can use this to keep track of the resources that are being collected."""
+		pass
 
 	def setup_new_job(self):
 		"""Executes the necessary actions to begin a new job"""
@@ -275,37 +296,29 @@ class Collector(Unit):
 			#self.log.debug("nojob: no pickup amount")
 			return None
 
-		# check if other collectors get this resource, because our inventory could
-		# get full if they arrive.
-		total_registered_amount_consumer = sum(
-		  entry.amount for
-		  collector in self.get_colleague_collectors() if
-		  collector.job is not None for
-		  entry in collector.job.reslist if
-		  entry.res == res )
-
-		inventory = self.get_home_inventory()
-
-		# check if there are resources left to pickup
-		home_inventory_free_space = inventory.get_free_space_for(res) \
-		                            - total_registered_amount_consumer
-		if home_inventory_free_space <= 0:
-			#self.log.debug("nojob: no home inventory space")
+		free_space = self.get_free_space_for_job(res)
+		if free_space <= 0:
+			#self.log.debug("nojob: no home or collector inventory space")
 			return None
 
-		collector_inventory_free_space = self.get_component(StorageComponent).inventory.get_free_space_for(res)
-		if collector_inventory_free_space <= 0:
-			#self.log.debug("nojob: no collector inventory space")
-			return None
-
-		possible_res_amount = min(res_amount, home_inventory_free_space,
-		                          collector_inventory_free_space)
+		possible_res_amount = min(res_amount, free_space)
 
 		target_inventory_full = (target.get_component(StorageComponent).inventory.get_free_space_for(res) == 0)
 
 		# create a new data line.
 		return Job.ResListEntry(res, possible_res_amount, target_inventory_full)
 
+	def get_free_space_for_job(self, res):
+		"""Returns how much of res the collector could get with a job, regardless of the target.
+		That's limited by the own inventory and the home inventory.
+		@param res: resource id"""
+		# check if other collectors get this resource, because our inventory could
+		# get full if they arrive.
+		home_inventory_free_space = self.get_home_inventory().get_free_space_for(res) \
+		                            - self.get_colleague_job_amount(res)
+		collector_inventory_free_space = self.get_component(StorageComponent).inventory.get_free_space_for(res)
+		return min(home_inventory_free_space, collector_inventory_free_space)
+
 	def get_best_possible_job(self, jobs):
 		"""Return best possible job from jobs.
 		"Best" means that the job is highest when the job list was sorted.
@@ -376,6 +389,7 @@ class Collector(Unit):
 		reslist = [i for i in reslist if i]
 		if reslist:
 			self.job.reslist = reslist
+			self._update_job_reservation()
 
 		# transfer res (this must be the last step, it will trigger consecutive actions through the
 		# target inventory changelistener, and the collector must be in a consistent state then.
@@ -398,6 +412,7 @@ class Collector(Unit):
 			assert remnant == 0, "{} couldn't take all of res {}; remnant: {}; planned: {}".format(
 			       self, entry.res, remnant, entry.amount)
 		self.job.reslist = new_reslist
+		self._update_job_reservation()
 
 	def transfer_res_to_home(self, res, amount):
 		"""Transfer resources from collector to the home inventory"""
@@ -418,6 +433,7 @@ class Collector(Unit):
 		if self.start_hidden:
 			self.hide()
 		self.job = None
+		self._update_job_reservation()
 		Scheduler().add_new_object(self.search_job, self, COLLECTORS.DEFAULT_WAIT_TICKS)
 		self.state = self.states.idle
 
@@ -438,6 +454,7 @@ class Collector(Unit):
 				removed_calls = Scheduler().rem_call(self, self.finish_working)
 				assert removed_calls == 1, 'removed {} calls instead of one'.format(removed_calls)
 			self.job = None
+			self._update_job_reservation()
 			self.state = self.states.idle
 		# NOTE:
 		# Some blocked movement callbacks use this callback. All blocked
@@ -46,11 +46,15 @@ class GroundUnit(Unit):
 	def __init__(self, x, y, **kwargs):
 		super(GroundUnit, self).__init__(x=x, y=y, **kwargs)
 		self.session.world.ground_units.append(self)
+		self.session.world.ground_unit_indexer.add(self)
+		self.session.world.ground_unit_threat_map.add(self)
 		self.session.world.ground_unit_map[self.position.to_tuple()] = weakref.ref(self)
 
 	def remove(self):
 		super(GroundUnit, self).remove()
 		self.session.world.ground_units.remove(self)
+		self.session.world.ground_unit_indexer.remove(self)
+		self.session.world.ground_unit_threat_map.remove(self)
 		self.session.view.discard_change_listener(self.draw_health)
 		del self.session.world.ground_unit_map[self.position.to_tuple()]
 
@@ -67,11 +71,19 @@ class GroundUnit(Unit):
 		self.session.world.ground_unit_map[self.position.to_tuple()] = weakref.ref(self)
 		self.session.world.ground_unit_map[self._next_target.to_tuple()] = weakref.ref(self)
 
+	def _get_unit_indexer(self):
+		return self.session.world.ground_unit_indexer
+
+	def _get_threat_map(self):
+		return self.session.world.ground_unit_threat_map
+
 	def load(self, db, worldid):
 		super(GroundUnit, self).load(db, worldid)
 
 		# register unit in world
 		self.session.world.ground_units.append(self)
+		self.session.world.ground_unit_indexer.add(self)
+		self.session.world.ground_unit_threat_map.add(self)
 		self.session.world.ground_unit_map[self.position.to_tuple()] = weakref.ref(self)
 
 
@@ -175,6 +175,10 @@ class MovingObject(ComponentHolder, ConcreteObject):
 			#self.log.debug("%s move tick from %s to %s", self, self.last_position, self._next_target)
 			self.last_position = self.position
 			self.position = self._next_target
+			indexer = self._get_unit_indexer()
+			if indexer is not None and self in indexer:
+				indexer.update(self)
+				self._get_threat_map().update(self)
 			self._changed()
 
 		# try to get next step, handle a blocked path
@@ -281,6 +285,14 @@ class MovingObject(ComponentHolder, ConcreteObject):
 		else:
 			return (12, 17) # standard values
 
+	def _get_unit_indexer(self):
+		"""Returns the UnitIndexer that has to know about position changes of this unit, if any."""
+		return None
+
+	def _get_threat_map(self):
+		"""Returns the ThreatMap that indexes this unit with the UnitIndexer above."""
+		return None
+
 	def get_move_target(self):
 		return self.path.get_move_target()
 
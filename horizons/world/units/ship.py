@@ -70,6 +70,9 @@ class Ship(Unit):
 	def __init(self):
 		# register ship in world
 		self.session.world.ships.append(self)
+		self.session.world.ship_indexer.add(self)
+		self.session.world.ship_threat_map.add(self)
+		self.session.world.state_digest.add(self._get_state_digest_key(), self._get_state_digest_value())
 		if self.in_ship_map:
 			self.session.world.ship_map[self.position.to_tuple()] = weakref.ref(self)
 
@@ -78,6 +81,9 @@ class Ship(Unit):
 
 	def remove(self):
 		self.session.world.ships.remove(self)
+		self.session.world.ship_indexer.remove(self)
+		self.session.world.ship_threat_map.remove(self)
+		self.session.world.state_digest.remove(self._get_state_digest_key(), self._get_state_digest_value())
 		self.session.view.discard_change_listener(self.draw_health)
 		if self.in_ship_map:
 			if self.position.to_tuple() in self.session.world.ship_map:
@@ -105,6 +111,7 @@ class Ship(Unit):
 		elif self.in_ship_map:  # logging purposes only
 			self.log.error("Ship %s had in_ship_map flag set as True but tuple %s was "
 			               "not found in world.ship_map", self, self.position.to_tuple())
+		old_digest_value = self._get_state_digest_value()
 
 		try:
 			super(Ship, self)._move_tick(resume)
@@ -116,11 +123,27 @@ class Ship(Unit):
 					self.session.world.ship_map[self.position.to_tuple()] = weakref.ref(self)
 				raise
 
+		self.session.world.state_digest.update(self._get_state_digest_key(),
+		                                       old_digest_value, self._get_state_digest_value())
+
 		if self.in_ship_map:
 			# save current and next position for ship, since it will be between them
 			self.session.world.ship_map[self.position.to_tuple()] = weakref.ref(self)
 			self.session.world.ship_map[self._next_target.to_tuple()] = weakref.ref(self)
 
+	def _get_unit_indexer(self):
+		return self.session.world.ship_indexer
+
+	def _get_threat_map(self):
+		return self.session.world.ship_threat_map
+
+	def _get_state_digest_key(self):
+		return ('ship', self.worldid)
+
+	def _get_state_digest_value(self):
+		"""Returns what is checked about this ship to detect multiplayer desyncs."""
+		return (self.owner.worldid, self.position.x, self.position.y)
+
 	def _movement_finished(self):
 		if self.in_ship_map:
 			# if the movement somehow stops, the position sticks, and the unit isn't at next_target any more
@@ -177,10 +200,14 @@ class Ship(Unit):
 				horizons.globals.fife.animationloader.loadResource("as_buoy0+idle+45")
 			)
 
-	def find_nearby_ships(self, radius=15):
+	def find_nearby_ships(self, radius=15, owners=None):
+		"""Returns the other ships in radius, optionally only those of owners (iterable of players)."""
 		# TODO: Replace 15 with a distance dependent on the ship type and any
 		# other conditions.
-		ships = self.session.world.get_ships(self.position, radius)
+		if owners is not None:
+			ships = self.session.world.ship_threat_map.get_units_in_range(self.position, radius, owners)
+		else:
+			ships = self.session.world.get_ships(self.position, radius)
 		if self in ships:
 			ships.remove(self)
 		return ships
@@ -265,8 +265,8 @@ class WeaponHolder:
 		Executes every few seconds, doing movement depending on the stance.
 		Static WeaponHolders are aggressive, attacking all enemies that are in range
 		"""
-		enemies = [u for u in self.session.world.get_health_instances(self.position.center, self._max_range)
-			if self.session.world.diplomacy.are_enemies(u.owner, self.owner)]
+		enemies = self.session.world.get_enemy_health_instances(self.owner, self.position.center,
+		                                                        self._max_range)
 
 		self.log.debug("%s stance tick, found enemies: %s", self, [str(i) for i in enemies])
 		if not enemies:
@@ -0,0 +1,97 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+from horizons.util.gridbuckets import GridBuckets
+from horizons.util.shapes import Point, Rect
+
+
+class WarehouseRegistry:
+	"""Keeps track of all warehouses of the world, indexed by owner and position.
+
+	Warehouses are added when they are built or loaded and removed with them. Positions are
+	indexed in a coarse GridBuckets. All queries return the warehouses ordered by worldid, so
+	that the result is the same for every player and after loading a savegame."""
+
+	CELL_SIZE = 32
+
+	def __init__(self, cell_size=None):
+		"""
+		@param cell_size: int, width and height of a cell in tiles
+		"""
+		self._warehouses = {} # {warehouse: [cell, ...]}
+		self._by_owner = {} # {owner: set of warehouses}
+		self._grid = GridBuckets(cell_size or self.CELL_SIZE)
+
+	def __len__(self):
+		return len(self._warehouses)
+
+	def __contains__(self, warehouse):
+		return warehouse in self._warehouses
+
+	def add(self, warehouse):
+		position = warehouse.position
+		cells = self._grid.get_cells(position.left, position.top, position.right, position.bottom)
+		self._grid.add(warehouse, cells)
+		self._by_owner.setdefault(warehouse.owner, set()).add(warehouse)
+		self._warehouses[warehouse] = cells
+
+	def remove(self, warehouse):
+		self._grid.remove(warehouse, self._warehouses.pop(warehouse))
+		warehouses = self._by_owner[warehouse.owner]
+		warehouses.remove(warehouse)
+		if not warehouses:
+			del self._by_owner[warehouse.owner]
+
+	def get_owners(self):
+		"""Returns the players that own at least one warehouse, ordered by worldid."""
+		return sorted(self._by_owner, key=lambda owner: owner.worldid)
+
+	def get_warehouses(self, position=None, radius=None, owners=None):
+		"""Returns warehouses, optionally only those in range around position.
+		@param position: Point or Rect instance.
+		@param radius: int, maximum distance of the warehouse to position.
+		@param owners: iterable of players, list only warehouses of these players.
+		@return: list of warehouses, ordered by worldid
+		"""
+		candidates = None
+		if owners is not None:
+			candidates = set()
+			for owner in owners:
+				candidates.update(self._by_owner.get(owner, ()))
+
+		if position is not None and radius is not None:
+			if isinstance(position, (Point, Rect)):
+				if isinstance(position, Point):
+					left, right, top, bottom = position.x, position.x, position.y, position.y
+				else:
+					left, right, top, bottom = position.left, position.right, position.top, position.bottom
+				in_cells = set()
+				for warehouses in self._grid.get_buckets(left, top, right, bottom, radius):
+					in_cells.update(warehouses)
+				candidates = in_cells if candidates is None else candidates & in_cells
+			elif candidates is None:
+				candidates = self._warehouses
+			candidates = [warehouse for warehouse in candidates
+			              if warehouse.position.distance(position) <= radius]
+		elif candidates is None:
+			candidates = self._warehouses
+
+		return sorted(candidates, key=lambda warehouse: warehouse.worldid)
@@ -65,7 +65,7 @@ def usage(fd=sys.stdout):
 	fd.write("Usage: {}".format(sys.argv[0]))
 	if os.name == "posix":
 		fd.write(" [-d]")
-	fd.write(" -h host [-p port] [-s statistic_file]")
+	fd.write(" -h host [-p port] [-s statistic_file] [-S statistic_port]")
 	if os.name == "posix":
 		fd.write(" [-l logfile] [-P pidfile] ")
 	fd.write("\n")
@@ -73,12 +73,13 @@ def usage(fd=sys.stdout):
 host = None
 port = 2002
 statfile = None
+statport = None
 daemonize = False
 logfile = None
 pidfile = None
 
 try:
-	options = 'h:p:s:'
+	options = 'h:p:s:S:'
 	if os.name == "posix":
 		options += 'dl:P:'
 	opts, args = getopt.getopt(sys.argv[1:], options)
@@ -95,6 +96,8 @@ try:
 			port = int(value)
 		if key == '-s':
 			statfile = value
+		if key == '-S':
+			statport = int(value)
 		if os.name == "posix":
 			if key == '-d':
 				daemonize = True
@@ -128,7 +131,7 @@ if pidfile:
 	file(pidfile, 'w').write(str(pid))
 
 try:
-	server = Server(host, port, statfile)
+	server = Server(host, port, statfile, statport)
 	server.run()
 except network.NetworkException as e:
 	sys.stderr.write("Error: {}\n".format(e))
@@ -32,7 +32,7 @@ from horizons.extscheduler import ExtScheduler
 from horizons.scheduler import Scheduler
 from horizons.spsession import SPSession
 from horizons.util.color import Color
-from horizons.util.dbreader import DbReader
+from horizons.util.dbreader import BufferedDbWriter, DbReader
 from horizons.util.difficultysettings import DifficultySettings
 from horizons.util.savegameaccessor import SavegameAccessor
 from horizons.util.startgameoptions import StartGameOptions
@@ -77,10 +77,12 @@ def _dbreader_convert_dummy_objects():
 			return func(self, command, *mapped_args)
 		return wrapper
 
-	original = DbReader.__call__
-	DbReader.__call__ = deco(DbReader.__call__)
+	originals = {cls: cls.__call__ for cls in (DbReader, BufferedDbWriter)}
+	for cls, original in originals.items():
+		cls.__call__ = deco(original)
 	yield
-	DbReader.__call__ = original
+	for cls, original in originals.items():
+		cls.__call__ = original
 
 
 class SPTestSession(SPSession):
@@ -147,9 +149,7 @@ class SPTestSession(SPSession):
 		if seconds:
 			ticks = self.timer.get_ticks(seconds)
 
-		while ticks > 0:
-			Scheduler().tick(Scheduler().cur_tick + 1)
-			ticks -= 1
+		Scheduler().advance(ticks)
 
 
 # import helper functions here, so tests can import from tests.game directly
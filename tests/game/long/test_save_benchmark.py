@@ -0,0 +1,94 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import bz2
+import logging
+import os
+import tempfile
+import time
+from unittest import mock
+
+from horizons.util.dbreader import DbReader
+from tests.game import TEST_FIXTURES_DIR, game_test, load_session
+
+log = logging.getLogger("tests.game.long.save_benchmark")
+
+
+def _dump_savegame(filename):
+	"""Returns the rows of all tables except for the metadata, which contains timestamps."""
+	db = DbReader(filename)
+	tables = [name for (name, ) in db("SELECT name FROM sqlite_master WHERE type = 'table'")
+	          if not name.startswith('metadata')]
+	dump = {table: db("SELECT * FROM {} ORDER BY rowid".format(table)) for table in tables}
+	db.close()
+	return dump
+
+
+@game_test(manual_session=True, timeout=10 * 60)
+def test_save_benchmark():
+	"""Compares the time it takes to save the large fixture with the different db writers."""
+	fd, filename = tempfile.mkstemp()
+	os.close(fd)
+	try:
+		with open(os.path.join(TEST_FIXTURES_DIR, 'large.sqlite.bz2'), 'rb') as f:
+			data = bz2.decompress(f.read())
+		with open(filename, 'wb') as f:
+			f.write(data)
+
+		session = load_session(filename)
+		try:
+			_compare_writers(session)
+		finally:
+			session.end(keep_map=True, remove_savegame=False)
+	finally:
+		os.unlink(filename)
+
+
+def _compare_writers(session):
+	writers = [
+		('unbuffered', lambda savegame, in_memory: DbReader(savegame), False),
+		('buffered', None, False),
+		('buffered, in memory', None, True),
+	]
+	dumps = []
+	for name, writer_class, in_memory in writers:
+		fd, savegame = tempfile.mkstemp()
+		os.close(fd)
+		try:
+			session.save_in_memory = in_memory
+			start = time.time()
+			if writer_class is not None:
+				with mock.patch('horizons.session.BufferedDbWriter', writer_class):
+					assert session.save(savegamename=savegame)
+			else:
+				assert session.save(savegamename=savegame)
+			log.info('%-20s %.3fs', name, time.time() - start)
+			dumps.append(_dump_savegame(savegame))
+		finally:
+			os.unlink(savegame)
+
+	# all writers have to produce the same savegame
+	for dump in dumps[1:]:
+		assert dump == dumps[0]
+
+# this disables the test in general and only makes it being run when
+# called like this: run_tests.py -a long
+test_save_benchmark.long = True
@@ -0,0 +1,81 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+from horizons.command.building import Build
+from horizons.command.unit import CreateUnit
+from horizons.component.storagecomponent import StorageComponent
+from horizons.constants import BUILDINGS, UNITS
+from horizons.util.shapes import Point
+from horizons.util.statedigest import StateDigest
+from tests.game import game_test, new_session, saveload, settle
+
+
+def _compute_state_digest(world):
+	"""Computes the incrementally maintained world.state_digest from scratch."""
+	digest = StateDigest()
+	for island in world.islands:
+		for settlement in island.settlements:
+			digest.add(('settlement', settlement.worldid), settlement.owner.worldid)
+			inventory = settlement.get_component(StorageComponent).inventory
+			for res, amount in inventory.itercontents():
+				if amount:
+					digest.add((('settlement_inventory', settlement.worldid), res), amount)
+	for ship in world.ships:
+		digest.add(('ship', ship.worldid), (ship.owner.worldid, ship.position.x, ship.position.y))
+	return digest.value
+
+
+@game_test(manual_session=True)
+def test_state_digest_is_up_to_date():
+	session, player = new_session()
+	settlement, island = settle(session)
+	assert session.world.state_digest.value == _compute_state_digest(session.world)
+
+	Build(BUILDINGS.LUMBERJACK, 30, 30, island, settlement=settlement)(player)
+	ship = CreateUnit(player.worldid, UNITS.PLAYER_SHIP, 5, 5)(issuer=player)
+	ship.move(Point(20, 5))
+	for _ in range(20):
+		session.run(seconds=1)
+		assert session.world.state_digest.value == _compute_state_digest(session.world)
+
+	digest = session.world.state_digest.value
+	session = saveload(session)
+	assert session.world.state_digest.value == digest
+	assert session.world.state_digest.value == _compute_state_digest(session.world)
+
+	ship = session.world.ships[-1]
+	ship.remove()
+	assert session.world.state_digest.value == _compute_state_digest(session.world)
+
+	session.end()
+
+
+@game_test()
+def test_checkup_hash(session, player):
+	hash1 = session.world.get_checkup_hash()
+	assert 0 <= hash1 < 2 ** 64
+	details = session.world.get_checkup_hash_details()
+	assert 'settlements' in details and 'ships' in details
+	# the details must not advance the rng, the hash does
+	rngstate = session.random.getstate()
+	session.world.get_checkup_hash_details()
+	assert session.random.getstate() == rngstate
+	assert session.world.get_checkup_hash() != hash1
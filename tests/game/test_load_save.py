@@ -22,6 +22,8 @@
 import bz2
 import os
 import tempfile
+import threading
+from unittest import mock
 
 from horizons.command.building import Build
 from horizons.command.production import ToggleActive
@@ -29,11 +31,15 @@ from horizons.command.unit import CreateUnit
 from horizons.component.collectingcomponent import CollectingComponent
 from horizons.component.storagecomponent import StorageComponent
 from horizons.constants import BUILDINGS, GAME, PRODUCTION, RES, TIER, UNITS
+from horizons.messaging import SavegameWritten
+from horizons.util.dbreader import BufferedDbWriter
 from horizons.util.shapes import Point
 from horizons.util.worldobject import WorldObject
 from horizons.world.production.producer import Producer
 from horizons.world.units.collectors import Collector
-from tests.game import TEST_FIXTURES_DIR, game_test, load_session, new_session, saveload, settle
+from tests.game import (
+	TEST_FIXTURES_DIR, _dbreader_convert_dummy_objects, game_test, load_session, new_session, saveload,
+	settle)
 
 
 @game_test(manual_session=True)
@@ -258,3 +264,54 @@ def test_settler_level_save_load(s, p):
 
 		# should have leveled up
 		assert settler.level == level + 1
+
+
+@game_test(manual_session=True)
+def test_save_in_background():
+	"""The state at the time of saving ends up in the file, while the game continues"""
+	session, player = new_session()
+	settlement, island = settle(session)
+	settler = Build(BUILDINGS.RESIDENTIAL, 25, 22, island, settlement=settlement)(player)
+	settler_worldid = settler.worldid
+
+	messages = []
+	SavegameWritten.subscribe(messages.append)
+	fd, filename = tempfile.mkstemp()
+	os.close(fd)
+
+	# remember which threads insert how many rows
+	written_rows = {}
+	write_batch = BufferedDbWriter._write_batch
+	def record_write_batch(db, command, rows):
+		thread = threading.current_thread()
+		written_rows[thread] = written_rows.get(thread, 0) + len(rows)
+		return write_batch(db, command, rows)
+
+	with mock.patch('horizons.session.SavegameManager._write_screenshot'), \
+	     mock.patch.object(BufferedDbWriter, '_write_batch', record_write_batch):
+		with _dbreader_convert_dummy_objects():
+			assert session._do_save_in_background(filename)
+			# only one save at a time
+			assert not session._do_save_in_background(filename + '2')
+		session._background_save[0].join()
+
+	# the rows are inserted by the writer thread
+	writer_rows = written_rows.get(session._background_save[0], 0)
+	assert writer_rows > written_rows.get(threading.main_thread(), 0)
+
+	# changes after saving don't end up in the savegame
+	Build(BUILDINGS.RESIDENTIAL, 27, 22, island, settlement=settlement)(player)
+	session.run(seconds=1)
+
+	session._background_save[0].join()
+	session._check_background_save()
+	assert len(messages) == 1
+	assert messages[0].savegame == filename
+	assert messages[0].success
+	assert session._background_save is None
+
+	session.end(keep_map=True)
+	session = load_session(filename)
+	assert WorldObject.get_object_by_id(settler_worldid).id == BUILDINGS.RESIDENTIAL
+	assert session.world.get_tile(Point(27, 22)).object is None
+	session.end()
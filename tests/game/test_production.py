@@ -23,6 +23,7 @@ from horizons.command.building import Build
 from horizons.component.storagecomponent import StorageComponent
 from horizons.constants import BUILDINGS, PRODUCTION, PRODUCTIONLINES, RES
 from horizons.world.production.producer import Producer
+from horizons.world.production.production import Production
 from tests.game import game_test, settle
 
 
@@ -101,3 +102,29 @@ def test_basic_wood_production(session, player):
 	# Empty inventory, wait again
 	storage.inventory.alter(RES.BOARDS, -storage.inventory.get_limit(RES.BOARDS))
 	assert producer._get_current_state() == PRODUCTION.STATES.waiting_for_res
+
+
+@game_test()
+def test_gold_changes_dont_wake_productions(session, player):
+	"""Productions that use gold are only notified when gold becomes available"""
+	settlement, island = settle(session)
+	boat_builder = Build(BUILDINGS.BOAT_BUILDER, 35, 20, island, settlement=settlement)(player)
+	for res in (RES.BOARDS, RES.TEXTILE, RES.TOOLS):
+		settlement.get_component(StorageComponent).inventory.alter(res, -1000)
+
+	producer = boat_builder.get_component(Producer)
+	producer.add_production_by_id(PRODUCTIONLINES.HUKER)
+	production = producer._get_production(PRODUCTIONLINES.HUKER)
+	session.run(seconds=1)
+	assert production.get_state() == PRODUCTION.STATES.waiting_for_res
+
+	# e.g. taxes and running costs
+	checks = Production.inventory_check_stats['checks']
+	gold = player.get_component(StorageComponent).inventory
+	for i in range(100):
+		gold.alter(RES.GOLD, 10)
+		gold.alter(RES.GOLD, -5)
+	assert Production.inventory_check_stats['checks'] == checks
+
+	boat_builder.get_component(StorageComponent).inventory.alter(RES.BOARDS, 1)
+	assert production.get_state() == PRODUCTION.STATES.producing
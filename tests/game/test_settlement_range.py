@@ -19,10 +19,13 @@
 # 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 # ###################################################
 
+from functools import partial
 
 from horizons.command.building import Build, Tear
 from horizons.constants import BUILDINGS, RES
-from tests.game import game_test
+from horizons.world.buildability.terraincache import TerrainRequirement
+from tests.game import game_test, settle
+from tests.game.utils import create_map
 
 
 # FIXTURE is settlement with a lookout, some tents and some trees
@@ -54,3 +57,30 @@ def test_settlement_decrease(s):
 	assert new_trees == old_trees
 	assert old_trees_owned > new_trees_owned
 	assert new_tents < old_tents
+
+
+@game_test(mapgen=partial(create_map, 70, 20))
+def test_settlement_expand(s, p):
+	"""
+	Check that expanding a settlement assigns exactly the tiles within the range.
+	"""
+	settlement, island = settle(s)
+	warehouse = settlement.warehouse
+	old_range = set(settlement.ground_map)
+	storage = Build(BUILDINGS.STORAGE, 50, 30, island, settlement=settlement)(p)
+	assert storage
+	assert len(settlement.ground_map) > len(old_range)
+
+	expected = set()
+	for building in (warehouse, storage):
+		for coords in building.position.get_radius_coordinates(building.radius, include_self=True):
+			if coords in island.ground_map:
+				expected.add(coords)
+	assert set(settlement.ground_map) == expected
+	for coords, tile in island.ground_map.items():
+		assert (tile.settlement is settlement) == (coords in expected)
+
+	flat_land = island.terrain_cache.cache[TerrainRequirement.LAND][(1, 1)]
+	assert island.available_flat_land == len(flat_land.difference(expected))
+	for coords in expected:
+		assert coords not in island.available_land_cache.cache[(1, 1)]
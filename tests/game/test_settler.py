@@ -23,7 +23,8 @@ from horizons.command.building import Build
 from horizons.command.uioptions import SetSettlementUpgradePermissions
 from horizons.component.storagecomponent import StorageComponent
 from horizons.constants import BUILDINGS, GAME, RES, TIER
-from tests.game import game_test, settle
+from horizons.scheduler import Scheduler
+from tests.game import game_test, saveload, settle
 
 
 @game_test()
@@ -93,3 +94,75 @@ def test_deny_upgrade_permissions_special(s, p):
 	# Make sure forbidding upgrades works
 	SetSettlementUpgradePermissions(settlement, TIER.SAILORS, False).execute(s)
 	assert settler.level == TIER.SAILORS
+
+
+@game_test()
+def test_settler_monthly_tick(s, p):
+	"""
+	Settlers that are due in the same tick are updated in one pass that pays their taxes at once.
+	Every settler keeps its own month, the settlement has only one scheduler call.
+	"""
+	settlement, island = settle(s)
+
+	settler1 = Build(BUILDINGS.RESIDENTIAL, 22, 22, island, settlement=settlement)(p)
+	settler2 = Build(BUILDINGS.RESIDENTIAL, 24, 22, island, settlement=settlement)(p)
+	s.run(ticks=10)
+	settler3 = Build(BUILDINGS.RESIDENTIAL, 26, 22, island, settlement=settlement)(p)
+
+	manager = settlement.residence_manager
+	month = s.timer.get_ticks(GAME.INGAME_TICK_INTERVAL)
+	remaining = manager.get_remaining_ticks(settler1)
+	assert remaining == month - 10
+	assert manager.get_remaining_ticks(settler2) == remaining
+	assert manager.get_remaining_ticks(settler3) == month
+	assert len(Scheduler().get_classinst_calls(manager)) == 1
+
+	# record the income of the owner
+	inventory = p.get_component(StorageComponent).inventory
+	income = []
+	alter = inventory.alter
+	def record_alter(res, amount):
+		if res == RES.GOLD and amount > 0:
+			income.append(amount)
+		return alter(res, amount)
+	inventory.alter = record_alter
+
+	s.run(ticks=remaining - 1)
+	assert settler1.last_tax_payed == settler2.last_tax_payed == 0
+	s.run()
+	assert settler1.last_tax_payed > 0
+	assert settler2.last_tax_payed > 0
+	assert settler3.last_tax_payed == 0
+	assert income == [settler1.last_tax_payed + settler2.last_tax_payed]
+
+	s.run(ticks=9)
+	assert settler3.last_tax_payed == 0
+	s.run()
+	assert settler3.last_tax_payed > 0
+	assert income[1:] == [settler3.last_tax_payed]
+	assert manager.get_remaining_ticks(settler1) == month - 10
+	assert manager.get_remaining_ticks(settler3) == month
+	assert len(Scheduler().get_classinst_calls(manager)) == 1
+
+
+@game_test()
+def test_settler_monthly_tick_saveload(s, p):
+	settlement, island = settle(s)
+
+	Build(BUILDINGS.RESIDENTIAL, 22, 22, island, settlement=settlement)(p)
+	s.run(ticks=10)
+	Build(BUILDINGS.RESIDENTIAL, 24, 22, island, settlement=settlement)(p)
+	s.run(ticks=5)
+
+	s = saveload(s)
+
+	settlement = s.world.settlements[0]
+	settlers = settlement.buildings_by_id[BUILDINGS.RESIDENTIAL]
+	manager = settlement.residence_manager
+	remaining = sorted(manager.get_remaining_ticks(settler) for settler in settlers)
+	month = s.timer.get_ticks(GAME.INGAME_TICK_INTERVAL)
+	assert remaining == [month - 15, month - 5]
+
+	settlers[0].remove()
+	settlers[0].remove()
+	assert not Scheduler().get_classinst_calls(manager)
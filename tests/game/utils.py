@@ -34,15 +34,15 @@ from horizons.util.dbreader import DbReader
 from horizons.util.shapes import Point, Rect
 
 
-def create_map():
+def create_map(width=20, height=20):
 	"""
-	Create a map with a square island (20x20) at position (20, 20) and return the path
-	to the database file.
+	Create a map with a rectangular island (20x20 by default) at position (20, 20) and
+	return the path to the database file.
 	"""
 
 	tiles = []
-	for x, y in Rect.init_from_topleft_and_size(0, 0, 20, 20).tuple_iter():
-		if (0 < x < 20) and (0 < y < 20):
+	for x, y in Rect.init_from_topleft_and_size(0, 0, width, height).tuple_iter():
+		if (0 < x < width) and (0 < y < height):
 			ground = GROUND.DEFAULT_LAND
 		else:
 			# Add coastline at the borders.
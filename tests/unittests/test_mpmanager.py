@@ -0,0 +1,109 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+from unittest import TestCase, mock
+
+from horizons.manager import (
+	CheckupDetailsPacket, CheckupHashPacket, CommandPacket, MPCheckupHashManager, MPCommandsManager,
+	MPManager)
+
+
+class TestMPPacketmanager(TestCase):
+
+	def setUp(self):
+		self.mpmanager = mock.Mock()
+		self.mpmanager.get_player_count.return_value = 3
+		self.mpmanager.HASH_EVAL_DISTANCE = 2
+		self.manager = MPCommandsManager(self.mpmanager)
+
+	def test_tick_ready(self):
+		self.manager.add_packet(CommandPacket(5, 1, []))
+		self.manager.add_packet(CommandPacket(5, 2, []))
+		self.manager.add_packet(CommandPacket(6, 3, []))
+		self.assertFalse(self.manager.is_tick_ready(5))
+		self.manager.add_packet(CommandPacket(5, 3, []))
+		self.assertTrue(self.manager.is_tick_ready(5))
+		self.assertFalse(self.manager.is_tick_ready(6))
+
+	def test_get_packets_for_tick(self):
+		packets = [CommandPacket(5, 2, ['a']), CommandPacket(6, 2, ['b']), CommandPacket(5, 1, ['c'])]
+		for packet in packets:
+			self.manager.add_packet(packet)
+		self.assertEqual([packets[0], packets[2]],
+		                 self.manager.get_packets_for_tick(5, remove_returned_commands=False))
+		self.assertEqual([packets[0], packets[2]], self.manager.get_packets_for_tick(5))
+		self.assertEqual([], self.manager.get_packets_for_tick(5))
+		self.assertEqual([packets[1]], self.manager.get_packets_from_player(2))
+		self.assertEqual([], self.manager.get_packets_from_player(1))
+
+	def test_backlog(self):
+		for tick in range(10, 20):
+			self.manager.add_packet(CommandPacket(tick, 1, []))
+		for tick in range(10, 13):
+			self.manager.add_packet(CommandPacket(tick, 2, []))
+		self.assertEqual({1: 10, 2: 3}, self.manager.get_backlog())
+		for tick in range(10, 13):
+			self.manager.get_packets_for_tick(tick)
+		self.assertEqual({1: 7}, self.manager.get_backlog())
+
+	def test_checkup_hash_values(self):
+		manager = MPCheckupHashManager(self.mpmanager)
+		# only every HASH_EVAL_DISTANCE tick is checked
+		self.assertTrue(manager.is_tick_ready(5))
+		self.assertFalse(manager.is_tick_ready(4))
+		for player_id in (1, 2, 3):
+			manager.add_packet(CheckupHashPacket(4, player_id, {'a': 1}))
+		self.assertTrue(manager.is_tick_ready(4))
+		self.assertTrue(manager.are_checkup_hash_values_equal(4))
+		for player_id, value in ((1, 1), (2, 2)):
+			manager.add_packet(CheckupHashPacket(6, player_id, {'a': value}))
+		cb_diff = mock.Mock()
+		self.assertFalse(manager.are_checkup_hash_values_equal(6, cb_diff))
+		self.assertTrue(cb_diff.called)
+
+
+class TestMPManagerCheckupDetails(TestCase):
+
+	def setUp(self):
+		self.session = mock.Mock()
+		self.session.world.player.worldid = 1
+		self.session.world.players = [mock.Mock(), mock.Mock()]
+		self.session.world.get_checkup_hash_details.return_value = {'ships': []}
+		self.networkinterface = mock.Mock()
+		self.manager = MPManager(self.session, self.networkinterface)
+		self.manager.hash_value_diff = mock.Mock()
+
+	def test_details_sent_once(self):
+		self.manager._send_checkup_details(10)
+		self.manager._send_checkup_details(12)
+		self.assertEqual(1, self.networkinterface.send_packet.call_count)
+		packet = self.networkinterface.send_packet.call_args[0][0]
+		self.assertIsInstance(packet, CheckupDetailsPacket)
+		self.assertEqual({'ships': []}, packet.checkup_details)
+
+	def test_details_compared_when_both_available(self):
+		remote = CheckupDetailsPacket(10, 2, {'ships': [1]})
+		self.networkinterface.receive_all.return_value = [remote]
+		self.manager.can_tick(0)
+		self.assertFalse(self.manager.hash_value_diff.called)
+		self.manager._send_checkup_details(10)
+		self.manager.hash_value_diff.assert_called_once_with(
+			"local", {'ships': []}, "pl#02", {'ships': [1]})
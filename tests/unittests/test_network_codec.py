@@ -0,0 +1,110 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import pickle
+from unittest import TestCase
+
+from horizons.command.building import Tear
+from horizons.command.unit import CreateUnit
+from horizons.manager import CommandPacket
+from horizons.network import NetworkException
+from horizons.network.packets import BinaryCodec, CodecError, cmd_error, unserialize
+from horizons.network.packets.client import cmd_creategame, game_data
+
+
+class Unregistered:
+	pass
+
+
+class TestBinaryCodec(TestCase):
+
+	def _roundtrip(self, value):
+		return BinaryCodec.decode(BinaryCodec.encode(value), 'server')
+
+	def test_values(self):
+		values = [None, True, False, 0, 1, -1, 63, -64, 2 ** 70, -2 ** 70, 0.5, "", "äöü uh",
+		          b"\x00\xff", [], [1, [2, (3, 4)]], (1, "a"), {"a": 1, 2: None, (1, 2): [3]},
+		          {1, 2, 3}, frozenset([4])]
+		for value in values:
+			decoded = self._roundtrip(value)
+			self.assertEqual(value, decoded)
+			self.assertIs(type(value), type(decoded))
+
+	def test_objects(self):
+		command = CreateUnit(1, 2, 10, 20)
+		packet = CommandPacket(17, 3, [command, Tear.__new__(Tear)])
+		decoded = self._roundtrip(game_data(packet))
+		self.assertIsInstance(decoded.data, CommandPacket)
+		self.assertEqual(17, decoded.data.tick)
+		self.assertEqual(3, decoded.data.player_id)
+		self.assertIsInstance(decoded.data.commandlist[0], CreateUnit)
+		self.assertEqual(command.__dict__, decoded.data.commandlist[0].__dict__)
+		self.assertIsInstance(decoded.data.commandlist[1], Tear)
+
+	def test_unregistered_class(self):
+		self.assertRaises(CodecError, BinaryCodec.encode, Unregistered())
+		# subclasses of supported types are not supported, they would lose their type
+		self.assertRaises(CodecError, BinaryCodec.encode, type('MyInt', (int, ), {})(3))
+
+	def test_origin(self):
+		# client packets are not accepted from the server
+		data = BinaryCodec.encode(cmd_creategame("v", "a" * 32, "name", 1, "game", "map", 2))
+		self.assertRaises(CodecError, BinaryCodec.decode, data, 'server')
+		self.assertIsInstance(BinaryCodec.decode(data, 'client'), cmd_creategame)
+		# common packets are accepted from both
+		data = BinaryCodec.encode(cmd_error("error"))
+		self.assertIsInstance(BinaryCodec.decode(data, 'server'), cmd_error)
+		self.assertIsInstance(BinaryCodec.decode(data, 'client'), cmd_error)
+
+	def test_malformed(self):
+		data = BinaryCodec.encode([1, "abc", {"x": 2}])
+		for end in range(len(BinaryCodec.MAGIC), len(data)):
+			self.assertRaises(CodecError, BinaryCodec.decode, data[:end], 'server')
+		self.assertRaises(CodecError, BinaryCodec.decode, data + b"\x00", 'server')
+		# a huge length must not allocate anything
+		self.assertRaises(CodecError, BinaryCodec.decode, BinaryCodec.MAGIC + b"\x07\xff\xff\xff\xff\x0f", 'server')
+		self.assertRaises(CodecError, BinaryCodec.decode, BinaryCodec.MAGIC + b"\x3f", 'server')
+		self.assertTrue(issubclass(CodecError, NetworkException))
+
+	def test_deeply_nested(self):
+		# lists containing a single list each, until the recursion limit is hit
+		data = BinaryCodec.MAGIC + b"\x07\x01" * 100000 + b"\x00"
+		self.assertRaises(CodecError, BinaryCodec.decode, data, 'server')
+
+
+class TestPacketSerialization(TestCase):
+
+	def test_serialize(self):
+		packet = cmd_error("error", 1)
+		self.assertTrue(BinaryCodec.is_encoded(packet.serialize(BinaryCodec.NAME)))
+		self.assertEqual(pickle.dumps(packet, 2), packet.serialize())
+
+		for codec in (None, BinaryCodec.NAME):
+			decoded = unserialize(packet.serialize(codec), True, 1)
+			self.assertIsInstance(decoded, cmd_error)
+			self.assertEqual("error", decoded.errorstr)
+			self.assertEqual(1, decoded.type)
+
+	def test_fallback_to_pickle(self):
+		packet = cmd_error("error", 1)
+		packet.data = Unregistered()
+		data = packet.serialize(BinaryCodec.NAME)
+		self.assertFalse(BinaryCodec.is_encoded(data))
@@ -186,6 +186,17 @@ class TestScheduler(TestCase):
 		self.scheduler.tick(Scheduler.FIRST_TICK_ID)
 		self.assertFalse(self.callback.called)
 
+	def test_list_classinstance_callbacks_in_order_of_registration(self):
+		self.scheduler.before_ticking()
+		instance1 = Mock()
+		for run_in in (3, 1, 2, 4):
+			self.scheduler.add_new_object(self.callback, instance1, run_in=run_in)
+		callbacks = list(self.scheduler.get_classinst_calls(instance1))
+		self.scheduler.rem_object(callbacks[1])
+
+		remaining = list(self.scheduler.get_classinst_calls(instance1).values())
+		self.assertEqual([3, 2, 4], remaining)
+
 	def test_remove_all_classinstance_callbacks(self):
 		self.scheduler.before_ticking()
 		instance1 = Mock()
@@ -217,3 +228,78 @@ class TestScheduler(TestCase):
 		self.assertEqual(2, self.scheduler.get_remaining_ticks(instance, self.callback))
 		self.scheduler.tick(Scheduler.FIRST_TICK_ID + 2)
 		self.assertEqual(1, self.scheduler.get_remaining_ticks(instance, self.callback))
+
+	def test_remove_looping_call_from_within_callback(self):
+		self.scheduler.before_ticking()
+		instance = Mock()
+		def remove_self():
+			self.scheduler.rem_call(instance, self.callback)
+		self.callback.side_effect = remove_self
+
+		self.scheduler.add_new_object(self.callback, instance, run_in=1, loops=-1)
+		self.scheduler.tick(Scheduler.FIRST_TICK_ID)
+		self.callback.assert_called_once_with()
+		self.scheduler.tick(Scheduler.FIRST_TICK_ID + 1)
+		self.callback.assert_called_once_with()
+		self.assertEqual({}, self.scheduler.get_classinst_calls(instance))
+
+	def test_readd_removed_callback_object(self):
+		self.scheduler.before_ticking()
+		instance = Mock()
+		self.scheduler.add_new_object(self.callback, instance, run_in=1)
+		callback_obj = next(iter(self.scheduler.get_classinst_calls(instance)))
+		self.assertEqual(1, self.scheduler.rem_object(callback_obj))
+		callback_obj.run_in = 2
+		self.scheduler.add_object(callback_obj)
+
+		self.scheduler.tick(Scheduler.FIRST_TICK_ID)
+		self.assertFalse(self.callback.called)
+		self.scheduler.tick(Scheduler.FIRST_TICK_ID + 1)
+		self.callback.assert_called_once_with()
+
+	def test_execution_order_kept_after_compaction(self):
+		self.scheduler.before_ticking()
+		calls = []
+		instances = [Mock() for i in range(3 * Scheduler.COMPACTION_THRESHOLD)]
+		for i, instance in enumerate(instances):
+			self.scheduler.add_new_object(lambda i=i: calls.append(i), instance, run_in=1)
+		for instance in instances[::3] + instances[1::3]:
+			self.scheduler.rem_all_classinst_calls(instance)
+
+		self.scheduler.tick(Scheduler.FIRST_TICK_ID)
+		self.assertEqual(list(range(2, len(instances), 3)), calls)
+
+	def test_remove_all_calls_of_tick_drops_tick(self):
+		self.scheduler.before_ticking()
+		instance = Mock()
+		self.scheduler.add_new_object(self.callback, instance, run_in=5)
+		self.assertEqual(1, self.scheduler.rem_call(instance, self.callback))
+		self.assertFalse(self.scheduler.schedule)
+
+	def test_run_until_skips_to_scheduled_ticks(self):
+		self.scheduler.before_ticking()
+		instance = Mock()
+		self.scheduler.add_new_object(self.callback, instance, run_in=100, loops=3, loop_interval=50)
+		self.assertEqual(Scheduler.FIRST_TICK_ID + 99, self.scheduler.next_tick())
+
+		self.assertEqual(150, self.scheduler.run_until(150))
+		self.assertEqual(150, self.scheduler.cur_tick)
+		self.assertEqual(2, self.callback.call_count)
+		self.assertEqual(49, self.scheduler.get_remaining_ticks(instance, self.callback))
+
+	def test_run_until_runs_additional_jobs(self):
+		self.scheduler.before_ticking()
+		self.scheduler.add_new_object(self.callback, None, run_in=0)
+		self.scheduler.advance(10)
+		self.callback.assert_called_once_with()
+		self.assertEqual(Scheduler.FIRST_TICK_ID + 9, self.scheduler.cur_tick)
+		self.assertIsNone(self.scheduler.next_tick())
+
+	def test_tick_drops_pending_ticks_that_are_over(self):
+		self.scheduler.before_ticking()
+		self.scheduler.add_new_object(self.callback, Mock(), run_in=1, loops=-1, loop_interval=1)
+		for tick_id in range(Scheduler.FIRST_TICK_ID, Scheduler.FIRST_TICK_ID + 5000):
+			self.scheduler.tick(tick_id)
+		self.assertEqual(5000, self.callback.call_count)
+		self.assertEqual(1, len(self.scheduler.schedule))
+		self.assertEqual(1, len(self.scheduler._pending_ticks))
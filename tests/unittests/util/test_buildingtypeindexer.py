@@ -0,0 +1,71 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import unittest
+from unittest import mock
+
+from horizons.util.buildingtypeindexer import BuildingTypeIndexer
+from horizons.util.shapes import Point, Rect
+
+
+def create_building(worldid, building_id, x, y, width=2, height=2):
+	return mock.Mock(worldid=worldid, id=building_id,
+	                 position=Rect.init_from_topleft_and_size(x, y, width, height))
+
+
+class TestBuildingTypeIndexer(unittest.TestCase):
+
+	def setUp(self):
+		self.indexer = BuildingTypeIndexer(cell_size=8)
+		self.farm = create_building(5, 1, 6, 6, 4, 4) # spans four cells
+		self.farm2 = create_building(2, 1, 20, 6)
+		self.farm3 = create_building(1, 1, 6, 20)
+		self.tent = create_building(3, 2, 12, 12)
+		for building in (self.farm, self.farm2, self.farm3, self.tent):
+			self.indexer.add(building)
+
+	def test_type(self):
+		self.assertEqual(self.indexer.get_buildings_in_range(2, Point(12, 12), 0), [self.tent])
+		self.assertEqual(self.indexer.get_buildings_in_range(3, Point(12, 12), 1000), [])
+
+	def test_nearest_first(self):
+		self.assertEqual(self.indexer.get_buildings_in_range(1, Point(9, 9), 20),
+		                 [self.farm, self.farm3, self.farm2])
+		self.assertEqual(self.indexer.nearest(1, Point(22, 7), 5), self.farm2)
+		self.assertIsNone(self.indexer.nearest(1, Point(40, 40), 5))
+
+	def test_equal_distance_by_worldid(self):
+		# farm2 and farm3 are 11 tiles away from the farm
+		self.assertEqual(self.indexer.get_buildings_in_range(1, self.farm.position, 11),
+		                 [self.farm, self.farm3, self.farm2])
+
+	def test_other_cell(self):
+		# the farm overlaps cell (1, 1), which does not contain its top left corner
+		self.assertTrue(self.indexer.any_in_range(1, Point(9, 9), 0))
+		self.assertFalse(self.indexer.any_in_range(1, Point(14, 14), 3))
+
+	def test_remove(self):
+		self.indexer.remove(self.farm)
+		self.assertNotIn(self.farm, self.indexer)
+		self.assertEqual(self.indexer.get_buildings_in_range(1, Point(9, 9), 20), [self.farm3, self.farm2])
+		self.indexer.remove(self.tent)
+		self.assertEqual(self.indexer.get_buildings_in_range(2, Point(12, 12), 1000), [])
+		self.assertEqual(len(self.indexer), 2)
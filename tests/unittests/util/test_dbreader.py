@@ -0,0 +1,103 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import os
+import tempfile
+import unittest
+
+from horizons.util.dbreader import BufferedDbWriter, DbReader
+
+
+class BufferedDbWriterTest(unittest.TestCase):
+
+	def setUp(self):
+		super().setUp()
+		fd, self.filename = tempfile.mkstemp()
+		os.close(fd)
+		os.unlink(self.filename)
+
+	def tearDown(self):
+		if os.path.exists(self.filename):
+			os.unlink(self.filename)
+		super().tearDown()
+
+	def _write(self, db):
+		db.execute_script("CREATE TABLE a(x INTEGER, y TEXT); CREATE TABLE b(x INTEGER);")
+		db("BEGIN")
+		db("INSERT INTO a(x, y) VALUES(?, ?)", 1, 'one')
+		db("INSERT INTO b VALUES(?)", 10)
+		db("insert into a VALUES(?, ?)", 2, 'two')
+		db.execute_many("INSERT INTO a(x, y) VALUES(?, ?)", [(3, 'three'), (4, 'four')])
+		# reading writes the collected rows first
+		self.assertEqual([(4, )], db("SELECT count(*) FROM a"))
+		db("INSERT OR REPLACE INTO b VALUES(?)", 11)
+		db("COMMIT")
+
+	def _check(self):
+		db = DbReader(self.filename)
+		self.assertEqual([(1, 'one'), (2, 'two'), (3, 'three'), (4, 'four')],
+		                 db("SELECT x, y FROM a ORDER BY rowid"))
+		self.assertEqual([(10, ), (11, )], db("SELECT x FROM b ORDER BY rowid"))
+		db.close()
+
+	def test_write(self):
+		db = BufferedDbWriter(self.filename)
+		self._write(db)
+		db.close()
+		self._check()
+
+	def test_write_in_memory(self):
+		db = BufferedDbWriter(self.filename, in_memory=True)
+		self._write(db)
+		db.close()
+		self._check()
+
+	def test_write_in_memory_without_backup(self):
+		# sqlite3.Connection.backup is missing before python 3.7
+		db = BufferedDbWriter(self.filename, in_memory=True)
+		db.connection = ConnectionWithoutBackup(db.connection)
+		self._write(db)
+		db.execute_script("CREATE INDEX a_x ON a(x); DELETE FROM b WHERE x = 10;")
+		db.close()
+		# savegames reference rows by their rowid
+		db = DbReader(self.filename)
+		self.assertEqual([(1, 1), (2, 2), (3, 3), (4, 4)], db("SELECT rowid, x FROM a ORDER BY rowid"))
+		self.assertEqual([(2, 11)], db("SELECT rowid, x FROM b"))
+		self.assertEqual([('a_x', )], db("SELECT name FROM sqlite_master WHERE type = 'index'"))
+		db.close()
+
+	def test_close_without_writing(self):
+		db = BufferedDbWriter(self.filename, in_memory=True)
+		db.execute_script("CREATE TABLE a(x INTEGER);")
+		db("INSERT INTO a VALUES(?)", 1)
+		db.close(write=False)
+		self.assertEqual([], DbReader(self.filename)("SELECT name FROM sqlite_master"))
+
+
+class ConnectionWithoutBackup:
+	"""Wraps a sqlite3 connection, but hides its backup method."""
+	def __init__(self, connection):
+		self._connection = connection
+
+	def __getattr__(self, name):
+		if name == 'backup':
+			raise AttributeError(name)
+		return getattr(self._connection, name)
@@ -0,0 +1,60 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import unittest
+
+from horizons.util.gridbuckets import GridBuckets
+
+
+class TestGridBuckets(unittest.TestCase):
+
+	def setUp(self):
+		self.grid = GridBuckets(8)
+
+	def test_get_cells(self):
+		self.assertEqual(self.grid.get_cells(0, 0, 7, 7), [(0, 0)])
+		self.assertEqual(self.grid.get_cells(6, -1, 9, 2), [(0, -1), (0, 0), (1, -1), (1, 0)])
+		self.assertEqual(self.grid.get_cells(2.5, 2.5, 2.5, 2.5), [(0, 0)])
+
+	def test_add_remove(self):
+		cells = self.grid.get_cells(6, 6, 9, 9)
+		self.grid.add('a', cells)
+		self.grid.add('b', [(0, 0)])
+		self.assertEqual(len(self.grid), 4)
+		self.grid.remove('a', cells)
+		self.assertEqual(len(self.grid), 1)
+		self.grid.remove('b', [(0, 0)])
+		self.assertFalse(self.grid)
+
+	def test_get_buckets(self):
+		for cell_x in range(6):
+			for cell_y in range(6):
+				self.grid.add((cell_x, cell_y), [(cell_x, cell_y)])
+		self.assertEqual(self.grid.get_buckets(3, 3, 3, 3, 0), [{(0, 0)}])
+		buckets = self.grid.get_buckets(20, 12, 20, 12, 4)
+		self.assertEqual(sorted(obj for bucket in buckets for obj in bucket),
+		                 [(2, 1), (2, 2), (3, 1), (3, 2)])
+
+	def test_get_buckets_huge_area(self):
+		self.grid.add('a', [(0, 0)])
+		self.grid.add('b', [(-100, 100)])
+		buckets = self.grid.get_buckets(0, 0, 0, 0, 1000)
+		self.assertEqual(sorted(obj for bucket in buckets for obj in bucket), ['a', 'b'])
@@ -0,0 +1,80 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import unittest
+
+from horizons.util.pathfinding.pathcache import PathCache
+from horizons.util.pathfinding.pathfinding import FindPath
+from horizons.util.shapes import Point, Rect
+
+
+class TestPathCache(unittest.TestCase):
+
+	def setUp(self):
+		# a road along the x axis with a branch going down at x = 5
+		self.nodes = {(x, 0): 1.0 for x in range(10)}
+		self.nodes.update({(5, y): 1.0 for y in range(1, 6)})
+		self.cache = PathCache(self.nodes, size=2)
+
+	def test_same_paths_as_findpath(self):
+		for source, destination in ((Point(0, 0), Point(9, 0)),
+		                            (Point(0, 0), Rect(Point(5, 5), 1, 1)),
+		                            (Point(9, 0), Point(20, 20))):
+			expected = FindPath()(source, destination, self.nodes)
+			self.assertEqual(expected, self.cache.find_path(source, destination))
+			self.assertEqual(expected, self.cache.find_path(source, destination))
+
+	def test_hits_and_misses(self):
+		self.cache.find_path(Point(0, 0), Point(9, 0))
+		self.cache.find_path(Point(0, 0), Point(9, 0))
+		# equal shapes are found, even if they are different objects
+		self.cache.find_path(Point(0, 0), Point(9, 0))
+		self.assertEqual((1, 2), (self.cache.misses, self.cache.hits))
+
+	def test_returns_copies(self):
+		path = self.cache.find_path(Point(0, 0), Point(9, 0))
+		del path[1:]
+		self.assertEqual(10, len(self.cache.find_path(Point(0, 0), Point(9, 0))))
+
+	def test_mutated_shape(self):
+		source = Point(0, 0)
+		self.cache.find_path(source, Point(9, 0))
+		source.x = 8
+		self.assertEqual([(8, 0), (9, 0)], self.cache.find_path(source, Point(9, 0)))
+
+	def test_lru_eviction(self):
+		self.cache.find_path(Point(0, 0), Point(9, 0))
+		self.cache.find_path(Point(0, 0), Point(5, 5))
+		self.cache.find_path(Point(0, 0), Point(9, 0))
+		self.cache.find_path(Point(1, 0), Point(5, 5))
+		self.assertEqual(2, len(self.cache))
+		self.cache.find_path(Point(0, 0), Point(9, 0))
+		self.assertEqual(2, self.cache.hits)
+		self.cache.find_path(Point(0, 0), Point(5, 5))
+		self.assertEqual(4, self.cache.misses)
+
+	def test_invalidate(self):
+		self.assertEqual(None, self.cache.find_path(Point(0, 0), Point(5, 7)))
+		self.nodes[(5, 6)] = 1.0
+		self.cache.invalidate()
+		self.assertEqual(1, self.cache.version)
+		self.assertEqual(0, len(self.cache))
+		self.assertEqual((5, 6), self.cache.find_path(Point(0, 0), Point(5, 7))[-2])
@@ -0,0 +1,65 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import random
+import unittest
+
+from horizons.util.pathfinding.pathfinding import FindPath
+from horizons.util.pathfinding.pathgrid import GridFindPath, PathGrid
+from horizons.util.shapes import Point, Rect
+
+
+class TestPathGrid(unittest.TestCase):
+
+	def setUp(self):
+		rng = random.Random(42)
+		self.nodes = {(x, y): 1.0 for x in range(-5, 40) for y in range(3, 30) if rng.random() < 0.75}
+		self.grid = PathGrid(self.nodes)
+		self.blocked = {coords: None for coords in self.nodes if rng.random() < 0.05}
+		self.rng = rng
+
+	def _random_point(self):
+		return Point(*self.rng.choice(sorted(self.nodes)))
+
+	def test_same_paths_as_findpath(self):
+		for i in range(200):
+			source = self._random_point()
+			destination = self._random_point()
+			if i % 3 == 0:
+				destination = Rect(destination, 2, 1)
+			for diagonal in (True, False):
+				for make_target_walkable in (True, False):
+					args = (self.blocked, diagonal, make_target_walkable)
+					expected = FindPath()(source, destination, self.nodes, *args)
+					path = GridFindPath()(source, destination, self.grid, *args)
+					self.assertEqual(expected, path)
+
+	def test_destination_outside_of_grid(self):
+		source = Point(*min(self.nodes))
+		destination = Rect(Point(40, 10), 2, 2)
+		expected = FindPath()(source, destination, self.nodes)
+		self.assertEqual(expected, GridFindPath()(source, destination, self.grid))
+
+	def test_index_order_matches_tuple_order(self):
+		coords = sorted(self.nodes)
+		indices = [self.grid.get_index(x, y) for (x, y) in coords]
+		self.assertEqual(sorted(indices), indices)
+		self.assertEqual(coords, [self.grid.get_coords(index) for index in indices])
@@ -0,0 +1,84 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import random
+import unittest
+
+from horizons.util.pathfinding.pathfinding import FindPath
+from horizons.util.pathfinding.pathnodes import IslandPathNodes
+from horizons.util.shapes import Point, Rect
+
+
+class DummyRoad:
+	def __init__(self, x, y):
+		self.position = Rect.init_from_topleft_and_size(x, y, 1, 1)
+
+
+class TestRoadConnectivity(unittest.TestCase):
+
+	def setUp(self):
+		self.rng = random.Random(3)
+		self.path_nodes = IslandPathNodes([]) # no walkable nodes, only roads are used here
+		self.roads = {}
+
+	def _build_roads(self, count):
+		for _ in range(count):
+			coords = (self.rng.randint(0, 19), self.rng.randint(0, 19))
+			if coords not in self.roads:
+				self.roads[coords] = DummyRoad(*coords)
+				self.path_nodes.register_road(self.roads[coords])
+
+	def _remove_roads(self, count):
+		for coords in self.rng.sample(sorted(self.roads), count):
+			self.path_nodes.unregister_road(self.roads.pop(coords))
+
+	def _random_shape(self):
+		return Rect.init_from_topleft_and_size(self.rng.randint(-1, 20), self.rng.randint(-1, 20),
+		                                       self.rng.randint(1, 3), self.rng.randint(1, 3))
+
+	def _check_same_as_findpath(self):
+		for _ in range(200):
+			source, destination = self._random_shape(), self._random_shape()
+			path = FindPath()(source, destination, self.path_nodes.road_nodes)
+			self.assertEqual(path is not None, self.path_nodes.is_road_connected(source, destination))
+
+	def test_same_as_findpath(self):
+		self._build_roads(150)
+		self._check_same_as_findpath()
+		self._build_roads(100)
+		self._check_same_as_findpath()
+		self._remove_roads(120)
+		self._check_same_as_findpath()
+
+	def test_path_cache_skips_unconnected(self):
+		self._build_roads(150)
+		self._remove_roads(50)
+		for _ in range(100):
+			source, destination = self._random_shape(), self._random_shape()
+			path = FindPath()(source, destination, self.path_nodes.road_nodes)
+			self.assertEqual(path, self.path_nodes.road_path_cache.find_path(source, destination))
+
+	def test_shapes_that_touch(self):
+		self.assertTrue(self.path_nodes.is_road_connected(Point(0, 0), Point(0, 1)))
+		self.assertTrue(self.path_nodes.is_road_connected(Rect.init_from_topleft_and_size(0, 0, 2, 2), Point(1, 1)))
+		self.assertFalse(self.path_nodes.is_road_connected(Point(0, 0), Point(1, 1)))
+		self.path_nodes.register_road(DummyRoad(1, 0))
+		self.assertTrue(self.path_nodes.is_road_connected(Point(0, 0), Point(1, 1)))
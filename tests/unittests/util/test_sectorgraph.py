@@ -0,0 +1,100 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import random
+import unittest
+from unittest import mock
+
+from horizons.util.pathfinding.pathfinding import FindPath
+from horizons.util.pathfinding.pathgrid import GridFindPath, PathGrid
+from horizons.util.pathfinding.sectorgraph import HierarchicalFindPath, SectorGraph
+from horizons.util.shapes import Circle, Point
+
+
+class TestSectorGraph(unittest.TestCase):
+
+	def setUp(self):
+		self.rng = random.Random(23)
+		# open water with a few rectangular islands
+		self.nodes = {(x, y): 1.0 for x in range(100) for y in range(80)}
+		for i in range(12):
+			left, top = self.rng.randrange(90), self.rng.randrange(70)
+			for x in range(left, left + self.rng.randrange(3, 15)):
+				for y in range(top, top + self.rng.randrange(3, 15)):
+					self.nodes.pop((x, y), None)
+		self.sectors = SectorGraph(PathGrid(self.nodes), sector_size=10)
+
+	def _random_point(self):
+		return Point(*self.rng.choice(sorted(self.nodes)))
+
+	def _assert_valid_path(self, path, source, destination, blocked):
+		self.assertEqual(source.to_tuple(), path[0])
+		self.assertIn(path[-1], destination.get_coordinates())
+		for (x1, y1), (x2, y2) in zip(path, path[1:]):
+			self.assertEqual(1, max(abs(x1 - x2), abs(y1 - y2)))
+		for coords in path:
+			self.assertIn(coords, self.nodes)
+			self.assertNotIn(coords, blocked)
+
+	def test_paths_are_valid_and_short(self):
+		blocked = {coords: None for coords in self.nodes if self.rng.random() < 0.02}
+		for i in range(50):
+			source = self._random_point()
+			destination = Circle(self._random_point(), 2)
+			if source.to_tuple() in blocked:
+				continue
+			expected = FindPath()(source, destination, self.nodes, blocked, True, False)
+			path = HierarchicalFindPath()(source, destination, self.sectors, blocked, True, False)
+			if expected is None:
+				self.assertIsNone(path)
+				continue
+			self._assert_valid_path(path, source, destination, blocked)
+			self.assertLessEqual(len(path), 1.5 * len(expected) + 2)
+
+	def test_short_paths_are_identical(self):
+		source = Point(0, 0)
+		destination = Point(5, 7)
+		self.assertEqual(FindPath()(source, destination, self.nodes, {}, True, False),
+		                 HierarchicalFindPath()(source, destination, self.sectors, {}, True, False))
+
+	def test_blocked_source_uses_sector_distances(self):
+		# the tile of a moving ship is blocked by the ship itself
+		source = Point(1, 1)
+		destination = Point(95, 75)
+		blocked = {source.to_tuple(): None}
+		calls = []
+		def find_path(*args):
+			calls.append(args)
+			return GridFindPath()(*args)
+		with mock.patch('horizons.util.pathfinding.sectorgraph.GridFindPath', return_value=find_path):
+			path = HierarchicalFindPath()(source, destination, self.sectors, blocked, True, False)
+		self.assertEqual(source.to_tuple(), path[0])
+		self.assertEqual(destination.to_tuple(), path[-1])
+		# only the part from the last entrance to the destination is searched on the grid
+		self.assertEqual(1, len(calls))
+
+	def test_entrances_connect_neighboring_sectors(self):
+		for entrance, transitions in self.sectors.transitions.items():
+			sector = self.sectors.get_sector(*self.sectors.grid.get_coords(entrance))
+			for other, cost in transitions:
+				other_sector = self.sectors.get_sector(*self.sectors.grid.get_coords(other))
+				self.assertNotEqual(sector, other_sector)
+				self.assertIn(other, self.sectors.entrances[other_sector])
@@ -46,6 +46,27 @@ class TestPathfinding(unittest.TestCase):
 		self.assertTrue(r1.intersects(r2))
 		self.assertFalse(r1.intersects(r3))
 
+	def testRectRadiusCoordinates(self):
+		for (width, height, radius) in ((1, 1, 0), (1, 1, 3), (2, 3, 5), (3, 3, 12)):
+			r = Rect.init_from_topleft_and_size(7, -4, width, height)
+			expected = {(x, y) for x in range(r.left - radius, r.right + radius + 1)
+			            for y in range(r.top - radius, r.bottom + radius + 1)
+			            if r.distance((x, y)) <= radius}
+			coords = r.get_radius_coordinates(radius, include_self=True)
+			self.assertEqual(len(coords), len(expected))
+			self.assertEqual(set(coords), expected)
+			self.assertEqual(set(r.get_radius_coordinates(radius)), expected.difference(r.tuple_iter()))
+
+		offsets = Rect.get_radius_offsets(2, 3, 5)
+		self.assertIs(Rect.get_radius_offsets(2, 3, 5), offsets)
+		self.assertIsNot(Rect.get_radius_offsets(2, 3, 5, include_self=True), offsets)
+
+	def testRectRadiusValues(self):
+		r = Rect.init_from_topleft_and_size(0, 0, 2, 2)
+		mapping = {(-1, 0): 'a', (1, 1): 'b', (5, 5): 'c'}
+		self.assertEqual(r.get_radius_values(mapping, 1), ['a'])
+		self.assertEqual(sorted(r.get_radius_values(mapping, 1, include_self=True)), ['a', 'b'])
+
 	def testCircle(self):
 		c1 = Circle(Point(0, 0), 1)
 		c2 = Circle(Point(0, 0), 2)
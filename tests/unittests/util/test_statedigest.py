@@ -0,0 +1,118 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import random
+from unittest import TestCase
+
+from horizons.util.statedigest import StateDigest
+from horizons.world.storage import GlobalLimitStorage, PositiveSizedSlotStorage
+
+
+class TestStateDigest(TestCase):
+
+	def test_empty(self):
+		self.assertEqual(StateDigest().value, 0)
+
+	def test_order_independent(self):
+		d1 = StateDigest()
+		d1.add('a', 1)
+		d1.add(('ship', 3), (1, 4, 5))
+		d2 = StateDigest()
+		d2.add(('ship', 3), (1, 4, 5))
+		d2.add('a', 1)
+		self.assertEqual(d1.value, d2.value)
+		self.assertNotEqual(d1.value, 0)
+
+	def test_update(self):
+		d1 = StateDigest()
+		d1.add('a', 1)
+		d1.add('b', 2)
+		d1.update('a', 1, 7)
+		d2 = StateDigest()
+		d2.add('b', 2)
+		d2.add('a', 7)
+		self.assertEqual(d1.value, d2.value)
+
+		d1.remove('a', 7)
+		d1.remove('b', 2)
+		self.assertEqual(d1.value, 0)
+
+	def test_different_values(self):
+		d1 = StateDigest()
+		d1.add('a', 1)
+		d2 = StateDigest()
+		d2.add('a', 2)
+		self.assertNotEqual(d1.value, d2.value)
+
+	def test_extra_entries(self):
+		d = StateDigest()
+		d.add('a', 1)
+		value = d.get_value([('b', 2)])
+		self.assertEqual(d.get_value(), d.value)
+		d.add('b', 2)
+		self.assertEqual(value, d.value)
+		self.assertLess(value, 2 ** 64)
+
+
+class TestStorageStateDigest(TestCase):
+
+	def _get_expected(self, storage, key):
+		digest = StateDigest()
+		for res, amount in storage.itercontents():
+			if amount:
+				digest.add((key, res), amount)
+		return digest.value
+
+	def test_tracks_changes(self):
+		rng = random.Random(42)
+		digest = StateDigest()
+		storage = PositiveSizedSlotStorage(30)
+		storage.alter(1, 10)
+		storage.set_state_digest(digest, 'settlement')
+		self.assertEqual(digest.value, self._get_expected(storage, 'settlement'))
+
+		for _ in range(200):
+			storage.alter(rng.randint(1, 6), rng.randint(-20, 20))
+			self.assertEqual(digest.value, self._get_expected(storage, 'settlement'))
+
+		storage.reset(2)
+		self.assertEqual(digest.value, self._get_expected(storage, 'settlement'))
+		storage.reset_all()
+		self.assertEqual(digest.value, 0)
+
+	def test_adjust_limit(self):
+		digest = StateDigest()
+		storage = GlobalLimitStorage(20)
+		storage.set_state_digest(digest, 'x')
+		storage.alter(1, 15)
+		storage.alter(2, 5)
+		storage.adjust_limit(-10)
+		self.assertEqual(digest.value, self._get_expected(storage, 'x'))
+
+	def test_detach(self):
+		digest = StateDigest()
+		storage = PositiveSizedSlotStorage(30)
+		storage.set_state_digest(digest, 'x')
+		storage.alter(1, 10)
+		storage.set_state_digest(None, None)
+		self.assertEqual(digest.value, 0)
+		storage.alter(1, 10)
+		self.assertEqual(digest.value, 0)
@@ -0,0 +1,63 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import unittest
+from unittest import mock
+
+from horizons.util.shapes import Point
+from horizons.util.unitindexer import UnitIndexer
+
+
+class TestUnitIndexer(unittest.TestCase):
+
+	def setUp(self):
+		self.indexer = UnitIndexer(cell_size=8)
+		self.unit1 = mock.Mock(position=Point(20, 20))
+		self.unit2 = mock.Mock(position=Point(3, 3))
+		self.unit3 = mock.Mock(position=Point(23, 17))
+		for unit in (self.unit1, self.unit2, self.unit3):
+			self.indexer.add(unit)
+
+	def test_in_range(self):
+		self.assertEqual(self.indexer.get_units_in_range(Point(20, 20), 0), [self.unit1])
+		# circle, not square: (23, 17) is 4.24 tiles away
+		self.assertEqual(self.indexer.get_units_in_range(Point(20, 20), 4), [self.unit1])
+		self.assertEqual(self.indexer.get_units_in_range(Point(20, 20), 5), [self.unit1, self.unit3])
+		self.assertEqual(self.indexer.get_units_in_range(Point(-50, -50), 1), [])
+
+	def test_order_of_adding(self):
+		self.assertEqual(self.indexer.get_units_in_range(Point(0, 0), 1000),
+		                 [self.unit1, self.unit2, self.unit3])
+
+	def test_update(self):
+		self.unit2.position = Point(21, 21)
+		self.indexer.update(self.unit2)
+		self.assertEqual(self.indexer.get_units_in_range(Point(20, 20), 2), [self.unit1, self.unit2])
+		self.assertEqual(self.indexer.get_units_in_range(Point(3, 3), 2), [])
+
+	def test_remove(self):
+		self.indexer.remove(self.unit1)
+		self.assertNotIn(self.unit1, self.indexer)
+		self.assertEqual(self.indexer.get_units_in_range(Point(20, 20), 5), [self.unit3])
+		self.indexer.remove(self.unit2)
+		self.indexer.remove(self.unit3)
+		self.assertEqual(len(self.indexer), 0)
+		self.assertFalse(self.indexer._grid)
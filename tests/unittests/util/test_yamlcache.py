@@ -0,0 +1,83 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import os
+import tempfile
+import unittest
+
+from horizons.constants import RES
+from horizons.util.yamlcache import YamlCache
+from horizons.util.yamlcachestorage import YamlCacheStorage
+
+
+class YamlCacheTest(unittest.TestCase):
+
+	def setUp(self):
+		super().setUp()
+		self.tmp_dir = tempfile.TemporaryDirectory()
+		self.yaml_file = os.path.join(self.tmp_dir.name, 'data.yaml')
+		self.cache_file = os.path.join(self.tmp_dir.name, 'yamldata.cache')
+		self._write('resource: RES.GOLD\n')
+		self._reopen_cache()
+		# don't let get_file schedule syncs
+		YamlCache.sync_scheduled = True
+		YamlCache.stat_hits = YamlCache.stat_digest_hits = YamlCache.stat_misses = 0
+
+	def tearDown(self):
+		YamlCache.cache = None
+		YamlCache.sync_scheduled = False
+		self.tmp_dir.cleanup()
+		super().tearDown()
+
+	def _write(self, content):
+		with open(self.yaml_file, 'w') as f:
+			f.write(content)
+
+	def _reopen_cache(self):
+		if YamlCache.cache is not None:
+			YamlCache.cache.sync()
+		YamlCache.cache = YamlCacheStorage.open(self.cache_file)
+
+	def test_hit_after_reopen(self):
+		self.assertEqual({'resource': RES.GOLD}, YamlCache.get_file(self.yaml_file, game_data=True))
+		self._reopen_cache()
+		self.assertEqual({'resource': RES.GOLD}, YamlCache.get_file(self.yaml_file, game_data=True))
+		self.assertEqual((1, 0, 1), YamlCache.get_statistics())
+
+	def test_digest_hit(self):
+		YamlCache.get_file(self.yaml_file)
+		stat = os.stat(self.yaml_file)
+		os.utime(self.yaml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+		self.assertEqual({'resource': 'RES.GOLD'}, YamlCache.get_file(self.yaml_file))
+		self.assertEqual((0, 1, 1), YamlCache.get_statistics())
+
+	def test_changed_file(self):
+		YamlCache.get_file(self.yaml_file)
+		self._write('resource: RES.FOOD\n')
+		stat = os.stat(self.yaml_file)
+		os.utime(self.yaml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+		self.assertEqual({'resource': 'RES.FOOD'}, YamlCache.get_file(self.yaml_file))
+		self.assertEqual((0, 0, 2), YamlCache.get_statistics())
+
+	def test_game_data_flag(self):
+		YamlCache.get_file(self.yaml_file)
+		self.assertEqual({'resource': RES.GOLD}, YamlCache.get_file(self.yaml_file, game_data=True))
+		self.assertEqual((0, 0, 2), YamlCache.get_statistics())
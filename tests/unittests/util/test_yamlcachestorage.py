@@ -43,3 +43,15 @@ class YamlCacheStorageTest(unittest.TestCase):
 
 		new_cache = YamlCacheStorage.open(self.tmp_file.name)
 		self.assertEqual(new_cache['foo'], 'bar')
+
+	def test_meta_and_lazy_loading(self):
+		cache = YamlCacheStorage(self.tmp_file.name)
+		cache.set('foo', {'bar': [1, 2]}, meta=('digest', 3))
+		cache.sync()
+
+		new_cache = YamlCacheStorage.open(self.tmp_file.name)
+		self.assertEqual(new_cache.get_meta('foo'), ('digest', 3))
+		self.assertEqual(new_cache.get_meta('baz'), None)
+		self.assertNotIn('foo', new_cache._loaded)
+		self.assertEqual(new_cache['foo'], {'bar': [1, 2]})
+		self.assertIn('foo', new_cache._loaded)
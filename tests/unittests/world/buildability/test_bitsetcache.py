@@ -0,0 +1,89 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import random
+
+from horizons.world.buildability.binarycache import BinaryBuildabilityCache
+from horizons.world.buildability.bitsetcache import BitsetBuildabilityCache
+from horizons.world.buildability.terraincache import TerrainBuildabilityCache
+from tests.unittests import TestCase
+
+
+class MockTerrainBuildabilityCache:
+	sizes = TerrainBuildabilityCache.sizes
+
+	def __init__(self, land_or_coast):
+		self.land_or_coast = land_or_coast
+
+class TestBitsetBuildabilityCache(TestCase):
+	def setUp(self):
+		super(TestBitsetBuildabilityCache, self).setUp()
+		coords_set = set()
+		for x in range(3, 23):
+			for y in range(-2, 18):
+				coords_set.add((x, y))
+		self.terrain_cache = MockTerrainBuildabilityCache(coords_set)
+		self.buildability_cache = BitsetBuildabilityCache(self.terrain_cache)
+
+	def assert_layers_equal(self, expected_cache):
+		for size, expected in expected_cache.cache.items():
+			layer = self.buildability_cache.cache[size]
+			self.assertEqual(set(layer), set(expected), size)
+			self.assertEqual(len(layer), len(set(expected)))
+
+	def test_rectangle(self):
+		bc = self.buildability_cache
+		bc.add_area([(x, y) for x in range(5, 10) for y in range(0, 3)])
+		self.assertEqual(set(bc.cache[(1, 1)]), {(x, y) for x in range(5, 10) for y in range(0, 3)})
+		self.assertEqual(set(bc.cache[(3, 3)]), {(5, 0), (6, 0), (7, 0)})
+		self.assertEqual(set(bc.cache[(4, 2)]), {(5, 0), (6, 0), (5, 1), (6, 1)})
+		self.assertEqual(set(bc.cache[(2, 4)]), set())
+		self.assertTrue((7, 0) in bc.cache[(3, 3)])
+		self.assertFalse((8, 0) in bc.cache[(3, 3)])
+		self.assertFalse((2, 0) in bc.cache[(1, 1)])
+
+		bc.remove_area([(7, 1)])
+		self.assertEqual(set(bc.cache[(3, 3)]), set())
+		self.assertEqual(set(bc.cache[(2, 2)]), {(5, 0), (5, 1), (8, 0), (8, 1)})
+
+	def test_intersection(self):
+		bc = self.buildability_cache
+		bc.add_area([(x, y) for x in range(5, 10) for y in range(0, 3)])
+		self.assertEqual(bc.cache[(2, 2)].intersection({(5, 0), (9, 0), (1, 1)}), {(5, 0)})
+		self.assertEqual({(5, 0), (9, 0), (1, 1)}.intersection(bc.cache[(2, 2)]), {(5, 0)})
+		self.assertEqual(bc.cache[(2, 2)].intersection([(5, 0), (6, 0)], [(6, 0)]), {(6, 0)})
+
+	def test_matches_binary_cache(self):
+		rng = random.Random(42)
+		expected_cache = BinaryBuildabilityCache(self.terrain_cache)
+		coords_list = sorted(self.terrain_cache.land_or_coast)
+		for _ in range(30):
+			present = set(expected_cache.coords_set)
+			if present and rng.random() < 0.4:
+				changed = rng.sample(sorted(present), rng.randint(1, min(len(present), 40)))
+				expected_cache.remove_area(changed)
+				self.buildability_cache.remove_area(changed)
+			else:
+				absent = [coords for coords in coords_list if coords not in present]
+				changed = rng.sample(absent, rng.randint(1, min(len(absent), 80)))
+				expected_cache.add_area(changed)
+				self.buildability_cache.add_area(changed)
+			self.assert_layers_equal(expected_cache)
@@ -0,0 +1,49 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+from unittest import TestCase
+
+from horizons.world.jobboard import JobBoard
+from horizons.world.units.collectors.collector import Job
+
+
+class TestJobBoard(TestCase):
+
+	def test_reserve_and_release(self):
+		board = JobBoard()
+		home1, home2 = object(), object()
+		reslist1 = (Job.ResListEntry(1, 4, False), Job.ResListEntry(2, 3, True))
+		reslist2 = (Job.ResListEntry(1, 2, False), )
+		board.reserve_delivery(home1, reslist1)
+		board.reserve_delivery(home1, reslist2)
+		board.reserve_delivery(home2, reslist2)
+		self.assertEqual(board.get_reserved_delivery(home1, 1), 6)
+		self.assertEqual(board.get_reserved_delivery(home1, 2), 3)
+		self.assertEqual(board.get_reserved_delivery(home1, 3), 0)
+		self.assertEqual(board.get_reserved_delivery(home2, 1), 2)
+
+		board.release_delivery(home1, reslist1)
+		self.assertEqual(board.get_reserved_delivery(home1, 1), 2)
+		self.assertEqual(board.get_reserved_delivery(home1, 2), 0)
+
+		board.release_delivery(home1, reslist2)
+		board.release_delivery(home2, reslist2)
+		self.assertEqual(board._deliveries, {})
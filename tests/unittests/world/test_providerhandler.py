@@ -0,0 +1,67 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import random
+from unittest import TestCase
+
+from horizons.util.shapes import RadiusRect, Rect
+from horizons.world.providerhandler import ProviderHandler
+
+
+class DummyProvider:
+	def __init__(self, position, provided_resources):
+		self.position = position
+		self.provided_resources = provided_resources
+
+
+class TestProviderHandler(TestCase):
+
+	def setUp(self):
+		self.rng = random.Random(7)
+		self.handler = ProviderHandler()
+		for _ in range(200):
+			position = Rect.init_from_topleft_and_size(self.rng.randint(-10, 60), self.rng.randint(0, 50),
+			                                           self.rng.randint(1, 3), self.rng.randint(1, 3))
+			resources = self.rng.sample([1, 2, 3, 4], self.rng.randint(0, 2))
+			self.handler.append(DummyProvider(position, resources))
+
+	def _expected(self, radiusrect, reslist):
+		return [provider for provider in self.handler
+		        if (not reslist or set(reslist) & set(provider.provided_resources)) and
+		           provider.position.distance(radiusrect.center) <= radiusrect.radius]
+
+	def _check_queries(self):
+		for _ in range(100):
+			center = Rect.init_from_topleft_and_size(self.rng.randint(-20, 70), self.rng.randint(-10, 60),
+			                                         self.rng.randint(1, 3), self.rng.randint(1, 3))
+			radiusrect = RadiusRect(center, self.rng.choice((0, 2, 5.5, 12, 30)))
+			reslist = self.rng.choice((None, [1], [2, 3], [4, 3, 1]))
+			self.assertEqual(self._expected(radiusrect, reslist),
+			                 self.handler.get_providers_in_range(radiusrect, reslist))
+
+	def test_same_as_linear_scan(self):
+		self._check_queries()
+
+	def test_removing_providers(self):
+		for provider in list(self.handler)[::2]:
+			self.handler.remove(provider)
+		self.assertEqual(100, len(self.handler))
+		self._check_queries()
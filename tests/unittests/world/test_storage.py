@@ -72,6 +72,62 @@ class TestGenericStorage(TestCase):
 		self.assertEqual(s[1], 5)
 		self.assertEqual(s[2], 0)
 
+	def test_res_listener(self):
+		s = GenericStorage()
+		available = []
+		s.add_res_listener(available.append)
+		s.alter(1, 5)
+		s.alter(1, 2) # not empty before, no notification
+		s.alter(2, 0)
+		s.alter(1, -7)
+		s.alter(1, 1)
+		self.assertEqual(available, [1, 1])
+
+		s.notify_res_available(1)
+		s.notify_res_available(3) # not there
+		self.assertEqual(available, [1, 1, 1])
+
+		s.discard_res_listener(available.append)
+		s.discard_res_listener(available.append)
+		s.alter(2, 1)
+		self.assertEqual(available, [1, 1, 1])
+
+	def test_res_listener_threshold(self):
+		s = GenericStorage()
+		reached = []
+		s.add_res_listener(reached.append, res=1, threshold=10)
+		s.alter(2, 20) # other res
+		s.alter(1, 9)
+		self.assertEqual(reached, [])
+		s.alter(1, 1)
+		s.alter(1, 5) # above before
+		self.assertEqual(reached, [1])
+		s.alter(1, -10)
+		s.alter(1, 20)
+		self.assertEqual(reached, [1, 1])
+
+		s.discard_res_listener(reached.append) # listens to res 1, not to all
+		s.alter(1, -30)
+		s.alter(1, 30)
+		self.assertEqual(reached, [1, 1, 1])
+		s.discard_res_listener(reached.append, res=1)
+		s.alter(1, -30)
+		s.alter(1, 30)
+		self.assertEqual(reached, [1, 1, 1])
+
+	def test_res_listener_removes_other(self):
+		s = GenericStorage()
+		calls = []
+		def first(res):
+			calls.append('first')
+			s.discard_res_listener(second)
+		def second(res):
+			calls.append('second')
+		s.add_res_listener(first)
+		s.add_res_listener(second)
+		s.alter(1, 1)
+		self.assertEqual(calls, ['first'])
+
 
 class TestSpecializedStorages(TestCase):
 
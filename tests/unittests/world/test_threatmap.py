@@ -0,0 +1,62 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import unittest
+from unittest import mock
+
+from horizons.util.shapes import Point
+from horizons.world.threatmap import ThreatMap
+
+
+class TestThreatMap(unittest.TestCase):
+
+	def setUp(self):
+		self.threat_map = ThreatMap(cell_size=8)
+		self.ship = mock.Mock(position=Point(10, 10), owner='a')
+		self.soldier = mock.Mock(position=Point(12, 10), owner='b')
+		self.pirate = mock.Mock(position=Point(11, 11), owner=None)
+		for unit in (self.ship, self.soldier, self.pirate):
+			self.threat_map.add(unit)
+
+	def test_owners(self):
+		self.assertEqual(self.threat_map.get_units_in_range(Point(10, 10), 5, ['b']), [self.soldier])
+		self.assertEqual(self.threat_map.get_units_in_range(Point(10, 10), 5, ['a', None]),
+		                 [self.ship, self.pirate])
+		self.assertEqual(self.threat_map.get_units_in_range(Point(10, 10), 5, []), [])
+		self.assertEqual(self.threat_map.get_units_in_range(Point(10, 10), 5, ['c']), [])
+
+	def test_range(self):
+		self.assertEqual(self.threat_map.get_units_in_range(Point(10, 10), 1, ['a', 'b']), [self.ship])
+
+	def test_update(self):
+		self.soldier.position = Point(40, 40)
+		self.threat_map.update(self.soldier)
+		self.assertEqual(self.threat_map.get_units_in_range(Point(10, 10), 5, ['b']), [])
+		self.assertEqual(self.threat_map.get_units_in_range(Point(40, 40), 0, ['b']), [self.soldier])
+
+	def test_remove(self):
+		self.threat_map.remove(self.soldier)
+		self.assertNotIn(self.soldier, self.threat_map)
+		self.assertEqual(len(self.threat_map), 2)
+		self.assertNotIn('b', self.threat_map.get_owners())
+		self.threat_map.remove(self.ship)
+		self.threat_map.remove(self.pirate)
+		self.assertEqual(self.threat_map.get_owners(), [])
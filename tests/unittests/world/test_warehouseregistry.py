@@ -0,0 +1,87 @@
+# ###################################################
+# Copyright (C) 2008-2017 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import random
+from unittest import TestCase
+
+from horizons.util.shapes import Point, Rect
+from horizons.world.warehouseregistry import WarehouseRegistry
+
+
+class DummyWarehouse:
+	def __init__(self, worldid, x, y, owner):
+		self.worldid = worldid
+		self.position = Rect.init_from_topleft_and_size(x, y, 3, 3)
+		self.owner = owner
+
+
+class DummyOwner:
+	def __init__(self, worldid):
+		self.worldid = worldid
+
+
+class TestWarehouseRegistry(TestCase):
+
+	def test_add_remove(self):
+		registry = WarehouseRegistry(cell_size=8)
+		owner = DummyOwner(1)
+		warehouse1 = DummyWarehouse(3, 6, 6, owner)
+		warehouse2 = DummyWarehouse(2, 20, 20, owner)
+		registry.add(warehouse1)
+		registry.add(warehouse2)
+		self.assertEqual(len(registry), 2)
+		self.assertIn(warehouse1, registry)
+		self.assertEqual(registry.get_warehouses(), [warehouse2, warehouse1])
+		self.assertEqual(registry.get_owners(), [owner])
+
+		registry.remove(warehouse1)
+		registry.remove(warehouse2)
+		self.assertEqual(len(registry), 0)
+		self.assertFalse(registry._grid)
+		self.assertEqual(registry._by_owner, {})
+
+	def test_compare_with_scan(self):
+		rng = random.Random(7)
+		registry = WarehouseRegistry(cell_size=8)
+		owners = [DummyOwner(i) for i in range(3)]
+		warehouses = []
+		for worldid in rng.sample(range(1000), 60):
+			warehouse = DummyWarehouse(worldid, rng.randint(-10, 90), rng.randint(-10, 90), rng.choice(owners))
+			warehouses.append(warehouse)
+			registry.add(warehouse)
+		for warehouse in warehouses[:20]:
+			warehouses.remove(warehouse)
+			registry.remove(warehouse)
+		warehouses.sort(key=lambda warehouse: warehouse.worldid)
+
+		for _ in range(300):
+			x, y = rng.randint(-20, 100), rng.randint(-20, 100)
+			if rng.random() < 0.5:
+				position = Point(x, y)
+			else:
+				position = Rect.init_from_topleft_and_size(x, y, 3, 3)
+			radius = rng.choice([1, 5, 12, 40, 200])
+			selected = rng.sample(owners, rng.randint(1, 3))
+			for owner_filter in (None, selected):
+				expected = [warehouse for warehouse in warehouses
+				            if warehouse.position.distance(position) <= radius and
+				            (owner_filter is None or warehouse.owner in owner_filter)]
+				self.assertEqual(registry.get_warehouses(position, radius, owner_filter), expected)